@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Benchmarks peak memory of the console `all` command with 1M objects
+
+Usage: ./benchmarks/bench_all_output.py [number_of_objects]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def print_whole_list():
+    """Prints all instances the way `all` used to: one big list"""
+    print([str(obj) for obj in storage.all().values()])
+
+
+def print_streamed():
+    """Prints all instances through the streaming `all` command"""
+    HBNBCommand().onecmd("all")
+
+
+def measure(func):
+    """Returns (seconds, peak bytes) of func() writing to /dev/null"""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            func()
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            sys.stdout = stdout
+    return elapsed, peak
+
+
+def main(count):
+    """Runs the benchmark on count State objects"""
+    FileStorage._FileStorage__objects = {}
+    for i in range(count):
+        State().name = "State {}".format(i)
+    print("{} objects".format(count))
+    for name, func in (("list", print_whole_list),
+                       ("streamed", print_streamed)):
+        elapsed, peak = measure(func)
+        print("{:>9}: {:7.2f}s, peak {:8.1f} MiB".format(
+            name, elapsed, peak / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
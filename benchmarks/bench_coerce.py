@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Times the schema of Place coercing and validating many records
+
+Records are coerced as read from JSON (timestamps as strings, lists as
+JSON text) and validated once typed, which only compares their types.
+
+Usage: ./benchmarks/bench_coerce.py [number of records]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.schema import coerce_record  # noqa: E402
+
+
+def bench(name, records, schema):
+    """Prints the time taken to coerce every record"""
+    start = time.perf_counter()
+    for record in records:
+        coerce_record(schema, record)
+    seconds = time.perf_counter() - start
+    print("{:<22} {:8.0f} ms  {:6.2f} us/record".format(
+        name, seconds * 1000, seconds / len(records) * 1e6))
+
+
+def main(number):
+    """Runs the benchmark on number records"""
+    schema = storage.schemas()["Place"]
+    now = datetime.now().isoformat()
+    records = [{"id": str(i), "created_at": now, "updated_at": now,
+                "city_id": "c", "user_id": "u", "name": "Place {}".format(i),
+                "max_guest": "4", "price_by_night": 100, "latitude": 48,
+                "longitude": 2.35, "amenity_ids": '["a", "b"]'}
+               for i in range(number)]
+    bench("coerce from JSON", records, schema)
+    bench("validate typed", records, schema)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Compares the Place column store against a scan of the objects
+
+Usage: ./benchmarks/bench_columns.py [number of places]
+"""
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.columns import aggregate_objects, matches  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def populate(number):
+    """Fills the storage with number random places over 1000 cities"""
+    now = datetime.now().isoformat()
+    cities = [str(uuid.uuid4()) for _ in range(1000)]
+    objects = {}
+    for _ in range(number):
+        place = Place(id=str(uuid.uuid4()), created_at=now, updated_at=now,
+                      city_id=random.choice(cities),
+                      max_guest=random.randint(1, 10),
+                      price_by_night=random.randint(20, 500),
+                      latitude=random.uniform(-90, 90),
+                      longitude=random.uniform(-180, 180))
+        objects["Place." + place.id] = place
+    FileStorage._FileStorage__objects = objects
+
+
+def bench(name, function):
+    """Prints the time taken by function"""
+    start = time.perf_counter()
+    function()
+    print("{:<28} {:10.1f} ms".format(
+        name, (time.perf_counter() - start) * 1000))
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    populate(number)
+    bench("build column store", lambda: storage.count("Place"))
+    where = (("price_by_night", "<", 100), ("max_guest", ">=", 4))
+    places = storage.all("Place").values()
+    bench("filter (scan)",
+          lambda: [p for p in places if matches(p, where)])
+    bench("filter (columns)", lambda: storage.select("Place", *where))
+    bench("mean by city_id (scan)", lambda: aggregate_objects(
+        places, "mean", "price_by_night", by="city_id"))
+    bench("mean by city_id (columns)", lambda: storage.aggregate(
+        "Place", "mean", "price_by_night", by="city_id"))
+
+
+if __name__ == "__main__":
+    main()
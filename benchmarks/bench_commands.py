@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Measures the commands per second the console runs on a mixed stream
+
+The stream shows, updates and counts places in both the spaced and the
+<class>.<method>(...) syntax, inside a transaction so that no command
+waits on a save. The rate of parse_command alone is printed first.
+
+Usage: ./benchmarks/bench_commands.py [number of commands]
+"""
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from console import HBNBCommand, parse_command  # noqa: E402
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+templates = ('show Place {}',
+             'Place.show("{}")',
+             'update Place {} name "Loft"',
+             'Place.update("{}", "max_guest", 4)',
+             "Place.update(\"{}\", {{'latitude': 48.85, 'number_rooms': 2}})",
+             'count Place',
+             'Place.count()')
+
+
+def main(number):
+    """Runs number commands of the stream"""
+    tmp_dir = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(tmp_dir, "file.json")
+    FileStorage._FileStorage__objects = {}
+    ids = [Place().id for _ in range(1000)]
+    lines = [templates[i % len(templates)].format(ids[i % len(ids)])
+             for i in range(number)]
+    start = time.perf_counter()
+    for line in lines:
+        parse_command(line)
+    report("parsed", number, time.perf_counter() - start)
+    console = HBNBCommand()
+    storage.begin()
+    try:
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for line in lines:
+                console.onecmd(line)
+            seconds = time.perf_counter() - start
+    finally:
+        storage.rollback()
+        shutil.rmtree(tmp_dir)
+    report("run", number, seconds)
+
+
+def report(name, number, seconds):
+    """Prints the rate of number commands taking seconds"""
+    print("{:<8} {} commands in {:.3f} s: {:9.0f} commands/s".format(
+        name, number, seconds, number / seconds))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Times export() and import_records() for JSON Lines and CSV files
+
+Usage: ./benchmarks/bench_import.py [number of places] [max workers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(name, function):
+    """Prints the time taken by function"""
+    start = time.perf_counter()
+    function()
+    print("{:<28} {:8.0f} ms".format(
+        name, (time.perf_counter() - start) * 1000))
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    try:
+        FileStorage._FileStorage__objects = {}
+        for i in range(number):
+            place = Place()
+            place.name = "Loft {}".format(i)
+            place.price_by_night = 80
+            place.amenity_ids = ["a", "b"]
+        print("{} places, {} CPUs".format(number, os.cpu_count()))
+        for path in ("places.jsonl", "places.csv"):
+            timed("export " + path, lambda: storage.export(path))
+            for n in sorted({1, workers}):
+                FileStorage._FileStorage__objects = {}
+                timed("import {} ({} workers)".format(path, n),
+                      lambda: storage.import_records(path, workers=n))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Measures the memory taken by reloaded objects of every model class,
+with and without the compact (slot-based) models
+
+Usage: ./benchmarks/bench_memory.py [number of objects per class]
+"""
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.compact import compact_class  # noqa: E402
+
+VALUES = {str: "some text", int: 4, float: 37.77, list: []}
+
+
+def record(name, attributes):
+    """Returns a stored dictionary of class name with every attribute set"""
+    now = datetime.now().isoformat()
+    rec = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now}
+    if name != "BaseModel":
+        for attr, t in attributes[name].items():
+            rec[attr] = VALUES[t]
+    rec["__class__"] = name
+    return rec
+
+
+def measure(cls, records):
+    """Returns the bytes allocated per object built from records"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [cls(**rec) for rec in records]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size // len(objects)
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    attributes = storage.attributes()
+    print("{:<10} {:>10} {:>10} {:>7}".format(
+        "class", "dict", "compact", "saved"))
+    for name, cls in storage.classes().items():
+        records = [record(name, attributes) for _ in range(number)]
+        plain = measure(cls, records)
+        compact = measure(compact_class(cls), records)
+        print("{:<10} {:>8} B {:>8} B {:>6.0%}".format(
+            name, plain, compact, 1 - compact / plain))
+
+
+if __name__ == "__main__":
+    main()
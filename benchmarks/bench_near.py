@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Compares the Place location index against a brute-force scan
+
+Usage: ./benchmarks/bench_near.py [number of places]
+"""
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.engine.indexes import GridIndex  # noqa: E402
+from models.place import Place  # noqa: E402
+
+QUERIES = 100
+
+
+def populate(number):
+    """Fills the storage with number places around 1000 city centers"""
+    now = datetime.now().isoformat()
+    centers = [(random.uniform(-60, 70), random.uniform(-180, 180))
+               for _ in range(1000)]
+    objects = {}
+    for _ in range(number):
+        lat, lon = random.choice(centers)
+        place = Place(id=str(uuid.uuid4()), created_at=now, updated_at=now,
+                      latitude=lat + random.gauss(0, 0.2),
+                      longitude=lon + random.gauss(0, 0.2))
+        objects["Place." + place.id] = place
+    FileStorage._FileStorage__objects = objects
+    return centers
+
+
+def brute_near(places, lat, lon, radius):
+    """Returns the places within radius km of (lat, lon), nearest first"""
+    found = []
+    for key, place in places.items():
+        distance = GridIndex.distance(lat, lon, place.latitude,
+                                      place.longitude)
+        if distance <= radius:
+            found.append((distance, key, place))
+    found.sort(key=lambda item: item[0])
+    return {key: place for _, key, place in found}
+
+
+def box(lat, lon):
+    """Returns the 0.1 degree wide box centered on (lat, lon)"""
+    return lat - 0.05, lon - 0.05, lat + 0.05, lon + 0.05
+
+
+def brute_bbox(places, lat, lon):
+    """Returns the places inside the box centered on (lat, lon)"""
+    south, west, north, east = box(lat, lon)
+    return {key: place for key, place in places.items()
+            if south <= place.latitude <= north and
+            west <= place.longitude <= east}
+
+
+def bench(name, function, number):
+    """Prints the time per call of function"""
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    print("{:<28} {:10.2f} ms/call".format(
+        name, (time.perf_counter() - start) * 1000 / number))
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    centers = populate(number)
+    bench("build index", lambda: storage.count("Place"), 1)
+    places = storage.all("Place")
+    queries = iter([random.choice(centers) for _ in range(QUERIES)] * 4)
+    bench("near 5 km (scan)",
+          lambda: brute_near(places, *next(queries), 5), 3)
+    bench("near 5 km (index)",
+          lambda: storage.near(*next(queries), 5), QUERIES)
+    bench("within_bbox 0.1 deg (scan)",
+          lambda: brute_bbox(places, *next(queries)), 3)
+    bench("within_bbox 0.1 deg (index)",
+          lambda: storage.within_bbox(*box(*next(queries))), QUERIES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Times pages of storage.iter() at several depths of a large class
+
+Usage: ./benchmarks/bench_pages.py [number of reviews]
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def bench(name, function):
+    """Prints the time taken by function, and returns its result"""
+    start = time.perf_counter()
+    result = function()
+    print("{:<28} {:10.3f} ms".format(
+        name, (time.perf_counter() - start) * 1000))
+    return result
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    now = datetime.now().isoformat()
+    objects = {}
+    for _ in range(number):
+        review = Review(id=str(uuid.uuid4()), created_at=now, updated_at=now)
+        objects["Review." + review.id] = review
+    FileStorage._FileStorage__objects = objects
+    storage.count("Review")
+    keys = sorted(objects)
+    bench("sort the keys once", lambda: list(storage.iter("Review", None, 1)))
+    for depth in (0, number // 2, number - 100):
+        after = keys[depth - 1] if depth else None
+        bench("page of 100 at {}".format(depth),
+              lambda: list(storage.iter("Review", after, 100)))
+    Review()
+    bench("page after a new review", lambda: list(
+        storage.iter("Review", keys[number // 2], 100)))
+    bench("page by sorting all()", lambda: [
+        (k, objects[k]) for k in sorted(storage.all("Review"))[
+            number // 2:number // 2 + 100]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Measures how reload() scales with the number of worker processes
+
+Usage: ./benchmarks/bench_reload.py [number of objects] [max workers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    try:
+        FileStorage._FileStorage__objects = {}
+        for _ in range(number):
+            place = Place()
+            place.name = "Loft"
+            place.price_by_night = 80
+        storage.save()
+        print("{} objects, {:.0f} MB, {} CPUs".format(
+            number, os.path.getsize("file.json") / 2 ** 20, os.cpu_count()))
+        baseline = None
+        for n in sorted({1, 2, 4, 8, 16, workers}):
+            if n > workers:
+                continue
+            FileStorage._FileStorage__workers = n
+            start = time.perf_counter()
+            storage.reload()
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print("{:>2} workers {:8.0f} ms  x{:.2f}".format(
+                n, seconds * 1000, baseline / seconds))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Measures the peak memory of reload(), reading file.json at once or
+streaming it one record at a time
+
+Usage: ./benchmarks/bench_reload_memory.py [number of objects]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def measure(name, function):
+    """Prints the time, the final and the peak memory of function"""
+    FileStorage._FileStorage__objects = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<10} {:8.0f} ms  objects {:6.0f} MB  peak {:6.0f} MB".format(
+        name, seconds * 1000, current / 2 ** 20, peak / 2 ** 20))
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    try:
+        FileStorage._FileStorage__objects = {}
+        for _ in range(number):
+            Review().text = "Great place, would stay again"
+        storage.save()
+        print("{} objects, file.json {:.0f} MB".format(
+            number, os.path.getsize("file.json") / 2 ** 20))
+        measure("at once", storage.reload)
+        FileStorage._FileStorage__stream = True
+        measure("streamed", storage.reload)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""Benchmarks FileStorage.save() with 1 dirty object out of 100k
+
+Usage: ./benchmarks/bench_save.py [number_of_objects]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(func):
+    """Returns the wall time in seconds taken by func()"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(count):
+    """Runs the benchmark on count Place objects"""
+    tmp_dir = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(tmp_dir, "file.json")
+    FileStorage._FileStorage__objects = {}
+    places = [Place() for _ in range(count)]
+    for i, place in enumerate(places):
+        place.name = "Place {}".format(i)
+
+    print("{} objects".format(count))
+    print("first save (all dirty):   {:8.3f}s".format(timed(storage.save)))
+    places[count // 2].name = "Renamed"
+    print("save with 1 dirty object: {:8.3f}s".format(timed(storage.save)))
+    FileStorage._FileStorage__cache = {}
+    places[count // 2].name = "Renamed again"
+    print("save without cache:       {:8.3f}s".format(timed(storage.save)))
+    os.remove(FileStorage._FileStorage__file_path)
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
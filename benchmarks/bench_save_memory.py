@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Measures the memory save() allocates on top of the stored objects
+
+Usage: ./benchmarks/bench_save_memory.py [number of objects]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def measure(name):
+    """Prints the time of save(), the memory it keeps and its peak"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    storage.save()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<22} {:8.0f} ms  kept {:6.0f} MB  peak {:6.0f} MB".format(
+        name, seconds * 1000, current / 2 ** 20, peak / 2 ** 20))
+
+
+def main(count):
+    """Runs the benchmark on count Place objects"""
+    tmp_dir = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(tmp_dir, "file.json")
+    FileStorage._FileStorage__objects = {}
+    places = [Place() for _ in range(count)]
+    for i, place in enumerate(places):
+        place.name = "Place {}".format(i)
+    try:
+        measure("first save (all dirty)")
+        print("{} objects, file.json {:.0f} MB".format(count, os.path.getsize(
+            FileStorage._FileStorage__file_path) / 2 ** 20))
+        places[count // 2].name = "Renamed"
+        measure("save with 1 dirty")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Benchmarks save/reload throughput and file size of every serializer
+
+Usage: ./benchmarks/bench_serializers.py [count ...]
+(default counts: 10000 100000 1000000 mixed model objects)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.engine.serializers import get_serializer  # noqa: E402
+from models.engine.serializers import serializers  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.user import User  # noqa: E402
+
+
+def populate(count):
+    """Fills the storage with count Users, Places and Reviews"""
+    FileStorage._FileStorage__objects = {}
+    for i in range(count):
+        if i % 3 == 0:
+            obj = User()
+            obj.email = "user{}@example.com".format(i)
+        elif i % 3 == 1:
+            obj = Place()
+            obj.name = "Place {}".format(i)
+            obj.price_by_night = i % 300
+            obj.latitude = 37.77
+            obj.amenity_ids = ["a", "b"]
+        else:
+            obj = Review()
+            obj.text = "Review number {}".format(i)
+
+
+def main(counts):
+    """Runs the benchmark for every count"""
+    names = []
+    for name in serializers:
+        try:
+            get_serializer(name)
+            names.append(name)
+        except ImportError:
+            print("{} is not installed, skipped".format(name))
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "file.json")
+    FileStorage._FileStorage__file_path = path
+    print("{:>8} {:>8} {:>14} {:>14} {:>10}".format(
+        "objects", "format", "save obj/s", "reload obj/s", "size MiB"))
+    for count in counts:
+        populate(count)
+        objects = FileStorage._FileStorage__objects
+        for name in names:
+            FileStorage._FileStorage__serializer = name
+            FileStorage._FileStorage__objects = objects
+            FileStorage._FileStorage__dirty = dict(objects)
+            start = time.perf_counter()
+            storage.save()
+            save_time = time.perf_counter() - start
+            start = time.perf_counter()
+            storage.reload()
+            reload_time = time.perf_counter() - start
+            print("{:>8} {:>8} {:>14.0f} {:>14.0f} {:>10.1f}".format(
+                count, name, count / save_time, count / reload_time,
+                os.path.getsize(path) / 2 ** 20))
+        FileStorage._FileStorage__objects = {}
+    os.remove(path)
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
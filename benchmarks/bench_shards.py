@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Compares saving and reloading file.json against a sharded directory
+
+Usage: ./benchmarks/bench_shards.py [number of objects per class]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def bench(name, function):
+    """Prints the time taken by function"""
+    start = time.perf_counter()
+    function()
+    print("{:<32} {:10.1f} ms".format(
+        name, (time.perf_counter() - start) * 1000))
+
+
+def run(label, number):
+    """Fills the storage, then times a small save and a one-class reload"""
+    FileStorage._FileStorage__objects = {}
+    for cls in storage.classes().values():
+        for _ in range(number):
+            cls()
+    storage.save()
+    review = next(iter(storage.all("Review").values()))
+    review.text = "Great"
+    bench("{}: save one review".format(label), storage.save)
+    bench("{}: reload, count states".format(label),
+          lambda: (storage.reload(), storage.count("State")))
+
+
+def main():
+    """Runs the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    try:
+        run("file.json", number)
+        FileStorage._FileStorage__shard_dir = "shards"
+        run("shards", number)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
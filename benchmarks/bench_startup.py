@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Benchmarks `import models` time as file.json grows, eager vs lazy
+
+Usage: ./benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def write_file(path, count):
+    """Writes a file.json holding count Place records"""
+    objs = {}
+    for i in range(count):
+        uid = str(uuid.uuid4())
+        objs["Place." + uid] = {"id": uid,
+                                "created_at": "2017-09-28T21:03:54.052298",
+                                "updated_at": "2017-09-28T21:03:54.052302",
+                                "name": "Place {}".format(i),
+                                "price_by_night": i % 300,
+                                "__class__": "Place"}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(objs, f)
+
+
+def import_time(cwd, lazy):
+    """Returns the wall time of a fresh interpreter importing models"""
+    env = dict(os.environ, PYTHONPATH=ROOT,
+               HBNB_LAZY_RELOAD="1" if lazy else "0")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import models"],
+                   cwd=cwd, env=env, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    """Runs the benchmark for growing file sizes"""
+    print("{:>8} {:>10} {:>10}".format("objects", "eager", "lazy"))
+    for count in (0, 10000, 100000, 300000):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_file(os.path.join(tmp_dir, "file.json"), count)
+            print("{:>8} {:>9.3f}s {:>9.3f}s".format(
+                count, import_time(tmp_dir, False),
+                import_time(tmp_dir, True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""Micro-benchmarks the timestamp codec against the strptime path
+
+Usage: ./benchmarks/bench_timestamps.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import timestamps  # noqa: E402
+from models.timestamps import format_datetime, parse_datetime  # noqa: E402
+
+NUMBER = 200000
+
+
+def bench(name, stmt):
+    """Prints the time per call of stmt"""
+    seconds = timeit.timeit(stmt, number=NUMBER)
+    print("{:<24} {:8.0f} ns/call".format(name, seconds / NUMBER * 1e9))
+
+
+def main():
+    """Runs the micro-benchmarks"""
+    dt = datetime.now()
+    iso = dt.isoformat()
+    epoch_us = (dt - timestamps.EPOCH) // timestamps.MICROSECOND
+    bench("strptime", lambda: datetime.strptime(
+        iso, "%Y-%m-%dT%H:%M:%S.%f"))
+    bench("parse_datetime(iso)", lambda: parse_datetime(iso))
+    bench("parse_datetime(epoch)", lambda: parse_datetime(epoch_us))
+    bench("isoformat", lambda: dt.isoformat())
+    bench("format_datetime(iso)", lambda: format_datetime(dt))
+    timestamps.EPOCH_US = True
+    bench("format_datetime(epoch)", lambda: format_datetime(dt))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,130 @@
 """Module for the entry point of the command interpreter."""
 
 import cmd
+import math
+import uuid
+from datetime import datetime
 from models.base_model import BaseModel
 from models import storage
+from models.schema import coerce_value
 import re
 import json
+import sys
+import time
+
+dotted_methods = ("all", "count", "destroy", "show", "update", "where")
+tokenized = ("count", "destroy", "show", "update")
+dotted_call = re.compile(r"(\w*)\.(\w+)\((.*)\)", re.S)
+spaced_call = re.compile(r"(\w+)(?:\s+(.*))?", re.S)
+spaced_args = re.compile(r"""\s*("(?:[^"\\]|\\.)*"|'[^']*'|[{[]|\S+)""")
+dotted_args = re.compile(
+    r"""[\s,]*("(?:[^"\\]|\\.)*"|'[^']*'|[{[]|[^\s,{]+)""")
+brackets = re.compile(r"""[][{}]|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""")
+create_param = re.compile(r'\s*(\w+)=("(?:[^"\\]|\\.)*"|[^"\s]+)(?:\s|$)')
+where_call = re.compile(r"^\s*(\w*)\.where\((.*)\)\s*$")
+spaced_query = re.compile(r"^\s*(\S*)\s*(.*)$")
+generated = ("id", "created_at", "updated_at", "__class__")
+query_term = re.compile(r'\s*(\w+)\s*(<=|>=|==|!=|<|>|=)\s*'
+                        r'("(?:[^"\\]|\\.)*"|[^,"\s]+)\s*(?:,|$)')
+
+
+class Command:
+    """A command parsed from a line of the console
+
+    Attributes:
+        - name: command to run, such as show or update
+        - classname: class name written before the method of
+          <class>.<method>(...), or None if there is none
+        - args: for the commands of tokenized, the arguments following
+          the class name, quoted strings, dictionaries and lists being
+          single tokens, quotes and brackets included
+        - line: arguments as the do_<name> method of the command takes
+          them
+    """
+
+    __slots__ = ("name", "classname", "args", "line")
+
+    def __init__(self, name, classname, args, line):
+        self.name = name
+        self.classname = classname
+        self.args = args
+        self.line = line
+
+
+def parse_command(line):
+    """Returns the Command written on line, or None if it isn't one
+
+    line is either <command> [<arguments>], or <class>.<method>(<arguments>)
+    for the methods of dotted_methods, whose arguments are separated by
+    commas. The commands of tokenized take their class name as first
+    argument when they aren't dotted.
+    """
+    line = line.strip()
+    match = dotted_call.fullmatch(line)
+    if match is not None:
+        classname, name, text = match.groups()
+        if name not in dotted_methods:
+            return None
+        args = ()
+        if name in tokenized:
+            args = tuple(split_args(text, dotted_args))
+        elif name != "where":
+            line = "{} {}".format(classname, text).strip()
+        return Command(name, classname, args, line)
+    match = spaced_call.fullmatch(line)
+    if match is None:
+        return None
+    name, text = match.groups()
+    text = text or ""
+    if name in tokenized:
+        args = split_args(text, spaced_args)
+        return Command(name, args[0] if args else "", tuple(args[1:]), text)
+    return Command(name, None, (), text)
+
+
+def split_args(text, pattern):
+    """Returns the tokens of text, matched one after the other by pattern
+
+    A token opening a dictionary or a list runs to the bracket closing
+    it, so it may hold nested brackets and quoted strings with brackets.
+    """
+    args = []
+    pos = 0
+    while True:
+        match = pattern.match(text, pos)
+        if match is None:
+            return args
+        token = match.group(1)
+        pos = match.end()
+        if token in ("{", "["):
+            pos = closing_bracket(text, match.start(1))
+            token = text[match.start(1):pos]
+        args.append(token)
+
+
+def closing_bracket(text, start):
+    """Returns the index following the bracket closing the one at start
+
+    Brackets inside quoted strings don't count. The end of text is
+    returned if the bracket is never closed.
+    """
+    depth = 0
+    for match in brackets.finditer(text, start):
+        bracket = match.group()
+        if bracket in ("{", "["):
+            depth += 1
+        elif bracket in ("}", "]"):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return len(text)
+
+
+def unquote(token):
+    """Returns token without the quotes around it, if any"""
+    if len(token) > 1 and token[0] == token[-1] and token[0] in "\"'":
+        return token[1:-1]
+    return token
 
 
 class HBNBCommand(cmd.Cmd):
@@ -14,64 +134,110 @@ class HBNBCommand(cmd.Cmd):
 
     prompt = "(hbnb) "
 
-    def default(self, line):
-        """Catch commands if nothing else matches then."""
-        # print("DEF:::", line)
-        self._precmd(line)
-
-    def _precmd(self, line):
-        """Intercepts commands to test for class.syntax()"""
-        # print("PRECMD:::", line)
-        match = re.search(r"^(\w*)\.(\w+)(?:\(([^)]*)\))$", line)
-        if not match:
-            return line
-        classname = match.group(1)
-        method = match.group(2)
-        args = match.group(3)
-        match_uid_and_args = re.search('^"([^"]*)"(?:, (.*))?$', args)
-        if match_uid_and_args:
-            uid = match_uid_and_args.group(1)
-            attr_or_dict = match_uid_and_args.group(2)
-        else:
-            uid = args
-            attr_or_dict = False
-
-        attr_and_value = ""
-        if method == "update" and attr_or_dict:
-            match_dict = re.search('^({.*})$', attr_or_dict)
-            if match_dict:
-                self.update_dict(classname, uid, match_dict.group(1))
-                return ""
-            match_attr_and_value = re.search(
-                '^(?:"([^"]*)")?(?:, (.*))?$', attr_or_dict)
-            if match_attr_and_value:
-                attr_and_value = (match_attr_and_value.group(
-                    1) or "") + " " + (match_attr_and_value.group(2) or "")
-        command = method + " " + classname + " " + uid + " " + attr_and_value
-        self.onecmd(command)
-        return command
-
-    def update_dict(self, classname, uid, s_dict):
+    def onecmd(self, line):
+        """Runs the command on line, parsed by parse_command
+
+        Lines that aren't commands of the console, such as help or ?,
+        are left to cmd.Cmd, which prints an unknown syntax error.
+        """
+        command = parse_command(line)
+        if command is None or not hasattr(self, "do_" + command.name):
+            return cmd.Cmd.onecmd(self, line)
+        return self.execute(command)
+
+    def execute(self, command):
+        """Runs a parsed command, and returns True if the console stops
+
+        The commands of runners are run straight from the arguments
+        already split by the parser, the others get their line.
+        """
+        run = self.runners.get(command.name)
+        if run is not None:
+            return run(self, command)
+        return getattr(self, "do_" + command.name)(command.line)
+
+    def update_dict(self, classname, obj, s_dict):
         """Helper method for update() with a dictionary."""
         s = s_dict.replace("'", '"')
-        d = json.loads(s)
-        if not classname:
-            print("** class name missing **")
-        elif classname not in storage.classes():
-            print("** class doesn't exist **")
-        elif uid is None:
-            print("** instance id missing **")
-        else:
-            key = "{}.{}".format(classname, uid)
-            if key not in storage.all():
-                print("** no instance found **")
-            else:
-                attributes = storage.attributes()[classname]
-                for attribute, value in d.items():
-                    if attribute in attributes:
-                        value = attributes[attribute](value)
-                    setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+        try:
+            d = json.loads(s)
+        except ValueError as e:
+            print("** {} **".format(e))
+            return
+        schema = storage.schemas()[classname]
+        try:
+            d = {attribute: coerce_value(schema, attribute, value)
+                 for attribute, value in d.items()}
+        except ValueError as e:
+            print("** {} **".format(e))
+            return
+        for attribute, value in d.items():
+            setattr(obj, attribute, value)
+        obj.save()
+
+    def parse_script(self, lines):
+        """Returns the parsed Command of each line of a script
+
+        Blank lines and lines starting with # are skipped. Raises
+        ValueError for the first line whose command doesn't exist or
+        can't run in a batch, such as begin, commit and rollback.
+        """
+        commands = []
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            command = parse_command(line)
+            if command is None or not hasattr(self, "do_" + command.name):
+                raise ValueError("line {}: unknown command: {}".format(
+                    number, line.split()[0] if command is None
+                    else command.name))
+            if command.name in ("begin", "commit", "rollback"):
+                raise ValueError("line {}: {} can't be used in a batch".format(
+                    number, command.name))
+            commands.append(command)
+        return commands
+
+    def run_batch(self, path):
+        """Runs the commands of the script at path, saving once at the end
+
+        The whole script is parsed before anything runs, then its
+        commands run inside one transaction: the objects are saved once
+        they all ran, or not at all if one raises. The number of
+        commands of each type and the time they took are then printed
+        to stderr. Returns the exit status of the console.
+        """
+        try:
+            with open(path, "r") as f:
+                commands = self.parse_script(f)
+        except (OSError, ValueError) as e:
+            print("** {} **".format(e), file=sys.stderr)
+            return 1
+        timings = {}
+        clock = time.perf_counter
+        storage.begin()
+        try:
+            for command in commands:
+                start = clock()
+                stop = self.execute(command)
+                timing = timings.setdefault(command.name, [0, 0.0])
+                timing[0] += 1
+                timing[1] += clock() - start
+                if stop:
+                    break
+        except BaseException:
+            storage.rollback()
+            raise
+        start = clock()
+        storage.commit()
+        storage.flush()
+        timings["save"] = [1, clock() - start]
+        print("{:<10} {:>9} {:>12} {:>14}".format(
+            "command", "count", "total (s)", "average (us)"), file=sys.stderr)
+        for name, (count, seconds) in timings.items():
+            print("{:<10} {:>9} {:>12.3f} {:>14.1f}".format(
+                name, count, seconds, seconds / count * 1e6), file=sys.stderr)
+        return 0
 
     def do_EOF(self, line):
         """Handles End Of File character.
@@ -89,131 +255,372 @@ class HBNBCommand(cmd.Cmd):
         """
         pass
 
+    def do_begin(self, line):
+        """Starts a transaction: changes are only saved at commit.
+        """
+        if storage.in_transaction():
+            print("** transaction already in progress **")
+        else:
+            storage.begin()
+
+    def do_commit(self, line):
+        """Saves every change made since begin at once.
+        """
+        if not storage.in_transaction():
+            print("** no transaction in progress **")
+        else:
+            storage.commit()
+
+    def do_rollback(self, line):
+        """Undoes every change made since begin.
+        """
+        if not storage.in_transaction():
+            print("** no transaction in progress **")
+        else:
+            storage.rollback()
+
     def do_create(self, line):
         """Creates an instance.
+        Usage: create <class> [<attribute>=<value> ...]
         """
         if line == "" or line is None:
             print("** class name missing **")
-        elif line not in storage.classes():
+            return
+        classname, _, params = line.partition(" ")
+        classes = storage.classes()
+        if classname not in classes:
             print("** class doesn't exist **")
-        else:
-            b = storage.classes()[line]()
-            b.save()
-            print(b.id)
+            return
+        schema = storage.schemas()[classname]
+        values = {}
+        pos = 0
+        while pos < len(params.rstrip()):
+            match = create_param.match(params, pos)
+            if match is None:
+                print("** invalid parameter: {} **".format(
+                    params[pos:].split()[0]))
+                return
+            pos = match.end()
+            if match.group(1) in generated:
+                print("** invalid parameter: {} **".format(match.group(1)))
+                return
+            try:
+                values[match.group(1)] = self.parse_value(
+                    schema, *match.groups())
+            except ValueError as e:
+                print("** {} **".format(e))
+                return
+        now = datetime.now()
+        b = classes[classname](id=str(uuid.uuid4()), created_at=now,
+                               updated_at=now, **values)
+        storage.new(b)
+        storage.save()
+        print(b.id)
 
     def do_show(self, line):
         """Prints the string representation of an instance.
         """
-        if line == "" or line is None:
-            print("** class name missing **")
-        else:
-            words = line.split(' ')
-            if words[0] not in storage.classes():
-                print("** class doesn't exist **")
-            elif len(words) < 2:
-                print("** instance id missing **")
-            else:
-                key = "{}.{}".format(words[0], words[1])
-                if key not in storage.all():
-                    print("** no instance found **")
-                else:
-                    print(storage.all()[key])
+        self.run_show(parse_command("show " + line))
+
+    def run_show(self, command):
+        """Prints the instance named by a parsed show command"""
+        obj = self.find_instance(command)
+        if obj is not None:
+            print(obj)
 
     def do_destroy(self, line):
         """Deletes an instance based on the class name and id.
         """
-        if line == "" or line is None:
+        self.run_destroy(parse_command("destroy " + line))
+
+    def run_destroy(self, command):
+        """Deletes the instance named by a parsed destroy command"""
+        obj = self.find_instance(command)
+        if obj is not None:
+            storage.delete(obj)
+            storage.save()
+
+    def find_instance(self, command):
+        """Returns the instance of the class name and first argument of
+        command, or prints why there is none and returns None"""
+        if not command.classname:
             print("** class name missing **")
+        elif command.classname not in storage.classes():
+            print("** class doesn't exist **")
+        elif not command.args or not unquote(command.args[0]):
+            print("** instance id missing **")
         else:
-            words = line.split(' ')
-            if words[0] not in storage.classes():
-                print("** class doesn't exist **")
-            elif len(words) < 2:
-                print("** instance id missing **")
-            else:
-                key = "{}.{}".format(words[0], words[1])
-                if key not in storage.all():
-                    print("** no instance found **")
-                else:
-                    del storage.all()[key]
-                    storage.save()
+            obj = storage.get(command.classname, unquote(command.args[0]))
+            if obj is None:
+                print("** no instance found **")
+            return obj
+        return None
 
     def do_all(self, line):
         """Prints all string representation of all instances.
+        Usage: all [<class> [limit=<number>, after=<id>]]
         """
         if line != "":
             words = line.split(' ')
             if words[0] not in storage.classes():
                 print("** class doesn't exist **")
+            elif len(words) > 1:
+                query = self.parse_query(line, ("after", "limit"))
+                if query is None:
+                    return
+                classname, conditions, options = query
+                if conditions:
+                    print("** all only takes limit and after **")
+                    return
+                after = options.get("after")
+                if after is not None:
+                    after = "{}.{}".format(classname, after)
+                self.print_list(str(obj) for _, obj in storage.iter(
+                    classname, after, options.get("limit")))
             else:
-                nl = [str(obj) for key, obj in storage.all().items()
-                      if type(obj).__name__ == words[0]]
-                print(nl)
+                self.print_list(
+                    str(obj) for obj in storage.all(words[0]).values())
         else:
-            new_list = [str(obj) for key, obj in storage.all().items()]
-            print(new_list)
+            self.print_list(str(obj) for obj in storage.all().values())
+
+    def print_list(self, items):
+        """Prints the strings yielded by items as print(list(items)) would
+
+        Each item is written as soon as it is produced, so the whole
+        list never has to be held in memory.
+        """
+        write = sys.stdout.write
+        sep = "["
+        for item in items:
+            write(sep + repr(item))
+            sep = ", "
+        write("[]\n" if sep == "[" else "]\n")
+
+    def do_near(self, line):
+        """Prints the places within a radius, nearest first.
+        Usage: near <latitude> <longitude> <radius_km>
+        """
+        args = self.parse_numbers(line, ("latitude", "longitude", "radius"))
+        if args is not None:
+            self.print_list(str(obj) for obj in storage.near(*args).values())
+
+    def do_within(self, line):
+        """Prints the places inside a bounding box.
+        Usage: within <south> <west> <north> <east>
+        """
+        args = self.parse_numbers(line, ("south", "west", "north", "east"))
+        if args is not None:
+            self.print_list(
+                str(obj) for obj in storage.within_bbox(*args).values())
+
+    def parse_numbers(self, line, names):
+        """Returns the numbers named names in line, or None if one is wrong
+        """
+        words = line.split()
+        numbers = []
+        for i, name in enumerate(names):
+            if i >= len(words):
+                print("** {} missing **".format(name))
+                return None
+            try:
+                number = float(words[i])
+            except ValueError:
+                number = math.nan
+            if not math.isfinite(number):
+                print("** {} must be a number **".format(name))
+                return None
+            numbers.append(number)
+        return numbers
+
+    def do_where(self, line):
+        """Prints the instances of a class matching every condition.
+        Usage: <class>.where(<attribute><operator><value>, ...,
+                             order=[-]<attribute>, limit=<number>)
+        """
+        query = self.parse_query(line)
+        if query is not None:
+            classname, conditions, options = query
+            try:
+                objects = storage.where(classname, *conditions, **options)
+            except ValueError as e:
+                print("** {} **".format(e))
+                return
+            self.print_list(str(obj) for obj in objects.values())
+
+    def do_explain(self, line):
+        """Prints how a query is answered, and what each step keeps.
+        Usage: explain <class>.where(<conditions>)
+        """
+        query = self.parse_query(line)
+        if query is not None:
+            classname, conditions, options = query
+            try:
+                print(storage.explain(classname, *conditions, **options))
+            except ValueError as e:
+                print("** {} **".format(e))
+
+    def parse_query(self, line, names=("order", "limit")):
+        """Returns the class name, conditions and options of a query
+
+        line is either <class>.where(<terms>) or <class> <terms>, the
+        terms being separated by commas. Each term is a condition such
+        as price_by_night<100 or name=="Loft" (= is the same as ==), or
+        one of the options of names: order=[-]<attribute>,
+        limit=<number> or after=<id>. Prints the error and returns None
+        if line is wrong.
+        """
+        match = where_call.search(line) or spaced_query.search(line)
+        classname, terms = match.groups()
+        if not classname:
+            print("** class name missing **")
+            return None
+        if classname not in storage.classes():
+            print("** class doesn't exist **")
+            return None
+        schema = storage.schemas()[classname]
+        conditions = []
+        options = {}
+        pos = 0
+        while pos < len(terms.rstrip()):
+            match = query_term.match(terms, pos)
+            if match is None:
+                print("** invalid condition: {} **".format(
+                    terms[pos:].split(",")[0].strip()))
+                return None
+            pos = match.end()
+            attribute, op, token = match.groups()
+            value = json.loads(token) if token.startswith('"') else token
+            if op == "=" and attribute == "limit" and attribute in names:
+                if not value.isdigit():
+                    print("** limit must be a positive integer **")
+                    return None
+                options["limit"] = int(value)
+                continue
+            if op == "=" and attribute in names:
+                options[attribute] = value
+                continue
+            try:
+                value = self.parse_value(schema, attribute, token, True)
+            except ValueError as e:
+                print("** {} **".format(e))
+                return None
+            conditions.append((attribute, "==" if op == "=" else op, value))
+        return classname, conditions, options
+
+    def parse_value(self, schema, attribute, token, compared=False):
+        """Returns the value of attribute written as token
+
+        A quoted token is a string (with JSON escapes if it is double
+        quoted), the others are numbers if they can be. The value is then
+        cast to the type of attribute in the schema of its class (see
+        models.schema), e.g. a JSON list for amenity_ids; ValueError is
+        raised if it can't be. A number compared to a numeric attribute
+        is kept as it is, so that max_guest>=4.5 isn't read as 4.
+        """
+        if token.startswith('"'):
+            value = json.loads(token)
+        elif len(token) > 1 and token[0] == token[-1] == "'":
+            value = token[1:-1]
+        else:
+            value = token
+            for cast in (int, float):
+                try:
+                    value = cast(token)
+                    break
+                except ValueError:
+                    pass
+        if compared and type(value) in (int, float) and \
+                schema.get(attribute, (None,))[0] in (int, float):
+            return value
+        return coerce_value(schema, attribute, value)
+
+    def do_import(self, line):
+        """Imports the objects of a JSON Lines or CSV file, and saves them.
+        Usage: import <path>.jsonl|<path>.csv [<class>]
+        """
+        path, classname = self.parse_file(line)
+        if path is not None:
+            try:
+                print(storage.import_records(path, cls=classname))
+            except (OSError, ValueError) as e:
+                print("** {} **".format(e))
+
+    def do_export(self, line):
+        """Exports the objects of a class, or all, to a JSON Lines or CSV file.
+        Usage: export <path>.jsonl|<path>.csv [<class>]
+        """
+        path, classname = self.parse_file(line)
+        if path is not None:
+            try:
+                print(storage.export(path, classname))
+            except (OSError, ValueError) as e:
+                print("** {} **".format(e))
+
+    def parse_file(self, line):
+        """Returns the path and class name of an import or export
+
+        Prints the error and returns (None, None) if line is wrong.
+        """
+        words = line.split()
+        if not words:
+            print("** file name missing **")
+        elif len(words) > 1 and words[1] not in storage.classes():
+            print("** class doesn't exist **")
+        else:
+            return words[0], words[1] if len(words) > 1 else None
+        return None, None
 
     def do_count(self, line):
         """Counts the instances of a class.
         """
-        words = line.split(' ')
-        if not words[0]:
+        self.run_count(parse_command("count " + line))
+
+    def run_count(self, command):
+        """Prints the number of instances of a parsed count command"""
+        if not command.classname:
             print("** class name missing **")
-        elif words[0] not in storage.classes():
+        elif command.classname not in storage.classes():
             print("** class doesn't exist **")
         else:
-            matches = [
-                k for k in storage.all() if k.startswith(
-                    words[0] + '.')]
-            print(len(matches))
+            print(storage.count(command.classname))
 
     def do_update(self, line):
         """Updates an instance by adding or updating attribute.
         """
-        if line == "" or line is None:
-            print("** class name missing **")
-            return
+        self.run_update(parse_command("update " + line))
 
-        rex = r'^(\S+)(?:\s(\S+)(?:\s(\S+)(?:\s((?:"[^"]*")|(?:(\S)+)))?)?)?'
-        match = re.search(rex, line)
-        classname = match.group(1)
-        uid = match.group(2)
-        attribute = match.group(3)
-        value = match.group(4)
-        if not match:
-            print("** class name missing **")
-        elif classname not in storage.classes():
-            print("** class doesn't exist **")
-        elif uid is None:
-            print("** instance id missing **")
+    def run_update(self, command):
+        """Sets the attribute, or dictionary of attributes, of a parsed
+        update command on its instance, and saves it
+
+        Values are read as by parse_value.
+        """
+        obj = self.find_instance(command)
+        if obj is None:
+            return
+        args = command.args[1:]
+        if args and args[0].startswith("{"):
+            self.update_dict(command.classname, obj, args[0])
+        elif not args:
+            print("** attribute name missing **")
+        elif len(args) < 2:
+            print("** value missing **")
         else:
-            key = "{}.{}".format(classname, uid)
-            if key not in storage.all():
-                print("** no instance found **")
-            elif not attribute:
-                print("** attribute name missing **")
-            elif not value:
-                print("** value missing **")
-            else:
-                cast = None
-                if not re.search('^".*"$', value):
-                    if '.' in value:
-                        cast = float
-                    else:
-                        cast = int
-                else:
-                    value = value.replace('"', '')
-                attributes = storage.attributes()[classname]
-                if attribute in attributes:
-                    value = attributes[attribute](value)
-                elif cast:
-                    try:
-                        value = cast(value)
-                    except ValueError:
-                        pass  # fine, stay a string then
-                setattr(storage.all()[key], attribute, value)
-                storage.all()[key].save()
+            attribute = unquote(args[0])
+            try:
+                value = self.parse_value(storage.schemas()[
+                    command.classname], attribute, args[1])
+            except ValueError as e:
+                print("** {} **".format(e))
+                return
+            setattr(obj, attribute, value)
+            obj.save()
+
+    runners = {"count": run_count, "destroy": run_destroy,
+               "show": run_show, "update": run_update}
 
 
 if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == "--batch":
+        sys.exit(HBNBCommand().run_batch(sys.argv[2]))
     HBNBCommand().cmdloop()
@@ -4,12 +4,25 @@
 import uuid
 from datetime import datetime
 from models import storage
+from models.schema import coerce_record, compile_schema
+from models.timestamps import format_datetime
+
+classes = {}
+attributes = {}
+schemas = {}
+schema_types = (str, int, float, list, dict)
 
 
 class BaseModel:
 
     """Class from which all other classes will inherit"""
 
+    def __init_subclass__(cls, **kwargs):
+        """Registers every model class as it is defined"""
+
+        super().__init_subclass__(**kwargs)
+        register(cls)
+
     def __init__(self, *args, **kwargs):
         """Initializes instance attributes
 
@@ -19,27 +32,46 @@ class BaseModel:
         """
 
         if kwargs is not None and kwargs != {}:
-            for key in kwargs:
-                if key == "created_at":
-                    self.__dict__["created_at"] = datetime.strptime(
-                        kwargs["created_at"], "%Y-%m-%dT%H:%M:%S.%f")
-                elif key == "updated_at":
-                    self.__dict__["updated_at"] = datetime.strptime(
-                        kwargs["updated_at"], "%Y-%m-%dT%H:%M:%S.%f")
-                else:
-                    self.__dict__[key] = kwargs[key]
+            self.__dict__.update(kwargs)
+            coerce_record(schemas[type(self).__name__], self.__dict__,
+                          False)
         else:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.now()
             self.updated_at = datetime.now()
             storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed"""
+
+        storage.backup(self)
+        super().__setattr__(name, value)
+        storage.touch(self)
+
+    def __delattr__(self, name):
+        """Deletes an attribute and marks the instance as changed"""
+
+        storage.backup(self)
+        super().__delattr__(name)
+        storage.touch(self)
+
     def __str__(self):
         """Returns official string representation"""
 
         return "[{}] ({}) {}".\
             format(type(self).__name__, self.id, self.__dict__)
 
+    def _state(self):
+        """Returns a copy of the instance attributes"""
+
+        return self.__dict__.copy()
+
+    def _restore(self, state):
+        """Replaces the instance attributes with a copy from _state()"""
+
+        self.__dict__.clear()
+        self.__dict__.update(state)
+
     def save(self):
         """updates the public instance attribute updated_at"""
 
@@ -51,6 +83,33 @@ class BaseModel:
 
         my_dict = self.__dict__.copy()
         my_dict["__class__"] = type(self).__name__
-        my_dict["created_at"] = my_dict["created_at"].isoformat()
-        my_dict["updated_at"] = my_dict["updated_at"].isoformat()
+        my_dict["created_at"] = format_datetime(my_dict["created_at"])
+        my_dict["updated_at"] = format_datetime(my_dict["updated_at"])
         return my_dict
+
+
+def register(cls):
+    """Adds the model class cls to classes, its attributes to attributes
+    and its schema, covering the attributes of BaseModel too, to schemas
+
+    The attributes of a model are those it, or the models it inherits
+    from, declares with a class-level default, typed as their default.
+    """
+    declared = {}
+    for base in reversed(cls.__mro__):
+        if base is not BaseModel and issubclass(base, BaseModel):
+            for name, value in vars(base).items():
+                if not name.startswith("_") and \
+                        type(value) in schema_types:
+                    declared[name] = type(value)
+    classes[cls.__name__] = cls
+    attributes[cls.__name__] = declared
+    schemas[cls.__name__] = compile_schema(
+        dict(attributes["BaseModel"], **declared))
+
+
+classes["BaseModel"] = BaseModel
+attributes["BaseModel"] = {"id": str,
+                           "created_at": datetime,
+                           "updated_at": datetime}
+schemas["BaseModel"] = compile_schema(attributes["BaseModel"])
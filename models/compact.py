@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Module for the compact, slot-based variants of the model classes
+
+A compact class keeps the attributes its model declares in
+FileStorage.attributes() in __slots__ instead of a per-instance
+dictionary; any other attribute goes to a small overflow dictionary
+created on first use. The order in which attributes were set is kept
+as a tuple shared by all objects with the same order, so compact objects
+print and serialize exactly like the objects of the model they stand
+for, and share its class name.
+"""
+
+import uuid
+from datetime import datetime
+from models import storage
+from models.base_model import schemas
+from models.schema import coerce_record
+from models.timestamps import format_datetime
+
+compact_classes = {}
+orders = {}
+
+
+class CompactModel:
+
+    """Class from which all compact classes inherit"""
+
+    __slots__ = ("_extra", "_order")
+    _fields = ()
+    _slots = frozenset()
+    _defaults = {}
+
+    def __init__(self, *args, **kwargs):
+        """Initializes instance attributes
+
+        Args:
+            - *args: list of arguments
+            - **kwargs: dict of key-values arguments
+        """
+
+        object.__setattr__(self, "_extra", None)
+        object.__setattr__(self, "_order", ())
+        if kwargs:
+            coerce_record(schemas[type(self).__name__], kwargs, False)
+            self.__load(kwargs)
+        else:
+            self.id = str(uuid.uuid4())
+            self.created_at = datetime.now()
+            self.updated_at = datetime.now()
+            storage.new(self)
+
+    def __load(self, state):
+        """Stores the attributes of state, in their order"""
+
+        order = tuple(state)
+        object.__setattr__(self, "_order", orders.setdefault(order, order))
+        for key, value in state.items():
+            if key != "__class__":
+                self.__store(key, value)
+
+    def __set(self, name, value):
+        """Stores an attribute, remembering when it was first set"""
+
+        if name not in self._order:
+            order = self._order + (name,)
+            object.__setattr__(self, "_order",
+                               orders.setdefault(order, order))
+        self.__store(name, value)
+
+    def __store(self, name, value):
+        """Stores an attribute in its slot or in the overflow dictionary"""
+
+        if name in self._slots:
+            object.__setattr__(self, name, value)
+        elif self._extra is None:
+            object.__setattr__(self, "_extra", {name: value})
+        else:
+            self._extra[name] = value
+
+    def __getattr__(self, name):
+        """Returns the class default of an unset declared attribute"""
+
+        if name in self._defaults:
+            return self._defaults[name]
+        extra = object.__getattribute__(self, "_extra")
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed"""
+
+        storage.backup(self)
+        self.__set(name, value)
+        storage.touch(self)
+
+    def __delattr__(self, name):
+        """Deletes an attribute and marks the instance as changed"""
+
+        storage.backup(self)
+        if name in self._slots:
+            object.__delattr__(self, name)
+        elif self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            raise AttributeError(name)
+        order = tuple(n for n in self._order if n != name)
+        object.__setattr__(self, "_order", orders.setdefault(order, order))
+        storage.touch(self)
+
+    def __str__(self):
+        """Returns official string representation"""
+
+        return "[{}] ({}) {}".\
+            format(type(self).__name__, self.id, self._state())
+
+    def _state(self):
+        """Returns a copy of the attributes, as __dict__ would hold them"""
+
+        state = {}
+        slots = self._slots
+        for name in self._order:
+            if name in slots:
+                state[name] = object.__getattribute__(self, name)
+            elif name == "__class__":
+                state[name] = type(self).__name__
+            else:
+                state[name] = self._extra[name]
+        return state
+
+    def _restore(self, state):
+        """Replaces the attributes with a copy returned by _state()"""
+
+        for name in self._fields:
+            try:
+                object.__delattr__(self, name)
+            except AttributeError:
+                pass
+        object.__setattr__(self, "_extra", None)
+        self.__load(state)
+
+    def save(self):
+        """updates the public instance attribute updated_at"""
+
+        self.updated_at = datetime.now()
+        storage.save()
+
+    def to_dict(self):
+        """returns a dictionary containing all keys/values of the instance"""
+
+        my_dict = self._state()
+        my_dict["__class__"] = type(self).__name__
+        my_dict["created_at"] = format_datetime(my_dict["created_at"])
+        my_dict["updated_at"] = format_datetime(my_dict["updated_at"])
+        return my_dict
+
+
+def compact_class(cls):
+    """Returns the compact class standing for the model class cls"""
+
+    name = cls.__name__
+    if name in compact_classes:
+        return compact_classes[name]
+    attributes = storage.attributes()
+    fields = tuple(attributes["BaseModel"])
+    if name != "BaseModel":
+        fields += tuple(attributes.get(name, ()))
+    defaults = {f: getattr(cls, f) for f in fields if hasattr(cls, f)}
+    compact_classes[name] = type(name, (CompactModel,), {
+        "__slots__": fields,
+        "__module__": cls.__module__,
+        "__doc__": cls.__doc__,
+        "_fields": fields,
+        "_slots": frozenset(fields),
+        "_defaults": defaults})
+    return compact_classes[name]
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""Module for importing and exporting objects as JSON Lines or CSV
+
+JSON Lines files hold one JSON object per line, CSV files one object per
+row under a header row naming the attributes, with lists and
+dictionaries written as JSON text and missing values as empty cells.
+Every record names its class in __class__, unless a class is given for
+the whole file. Files are read and written one record at a time.
+"""
+import csv
+import itertools
+import json
+import uuid
+from datetime import datetime
+from models.schema import coerce_record
+
+formats = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+chunk_size = 10000
+
+
+def detect_format(path, format=None):
+    """Returns format if it is known, else the format of the extension of
+    path if format is None"""
+    if format is not None:
+        if format not in formats.values():
+            raise ValueError("unknown format: {}".format(format))
+        return format
+    for extension, name in formats.items():
+        if path.lower().endswith(extension):
+            return name
+    raise ValueError("unknown format: use a .jsonl or .csv file")
+
+
+def read_chunks(f, format):
+    """Yields the records of f in chunks of chunk_size
+
+    Each chunk is a (line number, records) pair, the records being lines
+    of JSON, or CSV rows as dictionaries of strings by attribute.
+    """
+    if format == "csv":
+        records = csv.DictReader(f)
+        first = 2
+    else:
+        records = f
+        first = 1
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield first, chunk
+        first += len(chunk)
+
+
+def decode_chunk(chunk, format, schemas, cls=None):
+    """Returns the (class name, attributes) of every record of a chunk
+
+    The values are cast by the schemas of models.schema, by class name,
+    and missing ids and timestamps are generated. Raises ValueError,
+    naming the line (or CSV row) of the record, if one can't be.
+    """
+    first, records = chunk
+    where = "row" if format == "csv" else "line"
+    decoded = []
+    now = datetime.now()
+    for line, record in enumerate(records, first):
+        try:
+            if format == "csv":
+                record = {k: v for k, v in record.items() if v}
+            else:
+                if not record.strip():
+                    continue
+                record = json.loads(record)
+                if not isinstance(record, dict):
+                    raise ValueError("not an object")
+            name = record.pop("__class__", cls)
+            if name not in schemas:
+                raise ValueError("unknown class: {}".format(name))
+            schema = schemas[name]
+            if format == "csv":
+                for attribute, value in record.items():
+                    if attribute not in schema:
+                        record[attribute] = guess(value)
+            coerce_record(schema, record)
+            if "id" not in record:
+                record["id"] = str(uuid.uuid4())
+            record.setdefault("created_at", now)
+            record.setdefault("updated_at", record["created_at"])
+        except (TypeError, ValueError) as e:
+            raise ValueError("{} {}: {}".format(where, line, e)) from None
+        decoded.append((name, record))
+    return decoded
+
+
+def guess(value):
+    """Returns a CSV cell of an undeclared attribute as a number if it is"""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def write_jsonl(f, objects):
+    """Writes the dictionary of each object to f as one JSON line"""
+    for obj in objects:
+        f.write(json.dumps(obj.to_dict()))
+        f.write("\n")
+
+
+def write_csv(f, objects, fields):
+    """Writes the dictionary of each object to f as one CSV row
+
+    Args:
+        - f: text file opened with newline=""
+        - objects: objects to write
+        - fields: attributes written, in the order of the columns
+    """
+    writer = csv.writer(f)
+    writer.writerow(fields)
+    for obj in objects:
+        record = obj.to_dict()
+        writer.writerow([cell(record.get(field)) for field in fields])
+
+
+def cell(value):
+    """Returns the CSV cell of value"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
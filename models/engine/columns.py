@@ -0,0 +1,279 @@
+#!/usr/bin/python3
+"""Module for the columnar store of numeric attributes kept by FileStorage
+
+Conditions are (attribute, operator, value) tuples, the operator being
+one of "<", "<=", "==", "!=", ">=" or ">". Aggregate functions are
+"count", "sum", "mean", "min" and "max"; values that aren't numbers are
+left out of them.
+"""
+import math
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+operators = {"<": operator.lt,
+             "<=": operator.le,
+             "==": operator.eq,
+             "!=": operator.ne,
+             ">=": operator.ge,
+             ">": operator.gt}
+functions = ("count", "sum", "mean", "min", "max")
+
+
+class ColumnStore:
+
+    """Attributes of the objects of one class, stored column by column
+
+    Numbers are kept in float64 arrays (NaN when missing or not a
+    number) and strings in int32 arrays of codes into a list of distinct
+    values, so filters and aggregates over every object are vectorized.
+    Like every secondary index of FileStorage it exposes add(key, obj),
+    called whenever obj is stored or changed, and remove(key). Rows are
+    kept dense: removing one moves the last row in its place.
+    """
+
+    def __init__(self, types, objects=None):
+        """Initializes the store, if numpy is installed
+
+        Args:
+            - types: dictionary of the stored attributes and their types
+            - objects: dictionary of the objects to store first, by key
+        """
+        if numpy is None:
+            raise ImportError("the column store needs numpy")
+        self.types = dict(types)
+        self.__size = 0
+        self.__capacity = 16
+        self.__rows = {}
+        self.__keys = []
+        self.__objects = []
+        self.__columns = {}
+        self.__codes = {}
+        self.__values = {}
+        for attribute, t in self.types.items():
+            dtype = numpy.float64
+            if t is str:
+                dtype = numpy.int32
+                self.__codes[attribute] = {}
+                self.__values[attribute] = []
+            self.__columns[attribute] = numpy.empty(self.__capacity, dtype)
+        if objects:
+            self.__load(objects)
+
+    def __len__(self):
+        """Returns the number of stored objects"""
+        return self.__size
+
+    def add(self, key, obj):
+        """Stores (or updates) the attributes of obj in its row"""
+        row = self.__rows.get(key)
+        if row is None:
+            row = self.__size
+            if row == self.__capacity:
+                self.__grow()
+            self.__rows[key] = row
+            self.__keys.append(key)
+            self.__objects.append(obj)
+            self.__size += 1
+        else:
+            self.__objects[row] = obj
+        for attribute, column in self.__columns.items():
+            column[row] = self.__encode(
+                attribute, getattr(obj, attribute, None))
+
+    def remove(self, key):
+        """Removes the object stored under key from the store"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.__size - 1
+        if row != last:
+            moved = self.__keys[last]
+            self.__keys[row] = moved
+            self.__objects[row] = self.__objects[last]
+            self.__rows[moved] = row
+            for column in self.__columns.values():
+                column[row] = column[last]
+        self.__keys.pop()
+        self.__objects.pop()
+        self.__size = last
+
+    def column(self, attribute):
+        """Returns a read-only view of the column of attribute"""
+        view = self.__columns[attribute][:self.__size]
+        view.flags.writeable = False
+        return view
+
+    def values(self, attribute):
+        """Returns the distinct strings the codes of attribute stand for"""
+        return self.__values[attribute]
+
+    def mask(self, conditions):
+        """Returns the boolean array of the rows matching every condition
+
+        Strings can only be compared with "==" and "!=".
+        """
+        mask = numpy.ones(self.__size, dtype=bool)
+        for attribute, op, value in conditions:
+            column = self.__columns[attribute][:self.__size]
+            if self.types[attribute] is str:
+                if op not in ("==", "!="):
+                    raise ValueError(
+                        "{} can only be compared with == or !=".format(
+                            attribute))
+                value = self.__codes[attribute].get(value, -2)
+            mask &= operators[op](column, value)
+        return mask
+
+    def select(self, *conditions):
+        """Returns the objects matching every condition, by key"""
+        keys = self.__keys
+        objects = self.__objects
+        return {keys[row]: objects[row]
+                for row in numpy.flatnonzero(self.mask(conditions)).tolist()}
+
+    def aggregate(self, function, attribute, by=None, where=()):
+        """Aggregates the numbers of attribute over the matching objects
+
+        Args:
+            - function: name of the aggregate function
+            - attribute: numeric attribute to aggregate
+            - by: string attribute to group the objects by, if any
+            - where: conditions the aggregated objects must match
+
+        Returns the aggregate, or a dictionary of the aggregate of every
+        group by value of by. An empty aggregate is None, or 0 for count.
+        """
+        if function not in functions:
+            raise ValueError("unknown aggregate: {}".format(function))
+        values = self.__columns[attribute][:self.__size]
+        mask = self.mask(where) & ~numpy.isnan(values)
+        if by is None:
+            values = values[mask]
+            if function == "count":
+                return len(values)
+            if not len(values):
+                return None
+            return float(getattr(numpy, function)(values))
+        codes = self.__columns[by][:self.__size]
+        mask &= codes >= 0
+        codes = codes[mask]
+        values = values[mask]
+        groups = len(self.__values[by])
+        counts = numpy.bincount(codes, minlength=groups)
+        if function == "count":
+            result = counts
+        elif function in ("sum", "mean"):
+            result = numpy.bincount(codes, weights=values, minlength=groups)
+            if function == "mean":
+                result = result / numpy.maximum(counts, 1)
+        else:
+            result = numpy.full(groups, math.inf if function == "min"
+                                else -math.inf)
+            getattr(numpy, function + "imum").at(result, codes, values)
+        names = self.__values[by]
+        cast = int if function == "count" else float
+        return {names[code]: cast(result[code])
+                for code in numpy.flatnonzero(counts).tolist()}
+
+    def __encode(self, attribute, value):
+        """Returns the value stored in the column of attribute for value"""
+        if self.types[attribute] is not str:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return math.nan
+        if not isinstance(value, str):
+            return -1
+        codes = self.__codes[attribute]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.__values[attribute].append(value)
+        return code
+
+    def __load(self, objects):
+        """Fills the empty store with the objects, a column at a time"""
+        self.__keys = list(objects)
+        self.__objects = list(objects.values())
+        self.__rows = {key: row for row, key in enumerate(self.__keys)}
+        self.__size = len(self.__keys)
+        self.__capacity = max(self.__capacity, self.__size)
+        missing = object()
+        for attribute, column in self.__columns.items():
+            values = [getattr(obj, attribute, missing)
+                      for obj in self.__objects]
+            if self.types[attribute] is not str:
+                try:
+                    column = numpy.array(values, numpy.float64)
+                except (TypeError, ValueError):
+                    column = numpy.array(
+                        [self.__encode(attribute, v) for v in values],
+                        numpy.float64)
+            else:
+                column = numpy.array(
+                    [self.__encode(attribute, v) for v in values],
+                    numpy.int32)
+            self.__columns[attribute] = numpy.resize(column, self.__capacity)
+
+    def __grow(self):
+        """Doubles the capacity of every column"""
+        self.__capacity *= 2
+        for attribute, column in self.__columns.items():
+            grown = numpy.empty(self.__capacity, column.dtype)
+            grown[:len(column)] = column
+            self.__columns[attribute] = grown
+
+
+def matches(obj, conditions):
+    """Returns True if obj matches every condition, without a store"""
+    missing = object()
+    for attribute, op, value in conditions:
+        try:
+            if not operators[op](getattr(obj, attribute, missing), value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def describe(conditions):
+    """Returns the conditions as text, e.g. max_guest >= 4, name == 'a'"""
+    return ", ".join("{} {} {!r}".format(*condition)
+                     for condition in conditions)
+
+
+def aggregate_objects(objects, function, attribute, by=None):
+    """Aggregates attribute over the objects like ColumnStore.aggregate"""
+    if function not in functions:
+        raise ValueError("unknown aggregate: {}".format(function))
+    groups = {}
+    for obj in objects:
+        try:
+            value = float(getattr(obj, attribute, None))
+        except (TypeError, ValueError):
+            continue
+        if math.isnan(value):
+            continue
+        group = None
+        if by is not None:
+            group = getattr(obj, by, None)
+            if not isinstance(group, str):
+                continue
+        groups.setdefault(group, []).append(value)
+    result = {}
+    for group, values in groups.items():
+        if function == "count":
+            result[group] = len(values)
+        elif function == "sum":
+            result[group] = math.fsum(values)
+        elif function == "mean":
+            result[group] = math.fsum(values) / len(values)
+        else:
+            result[group] = min(values) if function == "min" else max(values)
+    if by is None:
+        return result.get(None, 0 if function == "count" else None)
+    return result
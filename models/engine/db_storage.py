@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""Module for DBStorage class."""
+import datetime
+import json
+import os
+import sqlite3
+from models.engine.file_storage import FileStorage
+
+
+class DBStorage(FileStorage):
+
+    """Class for storing and retrieving data in a SQLite database
+
+    Objects are kept in memory exactly like FileStorage does; only
+    persistence differs. Every class gets a table with one typed column
+    per attribute from attributes(), an index on every attribute from
+    indexes(), and an "extra" column holding the other attributes as
+    JSON; lists and dictionaries are stored as JSON too. The table of a
+    class registered after the connection was opened is created when
+    the database is next used. save() writes the changed rows in a
+    single transaction.
+    """
+    __db_path = os.getenv("HBNB_SQLITE_PATH", "hbnb.db")
+    __connections = {}
+    __tables = {}
+    __column_types = {str: "TEXT",
+                      int: "INTEGER",
+                      float: "REAL",
+                      list: "TEXT",
+                      dict: "TEXT",
+                      datetime.datetime: "TIMESTAMP"}
+
+    def save(self):
+        """writes the objects changed since the last save to the database"""
+        if self.in_transaction():
+            return
+        connection = self.__connect()
+        columns = {name: self.__columns(name) for name in self.classes()}
+        changed = {}
+        deleted = {}
+        for key, obj in self._pop_dirty().items():
+            name, uid = key.split(".", 1)
+            if obj is None:
+                deleted.setdefault(name, []).append((uid,))
+            else:
+                changed.setdefault(name, []).append(
+                    self.__row(columns[name], obj))
+        with connection:
+            for name, uids in deleted.items():
+                connection.executemany(
+                    'DELETE FROM "{}" WHERE id = ?'.format(name), uids)
+            for name, rows in changed.items():
+                connection.executemany(
+                    'INSERT OR REPLACE INTO "{}" VALUES ({})'.format(
+                        name, ", ".join("?" * len(rows[0]))), rows)
+
+    def _stored(self):
+        """Returns True if there is anything stored to reload"""
+        return os.path.isfile(DBStorage.__db_path)
+
+    def _records(self, workers=1):
+        """Returns the stored dictionary of every object, by key
+
+        The rows are always read by one process, whatever workers is.
+        """
+        return dict(self._iter_records())
+
+    def _iter_records(self):
+        """Yields the stored (key, dictionary) pair of every object"""
+        connection = self.__connect()
+        for name in self.classes():
+            columns = self.__columns(name)
+            types = dict(columns)
+            cursor = connection.execute('SELECT * FROM "{}"'.format(name))
+            for row in cursor:
+                record = {}
+                for (column, _), value in zip(columns, row):
+                    if value is None:
+                        continue
+                    if column == "extra":
+                        record.update(json.loads(value))
+                    elif types[column] in (list, dict):
+                        record[column] = json.loads(value)
+                    else:
+                        record[column] = value
+                record["__class__"] = name
+                yield "{}.{}".format(name, record["id"]), record
+
+    def __connect(self):
+        """Returns the connection to the database, creating the tables of
+        the classes it doesn't have yet"""
+        connection = DBStorage.__connections.get(DBStorage.__db_path)
+        if connection is None:
+            connection = sqlite3.connect(DBStorage.__db_path)
+            DBStorage.__connections[DBStorage.__db_path] = connection
+            DBStorage.__tables[DBStorage.__db_path] = set()
+        tables = DBStorage.__tables[DBStorage.__db_path]
+        missing = [name for name in self.classes() if name not in tables]
+        if not missing:
+            return connection
+        with connection:
+            for name in missing:
+                definitions = []
+                for column, t in self.__columns(name):
+                    definitions.append('"{}" {}'.format(
+                        column, DBStorage.__column_types[t]))
+                definitions[0] += " PRIMARY KEY"
+                connection.execute('CREATE TABLE IF NOT EXISTS "{}" ({})'.
+                                   format(name, ", ".join(definitions)))
+                for attribute in self.indexes().get(name, ()):
+                    connection.execute(
+                        'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                        'ON "{0}" ("{1}")'.format(name, attribute))
+        tables.update(missing)
+        return connection
+
+    def __columns(self, name):
+        """Returns the (column, type) pairs of the table of class name"""
+        attributes = self.attributes()
+        columns = list(attributes["BaseModel"].items())
+        if name != "BaseModel":
+            columns.extend(attributes[name].items())
+        columns.append(("extra", str))
+        return columns
+
+    def __row(self, columns, obj):
+        """Returns the values of the (column, type) columns for obj"""
+        record = obj.to_dict()
+        del record["__class__"]
+        row = []
+        for column, t in columns:
+            if column == "extra":
+                row.append(json.dumps(record) if record else None)
+            elif t in (list, dict) and column in record:
+                row.append(json.dumps(record.pop(column)))
+            else:
+                row.append(record.pop(column, None))
+        return row
@@ -1,8 +1,20 @@
 #!/usr/bin/python3
 """Module for FileStorage class."""
-import datetime
-import json
+import contextlib
+import heapq
+import itertools
 import os
+from models.engine.columns import ColumnStore, aggregate_objects, describe
+from models.engine.columns import matches, numpy, operators
+from models.engine.indexes import GridIndex, HashIndex, KeyIndex
+from models.engine.journal import Journal
+from models.engine.flusher import Flusher
+from models.engine.bulk import decode_chunk, detect_format, read_chunks
+from models.engine.bulk import write_csv, write_jsonl
+from models.engine.parallel import load_files_parallel, load_parallel
+from models.engine.parallel import map_chunks
+from models.engine.serializers import get_serializer, iter_file, load_file
+from models.engine.serializers import write_file
 
 
 class FileStorage:
@@ -10,86 +22,882 @@ class FileStorage:
     """Class for storing and retrieving data"""
     __file_path = "file.json"
     __objects = {}
+    __dirty = {}
+    __cache = {}
+    __keys = {}
+    __cache_for = None
+    __serializer = os.getenv("HBNB_SERIALIZER", "json")
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    __journal_limit = 4 * 1024 * 1024
+    __journals = {}
+    __lazy = os.getenv("HBNB_LAZY_RELOAD") == "1"
+    __raw = {}
+    __by_class = {}
+    __by_class_of = None
+    __secondary = {}
+    __undo = None
+    __flush_window = float(os.getenv("HBNB_FLUSH_WINDOW", "0"))
+    __flusher = None
+    __dirty_before = {}
+    __compact = os.getenv("HBNB_COMPACT_MODELS") == "1"
+    __shard_dir = os.getenv("HBNB_SHARD_DIR")
+    __pending = set()
+    __workers = int(os.getenv("HBNB_RELOAD_WORKERS", "1"))
+    __stream = os.getenv("HBNB_STREAM_RELOAD") == "1"
+    __registry = None
+    __compact_classes = {}
 
-    def all(self):
-        """returns the dictionary __objects"""
+    def all(self, cls=None):
+        """returns the dictionary __objects, or only the objects of cls
+
+        Args:
+            - cls: class or class name to restrict the result to
+        """
+        if cls is not None:
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__load_shards(name)
+            raw = self.__raw_records().pop(name, None) \
+                if FileStorage.__raw != {} else None
+            for k, v in (raw or {}).items():
+                if k not in FileStorage.__objects:
+                    self.__insert(k, self.__build(v))
+            return self.__class_index().get(name, {})
+        self.__load_shards()
+        if FileStorage.__raw != {}:
+            for records in self.__raw_records().values():
+                for k, v in records.items():
+                    if k not in FileStorage.__objects:
+                        self.__insert(k, self.__build(v))
+            FileStorage.__raw = {}
         return FileStorage.__objects
 
+    def iter(self, cls, after=None, limit=None):
+        """yields the (key, object) pairs of cls in the order of their keys
+
+        The keys of cls are kept sorted once requested, so a page of
+        limit objects following the key after costs the same however
+        deep it is and however many objects cls has.
+
+        Args:
+            - cls: class or class name of the objects
+            - after: key the page starts after, from the start if None
+            - limit: maximum number of objects yielded
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objects = self.all(name)
+        for key in self.__key_index(name).after(after, limit):
+            obj = objects.get(key)
+            if obj is not None:
+                yield key, obj
+
+    def count(self, cls=None):
+        """returns the number of objects of cls, or of all objects"""
+        if cls is None:
+            return len(self.all())
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__load_shards(name)
+        count = len(self.__class_index().get(name, ()))
+        if FileStorage.__raw != {}:
+            objects = FileStorage.__objects
+            count += sum(1 for k in self.__raw_records().get(name, ())
+                         if k not in objects)
+        return count
+
+    def get(self, cls, id):
+        """returns the object of class cls (or class name) with id, or None"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        key = "{}.{}".format(name, id)
+        obj = FileStorage.__objects.get(key)
+        if obj is None and name in FileStorage.__pending:
+            self.__load_shards(name)
+            obj = FileStorage.__objects.get(key)
+        if obj is None and FileStorage.__raw != {}:
+            record = self.__raw_records().get(name, {}).pop(key, None)
+            if record is not None:
+                obj = self.__build(record)
+                self.__insert(key, obj)
+        return obj
+
+    def find(self, cls, **kwargs):
+        """returns the objects of cls whose attributes equal kwargs, by key
+
+        An index declared in indexes() is used for the lookup when one
+        of the attributes has one, otherwise the objects of cls are
+        scanned.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objects = self.all(name)
+        for index in self.__indexes_of(name):
+            if isinstance(index, HashIndex) and index.attribute in kwargs:
+                objects = index.find(kwargs[index.attribute])
+                break
+        missing = object()
+        return {k: v for k, v in objects.items()
+                if all(getattr(v, attr, missing) == value
+                       for attr, value in kwargs.items())}
+
+    def select(self, cls, *conditions):
+        """returns the objects of cls matching every condition, by key
+
+        Each condition is an (attribute, operator, value) tuple, e.g.
+        ("price_by_night", "<", 100). An equality on an attribute of
+        indexes() is looked up in its hash index, otherwise conditions
+        on the attributes of a column store declared in columns() are
+        evaluated on its arrays; the other conditions are checked by
+        scanning the objects found so far (see explain()).
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        return self.__query(name, conditions)[0]
+
+    def where(self, cls, *conditions, order=None, limit=None):
+        """returns the objects of cls matching every condition, by key
+
+        Args:
+            - cls: class or class name of the objects
+            - conditions: (attribute, operator, value) tuples, see select()
+            - order: attribute to sort the objects by, prefixed with "-"
+              for a descending order; objects without it come last
+            - limit: maximum number of objects returned
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objects = self.__query(name, conditions)[0]
+        return self.__ordered(objects, order, limit)[0]
+
+    def explain(self, cls, *conditions, order=None, limit=None):
+        """returns the steps where() takes to answer a query, one per line
+
+        The query is run, so each step tells how many objects it kept.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objects, steps = self.__query(name, conditions)
+        steps.extend(self.__ordered(objects, order, limit)[1])
+        return "\n".join(steps)
+
+    def aggregate(self, cls, function, attribute, by=None, where=()):
+        """aggregates a numeric attribute over the objects of cls
+
+        Args:
+            - cls: class or class name of the aggregated objects
+            - function: "count", "sum", "mean", "min" or "max"
+            - attribute: numeric attribute to aggregate
+            - by: string attribute to group the objects by, if any
+            - where: conditions the aggregated objects must match
+
+        Returns the aggregate, or a dictionary of the aggregate of every
+        group by value of by.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objects = self.all(name)
+        store = self.__column_store(name)
+        if store is not None and attribute in store.types and \
+                (by is None or store.types.get(by) is str) and \
+                all(attr in store.types for attr, _, _ in where):
+            return store.aggregate(function, attribute, by, where)
+        if where:
+            objects = self.select(name, *where)
+        return aggregate_objects(objects.values(), function, attribute, by)
+
+    def near(self, lat, lon, radius_km, cls="Place"):
+        """returns the objects of cls within radius_km of (lat, lon), by key
+
+        The objects are ordered from the nearest to the farthest. Only
+        the classes listed in locations() can be searched by position.
+        """
+        return self.__grid_index(cls).near(lat, lon, radius_km)
+
+    def within_bbox(self, south, west, north, east, cls="Place"):
+        """returns the objects of cls inside a bounding box, by key
+
+        The box is given by its latitude and longitude bounds, in degrees,
+        and spans the antimeridian if west is greater than east.
+        """
+        return self.__grid_index(cls).within_bbox(south, west, north, east)
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         key = "{}.{}".format(type(obj).__name__, obj.id)
-        FileStorage.__objects[key] = obj
+        if FileStorage.__undo is not None:
+            self.__backup(key, FileStorage.__objects.get(key))
+        self.__insert(key, obj)
+        FileStorage.__dirty[key] = obj
+
+    def backup(self, obj):
+        """records the key and, in a transaction, the state of a stored obj
+        before it changes
+
+        The key is remembered so that obj is still found once its id is
+        changed. Inside a transaction, rollback restores the state recorded
+        at the first change of each object.
+        """
+        key = self.__key_of(obj)
+        if key is not None and FileStorage.__undo is not None:
+            self.__backup(key, obj)
+
+    def touch(self, obj):
+        """marks a stored obj as changed since the last save"""
+        key = self.__key_of(obj)
+        if key is not None:
+            FileStorage.__dirty[key] = obj
+            for index in self.__indexes_of(type(obj).__name__):
+                index.add(key, obj)
+
+    def dirty(self):
+        """returns the keys created, changed or deleted since the last save"""
+        return set(FileStorage.__dirty)
+
+    def delete(self, obj=None):
+        """deletes obj from __objects if it's inside"""
+        if obj is None:
+            return
+        key = self.__key_of(obj)
+        if key is not None:
+            if FileStorage.__undo is not None:
+                self.__backup(key, obj)
+            self.__remove(key)
+            FileStorage.__dirty[key] = None
+            FileStorage.__cache.pop(key, None)
+
+    def in_transaction(self):
+        """returns True between begin() and commit() or rollback()"""
+        return FileStorage.__undo is not None
+
+    def begin(self):
+        """starts a transaction: save() does nothing until commit()"""
+        if FileStorage.__undo is not None:
+            raise RuntimeError("a transaction is already in progress")
+        FileStorage.__undo = {}
+        FileStorage.__dirty_before = dict(FileStorage.__dirty)
+
+    def commit(self):
+        """ends the transaction and saves its changes at once"""
+        if FileStorage.__undo is None:
+            raise RuntimeError("no transaction in progress")
+        FileStorage.__undo = None
+        self.save()
+
+    def rollback(self):
+        """ends the transaction and undoes every change made inside it"""
+        undo = FileStorage.__undo
+        if undo is None:
+            raise RuntimeError("no transaction in progress")
+        FileStorage.__undo = None
+        for key, before in undo.items():
+            if key in FileStorage.__objects:
+                self.__remove(key)
+            if before is not None:
+                obj, state = before
+                obj._restore(state)
+                self.__insert(key, obj)
+        FileStorage.__dirty = FileStorage.__dirty_before
+        FileStorage.__dirty_before = {}
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Runs a block inside a transaction, saving once at its end
+
+        If the block raises, its changes are rolled back instead. A
+        transaction started inside another one joins it.
+        """
+        if FileStorage.__undo is not None:
+            yield self
+            return
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
 
     def save(self):
-        """ serializes __objects to the JSON file (path: __file_path)"""
-        with open(FileStorage.__file_path, "w", encoding="utf-8") as f:
-            d = {k: v.to_dict() for k, v in FileStorage.__objects.items()}
-            json.dump(d, f)
+        """ serializes __objects to the JSON file (path: __file_path)
+
+        The file is written by the serializer named by HBNB_SERIALIZER:
+        json (the default), orjson, msgpack or pickle. It is replaced
+        atomically, by a background thread coalescing the saves made
+        within HBNB_FLUSH_WINDOW seconds if that is set (see flush()).
+        Inside a transaction nothing is written until commit().
+        With HBNB_SHARD_DIR set, only the shards of the classes changed
+        since the last save are rewritten.
+        """
+        if FileStorage.__undo is not None:
+            return
+        journal = self.__get_journal()
+        serializer = get_serializer(FileStorage.__serializer)
+        if FileStorage.__shard_dir:
+            names = {k.split(".", 1)[0] for k in FileStorage.__dirty}
+            os.makedirs(FileStorage.__shard_dir, exist_ok=True)
+            for name in names:
+                self.__write(self.__shard_path(name), serializer,
+                             self.__serialized(serializer, self.all(name)))
+            FileStorage.__dirty = {}
+            return
+        if FileStorage.__journal:
+            journal.append(
+                ("set", k, v.to_dict()) if v is not None else ("del", k, None)
+                for k, v in FileStorage.__dirty.items())
+            FileStorage.__dirty = {}
+            if journal.size() > FileStorage.__journal_limit:
+                journal.compact(FileStorage.__file_path, serializer)
+            return
+        items = self.__serialized(serializer)
+        if FileStorage.__raw != {}:
+            items = itertools.chain(items, (
+                serializer.encode_item(k, v)
+                for records in self.__raw_records().values()
+                for k, v in records.items()
+                if k not in FileStorage.__objects))
+        self.__write(FileStorage.__file_path, serializer, items)
+        FileStorage.__dirty = {}
+        if journal.exists():
+            self.flush()
+            journal.clear()
+
+    def flush(self):
+        """blocks until the last save() is safely written to disk"""
+        if FileStorage.__flusher is not None:
+            FileStorage.__flusher.flush()
+
+    def __write(self, path, serializer, items):
+        """Replaces the file at path with the items, maybe in background
+
+        The items are streamed to the file as they are encoded, unless
+        the file is written in background: they are then gathered first
+        so the objects can change before the file is written.
+        """
+        if FileStorage.__flush_window > 0:
+            self.__get_flusher().submit(path, serializer, list(items))
+        else:
+            write_file(path, serializer, items)
+
+    def __serialized(self, serializer, objects=None):
+        """Yields the encoded item of every object in objects
+
+        Items of objects that are clean since the last save are reused
+        from __cache, so only changed objects go through to_dict(), one
+        at a time as the items are written.
+
+        Args:
+            - serializer: serializer encoding the items
+            - objects: dictionary of objects by key, __objects by default
+        """
+        everything = objects is None
+        if everything:
+            objects = FileStorage.__objects
+        dirty = FileStorage.__dirty
+        if FileStorage.__cache_for != serializer.name:
+            FileStorage.__cache = {}
+            FileStorage.__cache_for = serializer.name
+        cache = FileStorage.__cache
+        for k, v in objects.items():
+            entry = cache.get(k)
+            if entry is None or entry[0] is not v or k in dirty:
+                entry = (v, serializer.encode_item(k, v.to_dict()))
+                cache[k] = entry
+            yield entry[1]
+        if everything and len(cache) > len(objects):
+            FileStorage.__cache = {k: cache[k] for k in objects}
+
+    def import_records(self, path, format=None, cls=None, workers=None):
+        """imports the objects stored in a JSON Lines or CSV file
+
+        The values of each record are cast by the schemas of schemas(),
+        in chunks decoded by workers forked processes if workers (or
+        HBNB_RELOAD_WORKERS) is more than 1. The imported objects are
+        saved at once after the last one, or not at all if a record is
+        invalid (ValueError). Existing objects with the same id are
+        replaced. See models.engine.bulk for the formats.
+
+        Args:
+            - path: path of the file
+            - format: "jsonl" or "csv", from the extension of path if None
+            - cls: class or class name of the records without __class__
+            - workers: number of processes decoding the records
+
+        Returns the number of imported objects.
+        """
+        format = detect_format(path, format)
+        name = cls if cls is None or isinstance(cls, str) else cls.__name__
+        classes = self.classes()
+        if name is not None and name not in classes:
+            raise ValueError("unknown class: {}".format(name))
+        schemas = self.schemas()
+        count = 0
+        with open(path, "r", newline="") as f, self.transaction():
+            for records in map_chunks(
+                    decode_chunk, read_chunks(f, format),
+                    workers or FileStorage.__workers, format, schemas, name):
+                for record_class, record in records:
+                    self.new(classes[record_class](**record))
+                count += len(records)
+        return count
+
+    def export(self, path, cls=None, format=None):
+        """writes the objects of cls (or all objects) to a JSON Lines or CSV
+        file, one record at a time
+
+        CSV columns are the attributes of every written object, starting
+        with __class__, id, created_at and updated_at. Returns the number
+        of exported objects.
+        """
+        format = detect_format(path, format)
+        objects = self.all(cls).values()
+        with open(path, "w", newline="") as f:
+            if format == "csv":
+                fields = {"__class__": None, "id": None,
+                          "created_at": None, "updated_at": None}
+                for obj in objects:
+                    fields.update(dict.fromkeys(obj.to_dict()))
+                write_csv(f, objects, list(fields))
+            else:
+                write_jsonl(f, objects)
+        return len(objects)
 
     def classes(self):
-        """Returns a dictionary of valid classes and their references"""
-        from models.base_model import BaseModel
-        from models.user import User
-        from models.state import State
-        from models.city import City
-        from models.amenity import Amenity
-        from models.place import Place
-        from models.review import Review
-
-        classes = {"BaseModel": BaseModel,
-                   "User": User,
-                   "State": State,
-                   "City": City,
-                   "Amenity": Amenity,
-                   "Place": Place,
-                   "Review": Review}
+        """Returns a dictionary of valid classes and their references
+
+        The dictionary is the registry BaseModel fills in as its
+        subclasses are defined (see models.base_model), shared by every
+        call: it must not be changed.
+
+        With HBNB_COMPACT_MODELS=1 the compact variant of every class is
+        returned instead (see models.compact), so objects created by the
+        console or by reload() keep their declared attributes in slots.
+        """
+        classes = self.__get_registry()[0]
+        if FileStorage.__compact:
+            compact = FileStorage.__compact_classes
+            if compact.keys() != classes.keys():
+                from models.compact import compact_class
+                compact = {k: compact_class(v) for k, v in classes.items()}
+                FileStorage.__compact_classes = compact
+            return compact
         return classes
 
     def reload(self):
-        """Reloads the stored objects"""
-        if not os.path.isfile(FileStorage.__file_path):
+        """Reloads the stored objects
+
+        In lazy mode (HBNB_LAZY_RELOAD=1) the file is only read on first
+        access, and each object is built the first time it is requested
+        through all() or get().
+
+        With HBNB_SHARD_DIR set, the file of each class (its shard) is
+        only read the first time an object of that class is requested.
+
+        Otherwise the file is parsed by HBNB_RELOAD_WORKERS processes
+        (1 by default) in parallel, as are shards read together. With
+        HBNB_STREAM_RELOAD=1 it is streamed instead, each object being
+        built as soon as its record is read, so the whole dictionary
+        stored in the file is never held in memory.
+        """
+        if not self._stored():
             return
-        with open(FileStorage.__file_path, "r", encoding="utf-8") as f:
-            obj_dict = json.load(f)
-            obj_dict = {k: self.classes()[v["__class__"]](**v)
-                        for k, v in obj_dict.items()}
-            # TODO: should this overwrite or insert?
-            FileStorage.__objects = obj_dict
+        # TODO: should this overwrite or insert?
+        FileStorage.__objects = {}
+        FileStorage.__keys = {}
+        FileStorage.__dirty = {}
+        FileStorage.__cache = {}
+        FileStorage.__raw = None
+        if FileStorage.__shard_dir:
+            FileStorage.__raw = {}
+            FileStorage.__pending = {
+                name for name in self.classes()
+                if os.path.isfile(self.__shard_path(name))}
+        elif not FileStorage.__lazy:
+            FileStorage.__raw = {}
+            classes = self.classes()
+            if FileStorage.__stream:
+                records = self._iter_records()
+            else:
+                records = self._records(FileStorage.__workers).items()
+            FileStorage.__objects = {k: classes[v["__class__"]](**v)
+                                     for k, v in records}
 
-    def attributes(self):
-        """Returns the valid attributes and their types for classname"""
-        attributes = {
-            "BaseModel":
-                     {"id": str,
-                      "created_at": datetime.datetime,
-                      "updated_at": datetime.datetime},
-            "User":
-                     {"email": str,
-                      "password": str,
-                      "first_name": str,
-                      "last_name": str},
-            "State":
-                     {"name": str},
-            "City":
-                     {"state_id": str,
-                      "name": str},
-            "Amenity":
-                     {"name": str},
-            "Place":
-                     {"city_id": str,
-                      "user_id": str,
-                      "name": str,
-                      "description": str,
-                      "number_rooms": int,
-                      "number_bathrooms": int,
-                      "max_guest": int,
-                      "price_by_night": int,
-                      "latitude": float,
-                      "longitude": float,
-                      "amenity_ids": list},
-            "Review":
-            {"place_id": str,
-                         "user_id": str,
-                         "text": str}
+    def _stored(self):
+        """Returns True if there is anything stored to reload"""
+        self.flush()
+        if FileStorage.__shard_dir:
+            return os.path.isdir(FileStorage.__shard_dir)
+        journal = self.__get_journal()
+        journal.wait()
+        return os.path.isfile(FileStorage.__file_path) or \
+            os.path.isfile(journal.path) or \
+            os.path.isfile(journal.sealed_path)
+
+    def _records(self, workers=1):
+        """Returns the stored dictionary of every object, by key
+
+        With more than one worker, the file is parsed by that many
+        processes, and the timestamps of the records are converted to
+        datetime objects already. A running compaction is waited for, so
+        the snapshot and the logs aren't read while it replaces them.
+        """
+        self.flush()
+        journal = self.__get_journal()
+        journal.wait()
+        obj_dict = {}
+        if os.path.isfile(FileStorage.__file_path):
+            if workers > 1:
+                obj_dict = load_parallel(FileStorage.__file_path, workers,
+                                         FileStorage.__serializer)
+            else:
+                obj_dict = load_file(FileStorage.__file_path,
+                                     FileStorage.__serializer)
+        return journal.replay(obj_dict)
+
+    def _iter_records(self):
+        """Yields the stored (key, dictionary) pair of every object
+
+        The file is read one record at a time, unless a journal has to
+        be replayed on top of it.
+        """
+        self.flush()
+        journal = self.__get_journal()
+        journal.wait()
+        if journal.exists():
+            yield from self._records().items()
+        elif os.path.isfile(FileStorage.__file_path):
+            yield from iter_file(FileStorage.__file_path,
+                                 FileStorage.__serializer)
+
+    def _pop_dirty(self):
+        """Returns the changes since the last save, and forgets them
+
+        Every key created, changed or deleted since the last save maps to
+        its object, or to None if it was deleted.
+        """
+        dirty = FileStorage.__dirty
+        FileStorage.__dirty = {}
+        return dirty
+
+    def __shard_path(self, name):
+        """Returns the path of the shard holding the objects of class name"""
+        return os.path.join(FileStorage.__shard_dir, name + ".json")
+
+    def __load_shards(self, name=None):
+        """Reads the shard of class name, or every shard, if not read yet
+
+        Objects created, changed or deleted since the shard was written
+        are kept as they are in memory.
+        """
+        pending = FileStorage.__pending
+        if not pending or (name is not None and name not in pending):
+            return
+        shards = [name] if name is not None else sorted(pending)
+        pending.difference_update(shards)
+        shards = [shard for shard in shards
+                  if os.path.isfile(self.__shard_path(shard))]
+        paths = [self.__shard_path(shard) for shard in shards]
+        if FileStorage.__lazy:
+            loaded = [load_file(path, FileStorage.__serializer)
+                      for path in paths]
+        elif FileStorage.__stream:
+            loaded = [iter_file(path, FileStorage.__serializer)
+                      for path in paths]
+        else:
+            loaded = load_files_parallel(paths, FileStorage.__workers,
+                                         FileStorage.__serializer)
+        objects = FileStorage.__objects
+        dirty = FileStorage.__dirty
+        for shard, obj_dict in zip(shards, loaded):
+            if isinstance(obj_dict, dict):
+                obj_dict = obj_dict.items()
+            records = ((k, v) for k, v in obj_dict
+                       if k not in objects and k not in dirty)
+            if FileStorage.__lazy:
+                FileStorage.__raw.setdefault(shard, {}).update(records)
+            else:
+                cls = self.classes()[shard]
+                for k, v in records:
+                    self.__insert(k, cls(**v))
+
+    def __raw_records(self):
+        """Returns the stored dictionaries not built yet, by class name"""
+        if FileStorage.__raw is None:
+            raw = {}
+            for k, v in self._records().items():
+                raw.setdefault(v["__class__"], {})[k] = v
+            FileStorage.__raw = raw
+        return FileStorage.__raw
+
+    def __insert(self, key, obj):
+        """Puts obj in __objects and in the per-class index"""
+        by_class = self.__class_index()
+        name = type(obj).__name__
+        if name not in by_class:
+            by_class[name] = {}
+        by_class[name][key] = obj
+        for index in FileStorage.__secondary.get(name, ()):
+            index.add(key, obj)
+        FileStorage.__objects[key] = obj
+
+    def __remove(self, key):
+        """Takes the object stored under key out of __objects and indexes"""
+        obj = FileStorage.__objects[key]
+        FileStorage.__keys.pop(id(obj), None)
+        name = type(obj).__name__
+        del self.__class_index()[name][key]
+        for index in self.__indexes_of(name):
+            index.remove(key)
+        del FileStorage.__objects[key]
+
+    def __key_of(self, obj):
+        """Returns the key under which obj is stored, or None if it isn't
+
+        The key found from the id of obj is remembered, by the identity of
+        obj, for when that id changes.
+        """
+        objects = FileStorage.__objects
+        key = FileStorage.__keys.get(id(obj))
+        if key is not None and objects.get(key) is obj:
+            return key
+        try:
+            key = "{}.{}".format(type(obj).__name__, obj.id)
+        except AttributeError:
+            return None  # obj is still being initialized
+        if objects.get(key) is not obj:
+            return None
+        FileStorage.__keys[id(obj)] = key
+        return key
+
+    def __backup(self, key, obj):
+        """Records obj (or None) as the state of key before the transaction"""
+        undo = FileStorage.__undo
+        if key not in undo:
+            undo[key] = None if obj is None else (obj, obj._state())
+
+    def __class_index(self):
+        """Returns the objects of __objects grouped by class name
+
+        The index, and the secondary indexes declared in indexes(), are
+        rebuilt whenever __objects was replaced or changed without going
+        through new() or delete().
+        """
+        objects = FileStorage.__objects
+        by_class = FileStorage.__by_class
+        if FileStorage.__by_class_of is not objects or \
+                sum(map(len, by_class.values())) != len(objects):
+            by_class = {}
+            for k, v in objects.items():
+                name = type(v).__name__
+                if name not in by_class:
+                    by_class[name] = {}
+                by_class[name][k] = v
+            FileStorage.__by_class = by_class
+            FileStorage.__by_class_of = objects
+            FileStorage.__secondary = {
+                name: [HashIndex(attribute) for attribute in attributes]
+                for name, attributes in self.indexes().items()}
+            for name, attributes in self.locations().items():
+                FileStorage.__secondary.setdefault(name, []).append(
+                    GridIndex(*attributes))
+            for name, indexes in FileStorage.__secondary.items():
+                for k, v in by_class.get(name, {}).items():
+                    for index in indexes:
+                        index.add(k, v)
+            if numpy is not None:
+                types = self.attributes()
+                for name, attributes in self.columns().items():
+                    FileStorage.__secondary.setdefault(name, []).append(
+                        ColumnStore({a: types[name][a] for a in attributes},
+                                    by_class.get(name)))
+        return by_class
+
+    def __indexes_of(self, name):
+        """Returns the secondary indexes kept for the class name"""
+        self.__class_index()
+        return FileStorage.__secondary.get(name, ())
+
+    def __column_store(self, name):
+        """Returns the column store kept for the class name, or None"""
+        for index in self.__indexes_of(name):
+            if isinstance(index, ColumnStore):
+                return index
+        return None
+
+    def __key_index(self, name):
+        """Returns the sorted keys kept for the class name, once requested"""
+        for index in self.__indexes_of(name):
+            if isinstance(index, KeyIndex):
+                return index
+        index = KeyIndex(self.__class_index().get(name, {}))
+        FileStorage.__secondary.setdefault(name, []).append(index)
+        return index
+
+    def __grid_index(self, cls):
+        """Returns the index by position kept for cls, building its objects"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.all(name)
+        for index in self.__indexes_of(name):
+            if isinstance(index, GridIndex):
+                return index
+        raise ValueError("{} has no location index".format(name))
+
+    def __query(self, name, conditions):
+        """Returns the objects of the class name matching the conditions
+
+        The conditions are evaluated with the cheapest index available:
+        the hash index finding the fewest objects for an equality, else
+        the column store for the conditions it can evaluate, else a scan
+        of every object; the remaining conditions are then checked on
+        each object found. Also returns the description of each step.
+        """
+        for condition in conditions:
+            if condition[1] not in operators:
+                raise ValueError("unknown operator: {}".format(condition[1]))
+        objects = self.all(name)
+        rest = list(conditions)
+        steps = []
+        lookup = None
+        for index in self.__indexes_of(name):
+            if not isinstance(index, HashIndex):
+                continue
+            for condition in rest:
+                attribute, op, value = condition
+                if attribute == index.attribute and op == "==":
+                    found = index.find(value)
+                    if lookup is None or len(found) < len(lookup[1]):
+                        lookup = (condition, found)
+        store = self.__column_store(name)
+        if lookup is not None:
+            rest.remove(lookup[0])
+            steps.append("hash index on {}.{}: {} of {} objects".format(
+                name, lookup[0][0], len(lookup[1]), len(objects)))
+            objects = dict(lookup[1])  # the index changes with the objects
+        elif store is not None and any(
+                attribute in store.types and
+                (store.types[attribute] is not str or op in ("==", "!="))
+                for attribute, op, _ in rest):
+            vectorized = [(attribute, op, value)
+                          for attribute, op, value in rest
+                          if attribute in store.types and
+                          (store.types[attribute] is not str or
+                           op in ("==", "!="))]
+            rest = [c for c in rest if c not in vectorized]
+            found = store.select(*vectorized)
+            steps.append("column store of {} ({}): {} of {} objects".format(
+                name, describe(vectorized),
+                len(found), len(objects)))
+            objects = found
+        else:
+            steps.append("scan of {}: {} objects".format(name, len(objects)))
+        if rest:
+            total = len(objects)
+            objects = {k: v for k, v in objects.items() if matches(v, rest)}
+            steps.append("filter ({}): {} of {} objects".format(
+                describe(rest), len(objects), total))
+        return objects, steps
+
+    def __ordered(self, objects, order, limit):
+        """Returns the objects sorted by order and cut to limit, by key
+
+        Also returns the description of each step.
+        """
+        steps = []
+        items = objects.items()
+        if order:
+            attribute = order.lstrip("-")
+            descending = order.startswith("-")
+            missing = object()
+            present = [(k, v) for k, v in items
+                       if getattr(v, attribute, missing) is not missing]
+            absent = [(k, v) for k, v in items
+                      if getattr(v, attribute, missing) is missing]
+
+            def key(item):
+                return getattr(item[1], attribute)
+            try:
+                if limit is not None and limit < len(present):
+                    top = heapq.nlargest if descending else heapq.nsmallest
+                    present = top(limit, present, key=key)
+                    steps.append("top {} by {}".format(limit, order))
+                else:
+                    present.sort(key=key, reverse=descending)
+                    steps.append("sort by {}".format(order))
+            except TypeError:
+                raise ValueError(
+                    "{} values can't be ordered".format(attribute)) from None
+            items = present + absent
+        if limit is not None:
+            items = list(items)[:limit]
+            steps.append("limit {}: {} objects".format(limit, len(items)))
+        return dict(items), steps
+
+    def __build(self, record):
+        """Returns the object described by a stored dictionary"""
+        return self.classes()[record["__class__"]](**record)
+
+    def indexes(self):
+        """Returns the attributes indexed by value for each classname"""
+        indexes = {
+            "City": ("state_id",),
+            "Place": ("city_id", "user_id"),
+            "Review": ("place_id", "user_id")
         }
-        return attributes
+        return indexes
+
+    def locations(self):
+        """Returns the latitude and longitude attributes for each classname
+
+        The objects of these classes are indexed by position.
+        """
+        locations = {
+            "Place": ("latitude", "longitude")
+        }
+        return locations
+
+    def columns(self):
+        """Returns the attributes kept in a column store for each classname
+
+        The column stores are only kept if numpy is installed.
+        """
+        columns = {
+            "Place": ("city_id", "user_id", "number_rooms",
+                      "number_bathrooms", "max_guest", "price_by_night",
+                      "latitude", "longitude")
+        }
+        return columns
+
+    def attributes(self):
+        """Returns the valid attributes and their types for each classname
+
+        The types are those of the class-level defaults of the models,
+        registered with them (see models.base_model); the dictionary is
+        shared by every call and must not be changed.
+        """
+        return self.__get_registry()[1]
+
+    def schemas(self):
+        """Returns the schema of each classname, casting the values of its
+        attributes and those of BaseModel (see models.schema)"""
+        return self.__get_registry()[2]
+
+    def __get_registry(self):
+        """Returns the classes, attributes and schemas registered by the
+        models, importing the models the first time"""
+        if FileStorage.__registry is None:
+            import models.user
+            import models.state
+            import models.city
+            import models.amenity
+            import models.place
+            import models.review
+            from models.base_model import attributes, classes, schemas
+            FileStorage.__registry = (classes, attributes, schemas)
+        return FileStorage.__registry
+
+    def __get_journal(self):
+        """Returns the Journal kept next to __file_path"""
+        journal = FileStorage.__journals.get(FileStorage.__file_path)
+        if journal is None:
+            journal = Journal(FileStorage.__file_path + ".journal")
+            FileStorage.__journals[FileStorage.__file_path] = journal
+        return journal
+
+    def __get_flusher(self):
+        """Returns the Flusher writing the saves in the background"""
+        if FileStorage.__flusher is None or \
+                FileStorage.__flusher.window != FileStorage.__flush_window:
+            self.flush()
+            FileStorage.__flusher = Flusher(FileStorage.__flush_window)
+        return FileStorage.__flusher
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Module for the background Flusher used by FileStorage."""
+import atexit
+import threading
+import time
+from models.engine.serializers import write_file
+
+
+class Flusher:
+
+    """Background thread writing the snapshots FileStorage hands to it
+
+    Snapshots submitted within `window` seconds of each other are
+    coalesced: only the last one of each file is written.
+    """
+
+    def __init__(self, window):
+        """Initializes the flusher
+
+        Args:
+            - window: seconds to wait for more snapshots before writing
+        """
+        self.window = window
+        self.__condition = threading.Condition()
+        self.__pending = {}
+        self.__writing = False
+        self.__error = None
+        self.__thread = None
+        atexit.register(self.flush)
+
+    def submit(self, path, serializer, items):
+        """Schedules the items to be written to the file at path"""
+        with self.__condition:
+            self.__pending[path] = (serializer, items)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def flush(self):
+        """Blocks until every submitted snapshot is on disk
+
+        An error raised while writing in the background is raised here.
+        """
+        with self.__condition:
+            while self.__pending or self.__writing:
+                self.__condition.wait()
+            error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        """Writes the pending snapshots, forever"""
+        while True:
+            with self.__condition:
+                while not self.__pending:
+                    self.__condition.wait()
+            time.sleep(self.window)
+            with self.__condition:
+                pending, self.__pending = self.__pending, {}
+                self.__writing = True
+            try:
+                for path, (serializer, items) in pending.items():
+                    write_file(path, serializer, items)
+            except Exception as error:
+                self.__error = error
+            finally:
+                with self.__condition:
+                    self.__writing = False
+                    self.__condition.notify_all()
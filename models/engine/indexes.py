@@ -0,0 +1,294 @@
+#!/usr/bin/python3
+"""Module for the secondary indexes kept by FileStorage."""
+import bisect
+import math
+
+
+class HashIndex:
+
+    """Index of the objects of one class by the value of one attribute
+
+    Like every secondary index of FileStorage it exposes add(key, obj),
+    called whenever obj is stored or changed, and remove(key).
+    """
+
+    def __init__(self, attribute):
+        """Initializes the index
+
+        Args:
+            - attribute: name of the indexed attribute
+        """
+        self.attribute = attribute
+        self.__buckets = {}
+        self.__values = {}
+
+    def add(self, key, obj):
+        """Indexes (or re-indexes) obj under its current value"""
+        value = getattr(obj, self.attribute, None)
+        try:
+            hash(value)
+        except TypeError:
+            value = None  # unhashable values can't be looked up anyway
+        if key in self.__values:
+            if self.__values[key] == value and \
+                    self.__buckets[value].get(key) is obj:
+                return
+            self.remove(key)
+        self.__values[key] = value
+        bucket = self.__buckets.get(value)
+        if bucket is None:
+            bucket = self.__buckets[value] = {}
+        bucket[key] = obj
+
+    def remove(self, key):
+        """Removes the object stored under key from the index"""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        bucket = self.__buckets[value]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[value]
+
+    def find(self, value):
+        """Returns the objects whose attribute equals value, by key"""
+        try:
+            return self.__buckets.get(value, {})
+        except TypeError:
+            return {}
+
+
+def check_finite(**numbers):
+    """Raises ValueError naming the first of numbers that isn't finite"""
+    for name, number in numbers.items():
+        if not math.isfinite(number):
+            raise ValueError("{} must be a number".format(name))
+
+
+class GridIndex:
+
+    """Index of the objects of one class by position on the globe
+
+    The objects are bucketed in cells of a fixed size in degrees of
+    latitude and longitude, so a radius or bounding box query only looks
+    at the objects of the cells it overlaps. Objects whose coordinates
+    aren't numbers within range are left out. Like every secondary index
+    of FileStorage it exposes add(key, obj) and remove(key).
+    """
+    earth_radius = 6371.0088  # mean radius, in km
+
+    def __init__(self, latitude, longitude, cell=0.1):
+        """Initializes the index
+
+        Args:
+            - latitude: name of the latitude attribute, in degrees
+            - longitude: name of the longitude attribute, in degrees
+            - cell: size of the cells, in degrees
+        """
+        self.attributes = (latitude, longitude)
+        self.cell = cell
+        self.__rows = math.ceil(180 / cell)
+        self.__columns = math.ceil(360 / cell)
+        self.__cells = {}
+        self.__positions = {}
+
+    def __len__(self):
+        """Returns the number of indexed objects"""
+        return len(self.__positions)
+
+    def add(self, key, obj):
+        """Indexes (or re-indexes) obj under its current position"""
+        try:
+            lat = float(getattr(obj, self.attributes[0]))
+            lon = float(getattr(obj, self.attributes[1]))
+        except (AttributeError, TypeError, ValueError):
+            lat = lon = math.nan
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            self.remove(key)
+            return
+        cell = self.__cell_of(lat, lon)
+        position = self.__positions.get(key)
+        if position is not None:
+            if position[:2] == (lat, lon) and \
+                    self.__cells[cell].get(key) is obj:
+                return
+            self.remove(key)
+        self.__positions[key] = (lat, lon, cell)
+        bucket = self.__cells.get(cell)
+        if bucket is None:
+            bucket = self.__cells[cell] = {}
+        bucket[key] = obj
+
+    def remove(self, key):
+        """Removes the object stored under key from the index"""
+        position = self.__positions.pop(key, None)
+        if position is None:
+            return
+        bucket = self.__cells[position[2]]
+        del bucket[key]
+        if not bucket:
+            del self.__cells[position[2]]
+
+    def near(self, lat, lon, radius):
+        """Returns the objects within radius km of (lat, lon), by key
+
+        The objects are ordered from the nearest to the farthest.
+        """
+        check_finite(latitude=lat, longitude=lon, radius=radius)
+        span = radius / self.earth_radius
+        dlat = math.degrees(span)
+        first = self.__row_of(lat - dlat)
+        last = self.__row_of(lat + dlat)
+        lat_r = math.radians(lat)
+        if abs(lat) + dlat >= 90 or math.sin(span) >= math.cos(lat_r):
+            west, east = 0, self.__columns - 1
+        else:
+            dlon = math.degrees(math.asin(math.sin(span) / math.cos(lat_r)))
+            west = math.floor((lon - dlon + 180) / self.cell)
+            east = math.floor((lon + dlon + 180) / self.cell)
+        found = []
+        positions = self.__positions
+        for key, obj in self.__candidates(first, last, west, east):
+            p_lat, p_lon = positions[key][:2]
+            distance = self.distance(lat, lon, p_lat, p_lon)
+            if distance <= radius:
+                found.append((distance, key, obj))
+        found.sort(key=lambda item: item[0])
+        return {key: obj for _, key, obj in found}
+
+    def within_bbox(self, south, west, north, east):
+        """Returns the objects inside a bounding box, by key
+
+        The box spans the antimeridian if west is greater than east.
+        """
+        check_finite(south=south, west=west, north=north, east=east)
+        first = self.__row_of(south)
+        last = self.__row_of(north)
+        west_col = math.floor((west + 180) / self.cell)
+        east_col = math.floor((east + 180) / self.cell)
+        if west > east:
+            east_col += self.__columns
+        found = {}
+        positions = self.__positions
+        for key, obj in self.__candidates(first, last, west_col, east_col):
+            p_lat, p_lon = positions[key][:2]
+            if south <= p_lat <= north and (
+                    west <= p_lon <= east if west <= east
+                    else p_lon >= west or p_lon <= east):
+                found[key] = obj
+        return found
+
+    @classmethod
+    def distance(cls, lat1, lon1, lat2, lon2):
+        """Returns the great-circle distance between two points, in km"""
+        lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+        h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * \
+            math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        return 2 * cls.earth_radius * math.asin(min(1.0, math.sqrt(h)))
+
+    def __candidates(self, first, last, west, east):
+        """Yields the (key, obj) pairs of the cells in a range
+
+        Columns wrap around the antimeridian. When the range holds more
+        cells than there are objects, every object is yielded instead.
+        """
+        columns = min(east - west + 1, self.__columns)
+        if (last - first + 1) * columns > len(self.__positions):
+            for bucket in self.__cells.values():
+                yield from bucket.items()
+            return
+        cells = self.__cells
+        for row in range(first, last + 1):
+            for column in range(west, west + columns):
+                bucket = cells.get((row, column % self.__columns))
+                if bucket:
+                    yield from bucket.items()
+
+    def __row_of(self, lat):
+        """Returns the row of the cells holding lat, clamped to the globe"""
+        return min(max(math.floor((lat + 90) / self.cell), 0),
+                   self.__rows - 1)
+
+    def __cell_of(self, lat, lon):
+        """Returns the (row, column) of the cell holding a position"""
+        return (self.__row_of(lat),
+                math.floor((lon + 180) / self.cell) % self.__columns)
+
+
+class KeyIndex:
+
+    """Keys of the objects of one class, in sorted order
+
+    The keys are kept in a sorted list, so the keys following any key
+    are found by bisection whatever their number. Keys added or removed
+    since the last lookup are only merged into the list at the next
+    one, so storing many objects in a row never shifts the list for
+    each of them. Like every secondary index of FileStorage it exposes
+    add(key, obj) and remove(key).
+    """
+    merge_limit = 64
+
+    def __init__(self, keys=()):
+        """Initializes the index
+
+        Args:
+            - keys: keys to index first, in any order
+        """
+        self.__keys = sorted(keys)
+        self.__added = set()
+        self.__removed = set()
+
+    def __len__(self):
+        """Returns the number of indexed keys"""
+        return len(self.__keys) + len(self.__added) - len(self.__removed)
+
+    def add(self, key, obj):
+        """Indexes key, if it isn't already"""
+        if key in self.__removed:
+            self.__removed.discard(key)
+        elif not self.__contains(key):
+            self.__added.add(key)
+
+    def remove(self, key):
+        """Removes key from the index"""
+        if key in self.__added:
+            self.__added.discard(key)
+        elif key not in self.__removed and self.__contains(key):
+            self.__removed.add(key)
+
+    def after(self, key=None, limit=None):
+        """Returns the sorted keys following key (or all), at most limit"""
+        keys = self.__sorted()
+        start = 0 if key is None else bisect.bisect_right(keys, key)
+        return keys[start:] if limit is None else keys[start:start + limit]
+
+    def __contains(self, key):
+        """Returns True if key is in the sorted list"""
+        keys = self.__keys
+        i = bisect.bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def __sorted(self):
+        """Returns the sorted list, merging the pending changes first
+
+        A few changes are applied one by one, more by sorting again,
+        which merges the list and the new keys in linear time.
+        """
+        added, removed = self.__added, self.__removed
+        if not added and not removed:
+            return self.__keys
+        keys = self.__keys
+        if len(added) + len(removed) <= self.merge_limit:
+            for key in removed:
+                del keys[bisect.bisect_left(keys, key)]
+            for key in added:
+                bisect.insort(keys, key)
+        else:
+            if removed:
+                keys = [k for k in keys if k not in removed]
+            keys.extend(added)
+            keys.sort()
+            self.__keys = keys
+        self.__added = set()
+        self.__removed = set()
+        return self.__keys
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""Module for the append-only Journal used by FileStorage."""
+import json
+import os
+import threading
+from models.engine.serializers import load_file, write_file
+
+
+class Journal:
+
+    """Append-only log of storage changes, one JSON record per line
+
+    Every record is either {"op": "set", "key": <key>, "value": <dict>}
+    or {"op": "del", "key": <key>}. The log lives next to the snapshot
+    file and is folded back into it by compact() once it grows too big.
+    """
+
+    def __init__(self, path):
+        """Initializes the journal
+
+        Args:
+            - path: path of the live log file
+        """
+        self.path = path
+        self.sealed_path = path + ".1"
+        self.__compactor = None
+
+    def append(self, records):
+        """Appends the (op, key, value) records to the live log"""
+        lines = []
+        for op, key, value in records:
+            if op == "set":
+                lines.append(json.dumps(
+                    {"op": op, "key": key, "value": value}))
+            else:
+                lines.append(json.dumps({"op": op, "key": key}))
+        if not lines:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def size(self):
+        """Returns the size in bytes of the live log"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def replay(self, obj_dict):
+        """Applies the sealed then the live log on top of obj_dict"""
+        for path in (self.sealed_path, self.path):
+            self.__apply(path, obj_dict)
+        return obj_dict
+
+    def exists(self):
+        """Returns True if there is a log to replay"""
+        return os.path.isfile(self.path) or os.path.isfile(self.sealed_path)
+
+    def compacting(self):
+        """Returns True while a background compaction is running"""
+        return self.__compactor is not None and self.__compactor.is_alive()
+
+    def compact(self, snapshot_path, serializer):
+        """Folds the live log into snapshot_path in a background thread
+
+        The live log is first sealed by renaming it, so appends made
+        while the compaction runs go to a fresh log and are never lost.
+        The snapshot is rewritten with serializer, whatever its format.
+        A sealed log left by an interrupted compaction is folded into the
+        snapshot first; applying it again is harmless.
+        """
+        if self.compacting():
+            return
+        if os.path.isfile(self.sealed_path):
+            self.__compact(snapshot_path, serializer)
+        os.replace(self.path, self.sealed_path)
+        self.__compactor = threading.Thread(
+            target=self.__compact, args=(snapshot_path, serializer))
+        self.__compactor.start()
+
+    def wait(self):
+        """Blocks until a running compaction is finished"""
+        if self.__compactor is not None:
+            self.__compactor.join()
+
+    def clear(self):
+        """Removes the log files once a full snapshot has been written"""
+        self.wait()
+        for path in (self.sealed_path, self.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __compact(self, snapshot_path, serializer):
+        """Rewrites the snapshot with the sealed log applied"""
+        obj_dict = {}
+        if os.path.isfile(snapshot_path):
+            obj_dict = load_file(snapshot_path, serializer.name)
+        self.__apply(self.sealed_path, obj_dict)
+        write_file(snapshot_path, serializer,
+                   (serializer.encode_item(k, v) for k, v in obj_dict.items()))
+        os.remove(self.sealed_path)
+
+    @staticmethod
+    def __apply(path, obj_dict):
+        """Applies every complete record of the log at path to obj_dict"""
+        if not os.path.isfile(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn last line of an interrupted append
+                if record["op"] == "set":
+                    obj_dict[record["key"]] = record["value"]
+                else:
+                    obj_dict.pop(record["key"], None)
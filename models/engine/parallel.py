@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+"""Module for reading stored or imported records with several processes
+
+The records are parsed, and their created_at/updated_at timestamps
+converted to datetime objects, in a pool of worker processes; the
+calling process only merges the results. Workers are forked so they
+share the already imported models, which limits the parallel path to
+the platforms that can fork; anywhere else the records are read in the
+calling process.
+"""
+import collections
+import itertools
+import json
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from models.engine.serializers import load_file
+from models.timestamps import parse_datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+boundary = re.compile(rb'\}, ?"')
+
+
+def can_fork():
+    """Returns True if worker processes can be forked here"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def convert(obj_dict):
+    """Converts the timestamps of every record of obj_dict in place"""
+    for record in obj_dict.values():
+        for key in ("created_at", "updated_at"):
+            if key in record:
+                record[key] = parse_datetime(record[key])
+    return obj_dict
+
+
+def load_chunk(chunk, name="json"):
+    """Returns the records of a chunk of a JSON object, converted
+
+    The chunk is parsed with orjson if name, the configured serializer,
+    is orjson, unless orjson can't read it.
+    """
+    chunk = b"{" + chunk + b"}"
+    if name == "orjson" and orjson is not None:
+        try:
+            return convert(orjson.loads(chunk))
+        except orjson.JSONDecodeError:
+            pass
+    return convert(json.loads(chunk))
+
+
+def load_converted(path, name="json"):
+    """Returns the records stored in the file at path, converted"""
+    return convert(load_file(path, name))
+
+
+def split_json(data, parts):
+    """Splits the items of a JSON object in about parts chunks of bytes
+
+    A chunk only ends after the closing brace of a record followed by
+    the separator and the quote of the next key. Returns None if data
+    isn't a JSON object.
+    """
+    data = data.strip()
+    if data[:1] != b"{" or data[-1:] != b"}":
+        return None
+    body = data[1:-1]
+    chunks = []
+    start = 0
+    for i in range(1, parts):
+        match = boundary.search(body, max(start, len(body) * i // parts))
+        if match is None:
+            break
+        chunks.append(body[start:match.start() + 1])
+        start = match.end() - 1
+    chunks.append(body[start:])
+    return chunks
+
+
+def load_parallel(path, workers, name="json"):
+    """Returns the records stored in the file at path, converted
+
+    JSON files are split in chunks parsed by workers processes. Files
+    in other formats, or JSON files a string of which fooled the split,
+    are read in the calling process. name is the configured serializer.
+    """
+    if workers <= 1 or not can_fork():
+        return load_converted(path, name)
+    with open(path, "rb") as f:
+        chunks = split_json(f.read(), workers)
+    if chunks is None or len(chunks) == 1:
+        return load_converted(path, name)
+    obj_dict = {}
+    try:
+        with executor(workers) as pool:
+            for records in pool.map(load_chunk, chunks,
+                                    itertools.repeat(name)):
+                obj_dict.update(records)
+    except ValueError:
+        return load_converted(path, name)
+    return obj_dict
+
+
+def load_files_parallel(paths, workers, name="json"):
+    """Returns the records of each file of paths, converted, in order"""
+    if workers <= 1 or len(paths) <= 1 or not can_fork():
+        return [load_converted(path, name) for path in paths]
+    with executor(min(workers, len(paths))) as pool:
+        return list(pool.map(load_converted, paths, itertools.repeat(name)))
+
+
+def map_chunks(function, chunks, workers, *args):
+    """Yields function(chunk, *args) for each chunk of chunks, in order
+
+    The calls run in workers forked processes, with at most twice as
+    many chunks handed to them at once, so chunks are only read as the
+    results are consumed.
+    """
+    if workers <= 1 or not can_fork():
+        for chunk in chunks:
+            yield function(chunk, *args)
+        return
+    with executor(workers) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(function, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def executor(workers):
+    """Returns a pool of workers forked processes"""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork"))
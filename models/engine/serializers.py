@@ -0,0 +1,355 @@
+#!/usr/bin/python3
+"""Module for the serializers FileStorage writes its file with
+
+Every serializer turns one stored object into an encoded item with
+encode_item(key, record), writes a sequence of items to a binary file
+with write(f, items), one item at a time so no copy of the whole file
+is built in memory, and reads a whole file back into a dictionary of
+records by key with load(f), or one (key, record) pair at a time with
+iterate(f). Items are kept by FileStorage between saves,
+so an object that didn't change is never encoded twice.
+"""
+import codecs
+import json
+import json.scanner
+import os
+import pickle
+import re
+import stat
+import struct
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+umask = os.umask(0)
+os.umask(umask)
+
+
+class JSONSerializer:
+
+    """Standard library JSON, byte-compatible with json.dump()"""
+    name = "json"
+    block_size = 64 * 1024
+    whitespace = re.compile(r"[ \t\n\r]*")
+    simple_key = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+    separator = re.compile(r"[ \t\n\r]*([,}])")
+
+    def encode_item(self, key, record):
+        """Returns the encoded '"<key>": <record>' item"""
+        return (json.dumps(key) + ": " + json.dumps(record)).encode()
+
+    def write(self, f, items):
+        """Writes the items to f as one JSON object"""
+        write_joined(f, items, b"{", b", ", b"}")
+
+    def load(self, f):
+        """Returns the dictionary stored in f"""
+        return json.loads(f.read())
+
+    def iterate(self, f):
+        """Yields the (key, record) pairs stored in f one at a time
+
+        f is read and decoded in blocks, so no more than a block and
+        the record being decoded are held in memory at once. Like
+        json.load() does for a whole file, the keys of the records are
+        shared between them.
+        """
+        decode = codecs.getincrementaldecoder("utf-8")().decode
+        scan = json.scanner.make_scanner(json.JSONDecoder())
+        whitespace = self.whitespace
+        simple_key = self.simple_key
+        separator = self.separator
+        keys = {}
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            """Appends the next block of f to what is left of buf"""
+            nonlocal buf, pos, eof
+            if eof:
+                raise ValueError("truncated JSON file")
+            block = f.read(self.block_size)
+            eof = not block
+            buf = buf[pos:] + decode(block, final=eof)
+            pos = 0
+
+        def peek():
+            """Skips whitespace and returns the next character"""
+            nonlocal pos
+            while True:
+                pos = whitespace.match(buf, pos).end()
+                if pos < len(buf):
+                    return buf[pos]
+                fill()
+
+        def value():
+            """Decodes the JSON value starting at pos"""
+            nonlocal pos
+            while True:
+                try:
+                    obj, end = scan(buf, pos)
+                except (StopIteration, ValueError):
+                    start = whitespace.match(buf, pos).end()
+                    if start == pos:
+                        fill()
+                    else:
+                        pos = start
+                    continue
+                if end < len(buf) or eof:
+                    pos = end
+                    return obj
+                fill()  # a number might go on in the next block
+
+        if peek() != "{":
+            raise ValueError("not a JSON object")
+        pos += 1
+        if peek() == "}":
+            return
+        while True:
+            match = simple_key.match(buf, pos)
+            if match is not None:
+                key = match.group(1)
+                pos = match.end()
+            else:
+                key = value()
+                if peek() != ":":
+                    raise ValueError("expecting ':' at {}".format(pos))
+                pos += 1
+            record = value()
+            if type(record) is dict:
+                record = {keys.setdefault(k, k): v for k, v in record.items()}
+            yield key, record
+            match = separator.match(buf, pos)
+            if match is not None:
+                end = match.group(1)
+                pos = match.end()
+            else:
+                end = peek()
+                pos += 1
+            if end == "}":
+                return
+            if end != ",":
+                raise ValueError("expecting ',' or '}}' at {}".format(pos))
+
+
+class OrjsonSerializer(JSONSerializer):
+
+    """orjson, a faster JSON encoder writing compact file.json files"""
+    name = "orjson"
+
+    def __init__(self):
+        """Initializes the serializer, if orjson is installed"""
+        if orjson is None:
+            raise ImportError("the orjson serializer needs orjson")
+
+    def encode_item(self, key, record):
+        """Returns the encoded '"<key>":<record>' item"""
+        return orjson.dumps(key) + b":" + orjson.dumps(record)
+
+    def write(self, f, items):
+        """Writes the items to f as one JSON object"""
+        write_joined(f, items, b"{", b",", b"}")
+
+    def load(self, f):
+        """Returns the dictionary stored in f
+
+        Files orjson can't read, e.g. holding NaN written by json.dump(),
+        are read by the standard library instead.
+        """
+        data = f.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+
+class MsgpackSerializer:
+
+    """MessagePack, a compact binary format, if msgpack is installed"""
+    name = "msgpack"
+
+    def __init__(self):
+        """Initializes the serializer, if msgpack is installed"""
+        if msgpack is None:
+            raise ImportError("the msgpack serializer needs msgpack")
+
+    def encode_item(self, key, record):
+        """Returns the packed key followed by the packed record"""
+        return msgpack.packb(key) + msgpack.packb(record)
+
+    def write(self, f, items):
+        """Writes the items to f as one MessagePack map
+
+        The map starts with its size, so the items, but not a copy of
+        them, are gathered in a list first.
+        """
+        items = list(items)
+        if len(items) < 16:
+            f.write(struct.pack(">B", 0x80 | len(items)))
+        elif len(items) < 2 ** 16:
+            f.write(struct.pack(">BH", 0xde, len(items)))
+        else:
+            f.write(struct.pack(">BI", 0xdf, len(items)))
+        write_joined(f, items)
+
+    def load(self, f):
+        """Returns the dictionary stored in f"""
+        return msgpack.unpackb(f.read(), raw=False)
+
+    def iterate(self, f):
+        """Yields the (key, record) pairs stored in f one at a time"""
+        unpacker = msgpack.Unpacker(f, raw=False)
+        for _ in range(unpacker.read_map_header()):
+            yield unpacker.unpack(), unpacker.unpack()
+
+
+class PickleSerializer:
+
+    """Pickle protocol 5, a standard library binary format
+
+    The file is a sequence of pickled (key, record) pairs. Like any
+    pickle it must only be read from a trusted source.
+    """
+    name = "pickle"
+
+    def encode_item(self, key, record):
+        """Returns the pickled (key, record) pair"""
+        return pickle.dumps((key, record), protocol=5)
+
+    def write(self, f, items):
+        """Writes the items to f one after the other"""
+        for item in items:
+            f.write(item)
+
+    def load(self, f):
+        """Returns the dictionary stored in f"""
+        return dict(self.iterate(f))
+
+    def iterate(self, f):
+        """Yields the (key, record) pairs stored in f one at a time"""
+        while f.peek(1):
+            yield pickle.load(f)
+
+
+serializers = {"json": JSONSerializer,
+               "orjson": OrjsonSerializer,
+               "msgpack": MsgpackSerializer,
+               "pickle": PickleSerializer}
+
+
+def get_serializer(name):
+    """Returns the serializer registered as name"""
+    if name not in serializers:
+        raise ValueError("unknown serializer: {}".format(name))
+    return serializers[name]()
+
+
+def write_joined(f, items, start=b"", separator=b"", end=b""):
+    """Writes start, the items separated by separator, then end to f
+
+    The items are written one at a time, like b"".join() would lay them
+    out, without ever building the joined bytes.
+    """
+    write = f.write
+    write(start)
+    first = True
+    for item in items:
+        if first:
+            first = False
+        else:
+            write(separator)
+        write(item)
+    write(end)
+
+
+def write_file(path, serializer, items):
+    """Atomically replaces the file at path with the items
+
+    The items are written to a temporary file which is flushed to disk
+    before being renamed over path, so a crash leaves either the old or
+    the new file, never a truncated one. The new file keeps the
+    permissions of the old one (see file_mode).
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            serializer.write(f, items)
+            f.flush()
+            os.fchmod(f.fileno(), file_mode(path))
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # directories can't be opened on every platform
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def file_mode(path):
+    """Returns the permissions of the file at path
+
+    If there is no file yet, those open() gives a new file under the
+    umask are returned, rather than the owner-only ones of a temporary
+    file.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~umask
+
+
+def load_file(path, name="json"):
+    """Returns the dictionary stored in the file at path, in any format
+
+    name is the configured serializer (see detect_serializer).
+    """
+    with open(path, "rb") as f:
+        if not f.peek(1):
+            return {}
+        return detect_serializer(f, name).load(f)
+
+
+def iter_file(path, name="json"):
+    """Yields the (key, record) pairs of the file at path one at a time"""
+    with open(path, "rb") as f:
+        if f.peek(1):
+            yield from detect_serializer(f, name).iterate(f)
+
+
+def detect_serializer(f, name="json"):
+    """Returns a serializer able to read the binary file f
+
+    The format is told from the first bytes of the file, which are left
+    unread. JSON files are only read with orjson if name, the configured
+    serializer, is orjson, as it reads some of what json.dump() writes
+    differently. Pickles are only read if name is pickle, since loading
+    one runs whatever code it holds.
+    """
+    head = f.peek(2)[:2]
+    if head[:1] == b"{":
+        if name == "orjson" and orjson is not None:
+            return OrjsonSerializer()
+        return JSONSerializer()
+    if head == b"\x80\x05":
+        if name != "pickle":
+            raise ValueError("unknown storage file format")
+        return PickleSerializer()
+    if head[:1] and (0x80 <= head[0] <= 0x8f or head[0] in (0xde, 0xdf)):
+        return MsgpackSerializer()
+    raise ValueError("unknown storage file format")
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""Module for the typed schema of the model classes
+
+The schema of a class maps each of its attributes to its type and to the
+function casting other values to that type. Schemas are compiled once,
+when the class is registered (see models.base_model), so a record is
+coerced by a single loop over its values, which only calls a cast for
+the values that don't have their type already.
+"""
+import json
+from datetime import datetime
+from models.timestamps import parse_datetime
+
+
+def to_str(value):
+    """Returns value as a string, None staying None"""
+    return value if value is None else str(value)
+
+
+def to_int(value):
+    """Returns value as an int, None staying None
+
+    Floats, and strings such as "4.0", are only accepted when integral.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) or isinstance(value, str) and "." in value:
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError("not an integer: {!r}".format(value))
+        return int(number)
+    return int(value)
+
+
+def to_float(value):
+    """Returns value as a float, None staying None"""
+    return value if value is None else float(value)
+
+
+def to_datetime(value):
+    """Returns value as a datetime, from ISO 8601 or epoch microseconds"""
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    return parse_datetime(value)
+
+
+def to_list(value):
+    """Returns value as a list, None staying None
+
+    Strings are read as JSON, e.g. '["a", "b"]', and tuples converted.
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    elif isinstance(value, tuple):
+        value = list(value)
+    if value is not None and not isinstance(value, list):
+        raise ValueError("not a list: {!r}".format(value))
+    return value
+
+
+def to_dict(value):
+    """Returns value as a dictionary, None staying None
+
+    Strings are read as JSON, e.g. '{"a": 1}'.
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    if value is not None and not isinstance(value, dict):
+        raise ValueError("not a dict: {!r}".format(value))
+    return value
+
+
+casts = {str: to_str, int: to_int, float: to_float, datetime: to_datetime,
+         list: to_list, dict: to_dict}
+type_names = {str: "a string", int: "a number", float: "a number",
+              datetime: "a date", list: "a list", dict: "a dictionary"}
+
+
+def compile_schema(types):
+    """Returns the schema of the attributes typed by types
+
+    Args:
+        - types: dictionary of the type of each attribute
+    """
+    return {name: (t, casts[t]) for name, t in types.items()}
+
+
+def coerce_record(schema, record, strict=True):
+    """Casts, in place, the values of record to the types of schema
+
+    Values of attributes missing from schema are left as they are.
+    Returns record; raises ValueError or TypeError for a value that
+    can't be cast, unless strict is False: the value is then kept as it
+    is, but for the timestamps, which must always be datetimes.
+    """
+    get = schema.get
+    for name, value in record.items():
+        field = get(name)
+        if field is not None and type(value) is not field[0]:
+            try:
+                record[name] = field[1](value)
+            except (TypeError, ValueError):
+                if strict or field[0] is datetime:
+                    raise
+    return record
+
+
+def coerce_value(schema, name, value):
+    """Returns value cast to the type of the attribute name of schema
+
+    Raises ValueError, saying what the attribute must be, if it can't be.
+    """
+    field = schema.get(name)
+    if field is None or type(value) is field[0]:
+        return value
+    try:
+        return field[1](value)
+    except (TypeError, ValueError):
+        raise ValueError("{} must be {}".format(
+            name, type_names[field[0]])) from None
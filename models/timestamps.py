@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""Module for the codec of the created_at/updated_at timestamps
+
+Timestamps are stored as ISO 8601 strings ("2017-09-28T21:03:54.052298"),
+or as integer microseconds since the epoch when HBNB_TIMESTAMP_FORMAT is
+set to "epoch_us". Both forms are always accepted when parsing.
+"""
+import os
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+EPOCH_US = os.getenv("HBNB_TIMESTAMP_FORMAT") == "epoch_us"
+
+
+def parse_datetime(value):
+    """Returns the datetime stored as value"""
+    if type(value) is int:
+        return EPOCH + value * MICROSECOND
+    if type(value) is datetime:
+        return value
+    return datetime.fromisoformat(value)
+
+
+def format_datetime(dt):
+    """Returns the stored form of the datetime dt"""
+    if EPOCH_US:
+        return (dt - EPOCH) // MICROSECOND
+    return dt.isoformat()
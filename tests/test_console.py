@@ -10,13 +10,22 @@ Unittest classes:
     TestHBNBCommand_all
     TestHBNBCommand_destroy
     TestHBNBCommand_update
+    TestHBNBCommand_count
+    TestHBNBCommand_transaction
+    TestHBNBCommand_near
+    TestHBNBCommand_where
+    TestHBNBCommand_batch
+    TestHBNBCommand_bulk
+    TestHBNBCommand_parse
 """
+import json
 import os
 import sys
 import unittest
 from models import storage
 from models.engine.file_storage import FileStorage
-from console import HBNBCommand
+from models.engine.serializers import write_file
+from console import HBNBCommand, parse_command
 from io import StringIO
 from unittest.mock import patch
 
@@ -99,7 +108,10 @@ class TestHBNBCommand_help(unittest.TestCase):
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  begin   count   destroy  export  import  quit      show    "
+             "where \n"
+             "all  commit  create  explain  help    near    rollback  update  "
+             "within")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -161,6 +173,39 @@ class TestHBNBCommand_create(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("BaseModel.create()"))
             self.assertEqual(correct, output.getvalue().strip())
 
+    def test_create_with_attributes(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'create Place name="My \\"little\\" house" max_guest=4 '
+                'price_by_night="90" latitude=1.5 rating=good'))
+            obj = storage.get("Place", output.getvalue().strip())
+        self.assertEqual('My "little" house', obj.name)
+        self.assertEqual(4, obj.max_guest)
+        self.assertEqual(90, obj.price_by_night)
+        self.assertEqual(1.5, obj.latitude)
+        self.assertEqual("good", obj.rating)
+
+    def test_create_invalid_attribute(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create Place max_guest"))
+            self.assertEqual("** invalid parameter: max_guest **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create Place max_guest=x"))
+            self.assertEqual("** max_guest must be a number **",
+                             output.getvalue().strip())
+
+    def test_create_generated_attribute(self):
+        count = len(storage.all())
+        for name, value in (("id", "abc"), ("created_at", "2020"),
+                            ("updated_at", "2020"), ("__class__", "User")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "create Place {}={}".format(name, value)))
+                self.assertEqual("** invalid parameter: {} **".format(name),
+                                 output.getvalue().strip())
+        self.assertEqual(count, len(storage.all()))
+
     def test_create_object(self):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("create BaseModel"))
@@ -813,6 +858,36 @@ class TestHBNBCommand_all(unittest.TestCase):
             self.assertIn("Review", output.getvalue().strip())
             self.assertNotIn("BaseModel", output.getvalue().strip())
 
+    def test_all_pages(self):
+        for _ in range(5):
+            with patch("sys.stdout", new=StringIO()):
+                self.assertFalse(HBNBCommand().onecmd("create Review"))
+        ids = [k.split(".")[1] for k in sorted(storage.all("Review"))]
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("Review.all(limit=2)"))
+            self.assertEqual(2, output.getvalue().count("[Review]"))
+            self.assertIn(ids[0], output.getvalue())
+        command = 'Review.all(limit=2, after="{}")'.format(ids[1])
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+            self.assertEqual(2, output.getvalue().count("[Review]"))
+            self.assertIn(ids[2], output.getvalue())
+            self.assertIn(ids[3], output.getvalue())
+        command = "all Review after={}".format(ids[-1])
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_all_invalid_page(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("Review.all(limit=x)"))
+            self.assertEqual("** limit must be a positive integer **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('Review.all(text="a")'))
+            self.assertEqual("** all only takes limit and after **",
+                             output.getvalue().strip())
+
     def test_all_single_object_dot_notation(self):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("create BaseModel"))
@@ -851,6 +926,30 @@ class TestHBNBCommand_all(unittest.TestCase):
             self.assertIn("Review", output.getvalue().strip())
             self.assertNotIn("BaseModel", output.getvalue().strip())
 
+    def test_all_output_is_list_repr(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create User"))
+            self.assertFalse(HBNBCommand().onecmd("create User"))
+        correct = str([str(obj) for obj in storage.all("User").values()])
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all User"))
+            self.assertEqual(correct + "\n", output.getvalue())
+        correct = str([str(obj) for obj in storage.all().values()])
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("all"))
+            self.assertEqual(correct + "\n", output.getvalue())
+
+    def test_print_list_empty(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().print_list(iter([]))
+            self.assertEqual("[]\n", output.getvalue())
+
+    def test_print_list_quotes(self):
+        items = ["it's", 'say "hi"', "tab\t"]
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().print_list(iter(items))
+            self.assertEqual(str(items) + "\n", output.getvalue())
+
 
 class TestHBNBCommand_update(unittest.TestCase):
     """Unittests for testing update from the HBNB command interpreter."""
@@ -1566,5 +1665,539 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_transaction(unittest.TestCase):
+    """Unittests for testing begin/commit/rollback of the HBNB console."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        FileStorage._FileStorage__undo = None
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_commit(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("begin"))
+            self.assertFalse(HBNBCommand().onecmd("create State"))
+            testID = output.getvalue().strip()
+            self.assertFalse(os.path.isfile("file.json"))
+            self.assertFalse(HBNBCommand().onecmd("commit"))
+        with open("file.json", "r") as f:
+            self.assertIn("State." + testID, f.read())
+
+    def test_rollback(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create State"))
+            testID = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("begin"))
+            command = 'update State {} name "Texas"'.format(testID)
+            self.assertFalse(HBNBCommand().onecmd(command))
+            command = "destroy State {}".format(testID)
+            self.assertFalse(HBNBCommand().onecmd(command))
+            self.assertFalse(HBNBCommand().onecmd("rollback"))
+            self.assertEqual("", output.getvalue())
+        obj = storage.all()["State.{}".format(testID)]
+        self.assertNotIn("name", obj.__dict__)
+
+    def test_begin_twice(self):
+        correct = "** transaction already in progress **"
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("begin"))
+            self.assertFalse(HBNBCommand().onecmd("begin"))
+            self.assertEqual(correct, output.getvalue().strip())
+            self.assertFalse(HBNBCommand().onecmd("rollback"))
+
+    def test_no_transaction(self):
+        correct = "** no transaction in progress **"
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("commit"))
+            self.assertEqual(correct, output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("rollback"))
+            self.assertEqual(correct, output.getvalue().strip())
+
+
+class TestHBNBCommand_near(unittest.TestCase):
+    """Unittests for testing near/within of the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.ids = []
+        for lat, lon in ((48.8566, 2.3522), (48.8606, 2.3376),
+                         (51.5072, -0.1276)):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create Place")
+                uid = output.getvalue().strip()
+            HBNBCommand().onecmd("update Place {} latitude {}".format(
+                uid, lat))
+            HBNBCommand().onecmd("update Place {} longitude {}".format(
+                uid, lon))
+            self.ids.append(uid)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_near(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 48.8606 2.34 5"))
+            found = output.getvalue()
+        self.assertIn(self.ids[0], found)
+        self.assertIn(self.ids[1], found)
+        self.assertNotIn(self.ids[2], found)
+        self.assertLess(found.index(self.ids[1]), found.index(self.ids[0]))
+
+    def test_near_follows_update(self):
+        command = "update Place {} latitude 51.5".format(self.ids[0])
+        HBNBCommand().onecmd(command)
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 48.8606 2.34 5"))
+            self.assertNotIn(self.ids[0], output.getvalue())
+
+    def test_near_nothing(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near -33.86 151.2 100"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_near_missing_radius(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 48.8606 2.34"))
+            self.assertEqual("** radius missing **",
+                             output.getvalue().strip())
+
+    def test_near_not_a_number(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near north 2.34 5"))
+            self.assertEqual("** latitude must be a number **",
+                             output.getvalue().strip())
+
+    def test_not_finite(self):
+        for line, name in (("near nan 0 5", "latitude"),
+                           ("near 0 0 inf", "radius"),
+                           ("within 0 0 nan 1", "north"),
+                           ("within -1e400 0 1 1", "south")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual("** {} must be a number **".format(name),
+                                 output.getvalue().strip())
+
+    def test_within(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("within 50 -1 52 1"))
+            found = output.getvalue()
+        self.assertNotIn(self.ids[0], found)
+        self.assertIn(self.ids[2], found)
+
+    def test_within_missing_east(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("within 50 -1 52"))
+            self.assertEqual("** east missing **", output.getvalue().strip())
+
+
+class TestHBNBCommand_where(unittest.TestCase):
+    """Unittests for testing where/explain of the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.ids = []
+        for city_id, price, guests in (("a", 50, 2), ("a", 80, 4),
+                                       ("b", 150, 6), ("b", 90, 4)):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create Place")
+                uid = output.getvalue().strip()
+            HBNBCommand().onecmd('update Place {} city_id "{}"'.format(
+                uid, city_id))
+            HBNBCommand().onecmd("update Place {} price_by_night {}".format(
+                uid, price))
+            HBNBCommand().onecmd("update Place {} max_guest {}".format(
+                uid, guests))
+            self.ids.append(uid)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def where(self, command):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+            return output.getvalue()
+
+    def test_where(self):
+        found = self.where("Place.where(price_by_night<100, max_guest>=4)")
+        self.assertEqual([False, True, False, True],
+                         [uid in found for uid in self.ids])
+
+    def test_where_string(self):
+        found = self.where('Place.where(city_id="b")')
+        self.assertEqual([False, False, True, True],
+                         [uid in found for uid in self.ids])
+        self.assertEqual(found, self.where('where Place city_id=="b"'))
+
+    def test_where_order_limit(self):
+        found = self.where("Place.where(order=-price_by_night, limit=2)")
+        self.assertNotIn(self.ids[0], found)
+        self.assertNotIn(self.ids[1], found)
+        self.assertLess(found.index(self.ids[2]), found.index(self.ids[3]))
+
+    def test_where_nothing(self):
+        self.assertEqual("[]", self.where(
+            "Place.where(price_by_night>1000)").strip())
+
+    def test_where_missing_class(self):
+        self.assertEqual("** class name missing **",
+                         self.where(".where(max_guest>1)").strip())
+
+    def test_where_invalid_class(self):
+        self.assertEqual("** class doesn't exist **",
+                         self.where("MyModel.where(max_guest>1)").strip())
+
+    def test_where_invalid_condition(self):
+        self.assertEqual("** invalid condition: max_guest **",
+                         self.where("Place.where(max_guest)").strip())
+
+    def test_where_not_a_number(self):
+        self.assertEqual("** max_guest must be a number **",
+                         self.where("Place.where(max_guest>many)").strip())
+
+    def test_where_fractional_number(self):
+        found = self.where("Place.where(max_guest>=4.5)")
+        self.assertEqual([False, False, True, False],
+                         [uid in found for uid in self.ids])
+        self.assertEqual("[]", self.where(
+            "Place.where(max_guest==4.9)").strip())
+        found = self.where("Place.where(max_guest==4.0)")
+        self.assertEqual([False, True, False, True],
+                         [uid in found for uid in self.ids])
+        self.assertIn("(max_guest >= 4.5)", self.where(
+            "explain Place.where(max_guest>=4.5)"))
+
+    def test_where_invalid_limit(self):
+        self.assertEqual("** limit must be a positive integer **",
+                         self.where("Place.where(limit=ten)").strip())
+
+    def test_explain_hash_index(self):
+        self.assertEqual("hash index on Place.city_id: 2 of 4 objects\n"
+                         "filter (max_guest > 4): 1 of 2 objects",
+                         self.where('explain Place.where(city_id="b", '
+                                    'max_guest>4)').strip())
+
+    def test_explain_scan(self):
+        self.assertEqual("scan of Place: 4 objects\n"
+                         "filter (name == 'Loft'): 0 of 4 objects\n"
+                         "limit 1: 0 objects",
+                         self.where('explain Place.where(name="Loft", '
+                                    'limit=1)').strip())
+
+
+def models_in_file():
+    """Returns the records stored in file.json"""
+    with open("file.json", "r") as f:
+        return json.load(f)
+
+
+class TestHBNBCommand_batch(unittest.TestCase):
+    """Unittests for testing the batch mode of the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__undo = None
+        for path in ("file.json", "test_batch.hbnb"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_batch(self, script):
+        with open("test_batch.hbnb", "w") as f:
+            f.write(script)
+        with patch("sys.stdout", new=StringIO()) as output, \
+                patch("sys.stderr", new=StringIO()) as errors, \
+                patch("models.engine.file_storage.write_file",
+                      wraps=write_file) as writes:
+            status = HBNBCommand().run_batch("test_batch.hbnb")
+        return status, output.getvalue(), errors.getvalue(), writes.call_count
+
+    def test_batch(self):
+        status, output, errors, writes = self.run_batch(
+            "# two places\n"
+            'create Place name="Loft" max_guest=4\n'
+            "\n"
+            "create Place max_guest=2\n"
+            "Place.where(max_guest>3)\n"
+            "count Place\n")
+        self.assertEqual(0, status)
+        self.assertEqual(1, writes)
+        self.assertEqual(2, len(models_in_file()))
+        lines = output.splitlines()
+        self.assertIn(lines[0], lines[2])
+        self.assertEqual("2", lines[3])
+        self.assertEqual(["command", "create", "where", "count", "save"],
+                         [line.split()[0] for line in errors.splitlines()])
+        self.assertEqual("2", errors.splitlines()[1].split()[1])
+
+    def test_batch_parsed_first(self):
+        status, output, errors, writes = self.run_batch(
+            "create Place\ncrate Place\n")
+        self.assertEqual(1, status)
+        self.assertEqual("", output)
+        self.assertEqual("** line 2: unknown command: crate **",
+                         errors.strip())
+        self.assertEqual(0, writes)
+        self.assertEqual({}, storage.all())
+
+    def test_batch_transaction_command(self):
+        status, _, errors, _ = self.run_batch("begin\ncreate User\n")
+        self.assertEqual(1, status)
+        self.assertEqual("** line 1: begin can't be used in a batch **",
+                         errors.strip())
+
+    def test_batch_quit(self):
+        status, output, _, _ = self.run_batch(
+            "create User\nquit\ncreate User\n")
+        self.assertEqual(0, status)
+        self.assertEqual(1, len(output.splitlines()))
+        self.assertEqual(1, len(models_in_file()))
+
+    def test_batch_missing_file(self):
+        with patch("sys.stderr", new=StringIO()) as errors:
+            self.assertEqual(1, HBNBCommand().run_batch("nowhere.hbnb"))
+            self.assertIn("nowhere.hbnb", errors.getvalue())
+
+    def test_batch_error_rolls_back(self):
+        with open("test_batch.hbnb", "w") as f:
+            f.write("create User\ncreate User\n")
+        with patch("sys.stdout", new=StringIO()), \
+                patch.object(HBNBCommand, "do_create",
+                             side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                HBNBCommand().run_batch("test_batch.hbnb")
+        self.assertFalse(storage.in_transaction())
+        self.assertFalse(os.path.isfile("file.json"))
+
+
+class TestHBNBCommand_bulk(unittest.TestCase):
+    """Unittests for testing import/export of the HBNB command interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for path in ("file.json", "test_bulk.csv"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_command(self, command):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+            return output.getvalue().strip()
+
+    def test_export_import(self):
+        uid = self.run_command('create Place name="Loft" max_guest=4')
+        self.run_command("create User")
+        self.assertEqual("1", self.run_command("export test_bulk.csv Place"))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual("1", self.run_command("import test_bulk.csv"))
+        self.assertEqual(4, storage.get("Place", uid).max_guest)
+        self.assertEqual("1", self.run_command("count Place"))
+        self.assertEqual("0", self.run_command("count User"))
+
+    def test_import_class(self):
+        with open("test_bulk.csv", "w") as f:
+            f.write("name\nLoft\n")
+        self.assertEqual("1", self.run_command("import test_bulk.csv Place"))
+        self.assertIn("Loft", self.run_command("all Place"))
+
+    def test_missing_file_name(self):
+        self.assertEqual("** file name missing **",
+                         self.run_command("import"))
+        self.assertEqual("** file name missing **",
+                         self.run_command("export"))
+
+    def test_invalid_class(self):
+        self.assertEqual("** class doesn't exist **",
+                         self.run_command("export test_bulk.csv MyModel"))
+
+    def test_invalid_file(self):
+        self.assertEqual("** unknown format: use a .jsonl or .csv file **",
+                         self.run_command("export test_bulk.txt"))
+        self.assertEqual(
+            "** [Errno 2] No such file or directory: 'test_bulk.csv' **",
+            self.run_command("import test_bulk.csv"))
+
+    def test_invalid_record(self):
+        with open("test_bulk.csv", "w") as f:
+            f.write("__class__,max_guest\nPlace,many\n")
+        self.assertEqual("** row 2: invalid literal for int() with base 10:"
+                         " 'many' **", self.run_command(
+                             "import test_bulk.csv"))
+        self.assertEqual("0", self.run_command("count Place"))
+
+
+class TestHBNBCommand_parse(unittest.TestCase):
+    """Unittests for testing the command parser of the HBNB interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_command(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(line))
+        return output.getvalue().strip()
+
+    def test_parse_spaced(self):
+        command = parse_command('update Place 1 name "My house"')
+        self.assertEqual("update", command.name)
+        self.assertEqual("Place", command.classname)
+        self.assertEqual(("1", "name", '"My house"'), command.args)
+
+    def test_parse_dotted(self):
+        command = parse_command(
+            "Place.update(\"1\", {'name': 'Loft', 'max_guest': 2})")
+        self.assertEqual("update", command.name)
+        self.assertEqual("Place", command.classname)
+        self.assertEqual(('"1"', "{'name': 'Loft', 'max_guest': 2}"),
+                         command.args)
+
+    def test_parse_nested_brackets(self):
+        command = parse_command(
+            'Place.update("1", {"meta": {"a": [1]}, "name": "a}b"}, x)')
+        self.assertEqual(('"1"', '{"meta": {"a": [1]}, "name": "a}b"}', "x"),
+                         command.args)
+        command = parse_command('update Place 1 amenity_ids ["a]", ["b"]]')
+        self.assertEqual(("1", "amenity_ids", '["a]", ["b"]]'),
+                         command.args)
+
+    def test_parse_dotted_line(self):
+        self.assertEqual("Review limit=2",
+                         parse_command("Review.all(limit=2)").line)
+        self.assertEqual("Place.where(max_guest>3)",
+                         parse_command("Place.where(max_guest>3)").line)
+
+    def test_parse_not_a_command(self):
+        self.assertIsNone(parse_command("Place.create()"))
+        self.assertIsNone(parse_command("?"))
+
+    def test_unknown_syntax(self):
+        self.assertEqual("*** Unknown syntax: Place.fly()",
+                         self.run_command("Place.fly()"))
+
+    def test_update_quoted_comma(self):
+        uid = self.run_command("create Place")
+        self.run_command(
+            'Place.update("{}", "name", "Loft, Paris")'.format(uid))
+        self.assertEqual("Loft, Paris", storage.get("Place", uid).name)
+
+    def test_update_not_a_number(self):
+        uid = self.run_command("create Place")
+        self.assertEqual("** max_guest must be a number **", self.run_command(
+            "Place.update({}, max_guest, many)".format(uid)))
+
+    def test_update_not_an_integer(self):
+        uid = self.run_command("create Place")
+        for command in ("update Place {} max_guest 4.7",
+                        'update Place {} max_guest "4.7"',
+                        "Place.update({}, {{'max_guest': 9.9}})"):
+            self.assertEqual("** max_guest must be a number **",
+                             self.run_command(command.format(uid)))
+        self.assertEqual(0, storage.get("Place", uid).max_guest)
+        self.run_command("update Place {} max_guest 4.0".format(uid))
+        self.assertEqual(4, storage.get("Place", uid).max_guest)
+
+    def test_update_list(self):
+        uid = self.run_command("create Place")
+        self.run_command('Place.update({}, amenity_ids, ["a", "b"])'.format(
+            uid))
+        self.assertEqual(["a", "b"], storage.get("Place", uid).amenity_ids)
+        self.run_command('update Place {} amenity_ids ["c"]'.format(uid))
+        self.assertEqual(["c"], storage.get("Place", uid).amenity_ids)
+        self.assertEqual("** amenity_ids must be a list **", self.run_command(
+            "update Place {} amenity_ids c".format(uid)))
+
+    def test_update_dict_nested(self):
+        uid = self.run_command("create Place")
+        self.run_command(
+            'Place.update("{}", {{"meta": {{"a": 1}}}})'.format(uid))
+        self.assertEqual({"a": 1}, storage.get("Place", uid).meta)
+        self.run_command('update Place {} {{"name": "a}}b"}}'.format(uid))
+        self.assertEqual("a}b", storage.get("Place", uid).name)
+
+    def test_update_dict_invalid(self):
+        uid = self.run_command("create Place")
+        self.assertEqual("** max_guest must be a number **", self.run_command(
+            "Place.update({}, {{'name': 'Loft', 'max_guest': 'many'}})".format(
+                uid)))
+        self.assertEqual("", storage.get("Place", uid).name)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,13 +5,15 @@ Unittest classes:
     TestBaseModel_instantiation
     TestBaseModel_save
     TestBaseModel_to_dict
+    TestBaseModel_registry
 """
 import os
 import models
 import unittest
 from datetime import datetime
 from time import sleep
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, classes, schemas
+from models.place import Place
 
 
 class TestBaseModel_instantiation(unittest.TestCase):
@@ -188,5 +190,38 @@ class TestBaseModel_to_dict(unittest.TestCase):
             bm.to_dict(None)
 
 
+class TestBaseModel_registry(unittest.TestCase):
+    """Unittests for testing the registry of the model classes."""
+
+    def tearDown(self):
+        classes.pop("Cabin", None)
+        attributes.pop("Cabin", None)
+        schemas.pop("Cabin", None)
+
+    def test_models_registered(self):
+        self.assertIs(Place, classes["Place"])
+        self.assertEqual(int, attributes["Place"]["max_guest"])
+        self.assertEqual(list, attributes["Place"]["amenity_ids"])
+        self.assertEqual(datetime, attributes["BaseModel"]["created_at"])
+
+    def test_subclass_registered(self):
+        class Cabin(Place):
+            stoves = 1
+            _secret = ""
+
+        self.assertIs(Cabin, classes["Cabin"])
+        self.assertIn("Cabin", models.storage.classes())
+        cabin = models.storage.attributes()["Cabin"]
+        self.assertEqual(int, cabin["stoves"])
+        self.assertEqual(float, cabin["latitude"])
+        self.assertNotIn("_secret", cabin)
+        self.assertNotIn("save", cabin)
+
+    def test_registry_shared(self):
+        self.assertIs(models.storage.classes(), models.storage.classes())
+        self.assertIs(models.storage.attributes(),
+                      models.storage.attributes())
+
+
 if __name__ == "__main__":
     unittest.main()
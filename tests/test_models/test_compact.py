@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py.
+
+Unittest classes:
+    TestCompact_instantiation
+    TestCompact_output
+    TestCompact_storage
+"""
+import os
+import unittest
+import models
+from models.compact import CompactModel, compact_class
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+class TestCompact_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the compact classes."""
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_class_name(self):
+        self.assertEqual("Place", compact_class(Place).__name__)
+        self.assertTrue(issubclass(compact_class(Place), CompactModel))
+
+    def test_class_is_cached(self):
+        self.assertIs(compact_class(Review), compact_class(Review))
+
+    def test_no_instance_dict(self):
+        pl = compact_class(Place)()
+        self.assertFalse(hasattr(pl, "__dict__"))
+
+    def test_declared_attributes_in_slots(self):
+        self.assertIn("price_by_night", compact_class(Place).__slots__)
+        self.assertIn("id", compact_class(Place).__slots__)
+
+    def test_class_defaults(self):
+        pl = compact_class(Place)()
+        self.assertEqual(0, pl.number_rooms)
+        self.assertEqual([], pl.amenity_ids)
+        self.assertEqual("", pl.name)
+
+    def test_overflow_attribute(self):
+        us = compact_class(User)()
+        us.nickname = "Betty"
+        self.assertEqual("Betty", us.nickname)
+        del us.nickname
+        with self.assertRaises(AttributeError):
+            us.nickname
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            compact_class(User)().nickname
+
+    def test_stored_in_objects(self):
+        rv = compact_class(Review)()
+        self.assertIs(rv, models.storage.all()["Review." + rv.id])
+
+    def test_instantiation_with_kwargs(self):
+        dt = "2017-09-28T21:03:54.052298"
+        rv = compact_class(Review)(id="345", created_at=dt, updated_at=dt,
+                                   text="Great", __class__="Review")
+        self.assertEqual("345", rv.id)
+        self.assertEqual(2017, rv.created_at.year)
+        self.assertEqual("Great", rv.text)
+        self.assertNotIn("Review.345", models.storage.all())
+
+
+class TestCompact_output(unittest.TestCase):
+    """Unittests for testing to_dict and __str__ of the compact classes."""
+
+    record = {"id": "345",
+              "created_at": "2017-09-28T21:03:54.052298",
+              "updated_at": "2017-09-28T21:05:54.119427",
+              "city_id": "0001",
+              "name": "Loft",
+              "max_guest": 4,
+              "nickname": "Betty",
+              "__class__": "Place"}
+
+    def test_to_dict_matches(self):
+        pl = Place(**self.record)
+        cpl = compact_class(Place)(**self.record)
+        self.assertEqual(pl.to_dict(), cpl.to_dict())
+        self.assertEqual(list(pl.to_dict()), list(cpl.to_dict()))
+
+    def test_str_matches(self):
+        pl = Place(**self.record)
+        cpl = compact_class(Place)(**self.record)
+        self.assertEqual(str(pl), str(cpl))
+
+    def test_new_object_str_matches(self):
+        pl = compact_class(Place)()
+        state = {"id": pl.id, "created_at": pl.created_at,
+                 "updated_at": pl.updated_at}
+        self.assertEqual("[Place] ({}) {}".format(pl.id, state), str(pl))
+
+    def test_to_dict_new_object(self):
+        pl = compact_class(Place)()
+        pl.name = "Loft"
+        d = pl.to_dict()
+        self.assertEqual(["id", "created_at", "updated_at", "name",
+                          "__class__"], list(d))
+        self.assertEqual(pl.created_at.isoformat(), d["created_at"])
+
+    def test_assignment_order_matches(self):
+        pl = Place(**self.record)
+        cpl = compact_class(Place)(**self.record)
+        for obj in (pl, cpl):
+            obj.nickname = "Bob"
+            obj.user_id = "0002"
+            del obj.city_id
+            obj.city_id = "0003"
+        self.assertEqual(list(pl.to_dict()), list(cpl.to_dict()))
+        self.assertEqual(str(pl), str(cpl))
+
+    def test_new_object_order_matches(self):
+        cpl = compact_class(Place)()
+        cpl.name = "Loft"
+        cpl.city_id = "0001"
+        self.assertEqual(["id", "created_at", "updated_at", "name",
+                          "city_id"], list(cpl._state()))
+
+
+class TestCompact_storage(unittest.TestCase):
+    """Unittests for testing the compact classes through FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__compact = True
+
+    def tearDown(self):
+        FileStorage._FileStorage__compact = False
+        FileStorage._FileStorage__undo = None
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_classes_are_compact(self):
+        for name, cls in models.storage.classes().items():
+            self.assertTrue(issubclass(cls, CompactModel))
+            self.assertEqual(name, cls.__name__)
+
+    def test_reload_builds_compact_objects(self):
+        pl = Place()
+        pl.max_guest = 4
+        pl.save()
+        models.storage.reload()
+        reloaded = models.storage.all()["Place." + pl.id]
+        self.assertIsInstance(reloaded, CompactModel)
+        self.assertEqual(pl.to_dict(), reloaded.to_dict())
+
+    def test_change_is_saved(self):
+        pl = compact_class(Place)()
+        models.storage.save()
+        pl.price_by_night = 80
+        self.assertEqual({"Place." + pl.id}, models.storage.dirty())
+        models.storage.save()
+        models.storage.reload()
+        self.assertEqual(80, models.storage.get("Place", pl.id).price_by_night)
+
+    def test_find_uses_slots(self):
+        pl = compact_class(Place)()
+        pl.city_id = "0001"
+        self.assertEqual({"Place." + pl.id: pl},
+                         models.storage.find("Place", city_id="0001"))
+
+    def test_rollback_restores_slots(self):
+        pl = compact_class(Place)()
+        pl.name = "Loft"
+        models.storage.begin()
+        pl.name = "Cabin"
+        pl.max_guest = 6
+        pl.nickname = "Betty"
+        models.storage.rollback()
+        self.assertEqual("Loft", pl.name)
+        self.assertEqual(0, pl.max_guest)
+        self.assertFalse(hasattr(pl, "nickname"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/bulk.py.
+
+Unittest classes:
+    TestBulk_read
+    TestBulk_write
+"""
+import io
+import json
+import unittest
+from datetime import datetime
+from models.engine.bulk import decode_chunk, detect_format, read_chunks
+from models.engine.bulk import write_csv, write_jsonl
+from models.place import Place
+from models.schema import compile_schema
+
+DT = "2017-09-28T21:03:54.052298"
+SCHEMAS = {"Place": compile_schema({
+    "id": str, "created_at": datetime, "updated_at": datetime, "name": str,
+    "max_guest": int, "latitude": float, "amenity_ids": list})}
+
+
+class TestBulk_read(unittest.TestCase):
+    """Unittests for testing how imported records are read and decoded."""
+
+    def test_detect_format(self):
+        self.assertEqual("jsonl", detect_format("a/b.JSONL"))
+        self.assertEqual("jsonl", detect_format("b.ndjson"))
+        self.assertEqual("csv", detect_format("b.csv"))
+        self.assertEqual("csv", detect_format("b.txt", "csv"))
+        with self.assertRaises(ValueError):
+            detect_format("b.json")
+        with self.assertRaises(ValueError):
+            detect_format("b.csv", "xml")
+
+    def test_read_chunks(self):
+        f = io.StringIO("".join('{"n": %d}\n' % i for i in range(25000)))
+        chunks = list(read_chunks(f, "jsonl"))
+        self.assertEqual([1, 10001, 20001], [first for first, _ in chunks])
+        self.assertEqual([10000, 10000, 5000],
+                         [len(records) for _, records in chunks])
+
+    def test_read_chunks_csv(self):
+        f = io.StringIO('id,name\n1,"a\nb"\n2,c\n')
+        self.assertEqual([(2, [{"id": "1", "name": "a\nb"},
+                               {"id": "2", "name": "c"}])],
+                         list(read_chunks(f, "csv")))
+
+    def test_decode_jsonl(self):
+        line = json.dumps({"__class__": "Place", "id": "1", "created_at": DT,
+                           "max_guest": "4", "latitude": 2,
+                           "amenity_ids": ["a"], "rating": 4.5})
+        [(name, record)] = decode_chunk((1, [line, "\n"]), "jsonl", SCHEMAS)
+        self.assertEqual("Place", name)
+        self.assertEqual({"id": "1", "created_at": datetime.fromisoformat(DT),
+                          "updated_at": datetime.fromisoformat(DT),
+                          "max_guest": 4, "latitude": 2.0,
+                          "amenity_ids": ["a"], "rating": 4.5}, record)
+
+    def test_decode_csv(self):
+        row = {"name": "Loft", "max_guest": "4", "latitude": "1.5",
+               "amenity_ids": '["a", "b"]', "rating": "4.5", "note": "x",
+               "city_id": ""}
+        [(name, record)] = decode_chunk((2, [row]), "csv", SCHEMAS, "Place")
+        self.assertEqual("Place", name)
+        self.assertEqual(36, len(record.pop("id")))
+        self.assertIsInstance(record.pop("created_at"), datetime)
+        self.assertIsInstance(record.pop("updated_at"), datetime)
+        self.assertEqual({"name": "Loft", "max_guest": 4, "latitude": 1.5,
+                          "amenity_ids": ["a", "b"], "rating": 4.5,
+                          "note": "x"}, record)
+
+    def test_decode_invalid(self):
+        lines = ['{"__class__": "Place", "max_guest": 1}',
+                 '{"__class__": "Place", "max_guest": "many"}']
+        with self.assertRaisesRegex(ValueError, "^line 8: "):
+            decode_chunk((7, lines), "jsonl", SCHEMAS)
+        for line in ('{"max_guest": 1}', "[1]", "{"):
+            with self.assertRaisesRegex(ValueError, "^line 1: "):
+                decode_chunk((1, [line]), "jsonl", SCHEMAS)
+        with self.assertRaisesRegex(ValueError, "^row 2: "):
+            decode_chunk((2, [{"amenity_ids": "a"}]), "csv", SCHEMAS, "Place")
+
+
+class TestBulk_write(unittest.TestCase):
+    """Unittests for testing how exported objects are written."""
+
+    def setUp(self):
+        self.pl = Place(id="1", created_at=DT, updated_at=DT, name="a, \"b\"",
+                        amenity_ids=["x"])
+
+    def test_write_jsonl(self):
+        f = io.StringIO()
+        write_jsonl(f, [self.pl, self.pl])
+        self.assertEqual(2 * [self.pl.to_dict()],
+                         [json.loads(line) for line in f.getvalue().split(
+                             "\n")[:-1]])
+
+    def test_write_csv(self):
+        f = io.StringIO(newline="")
+        write_csv(f, [self.pl], ["id", "name", "amenity_ids", "rating"])
+        self.assertEqual('id,name,amenity_ids,rating\r\n'
+                         '1,"a, ""b""","[""x""]",\r\n', f.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
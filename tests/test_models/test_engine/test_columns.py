@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/columns.py.
+
+Unittest classes:
+    TestColumnStore_sync
+    TestColumnStore_queries
+    TestColumns_scan
+"""
+import unittest
+from models.engine.columns import ColumnStore, aggregate_objects, matches
+from models.engine.columns import numpy
+from models.place import Place
+
+TYPES = {"city_id": str, "max_guest": int, "price_by_night": int}
+
+
+def place(id, city_id, max_guest, price_by_night):
+    """Returns a Place built without being stored"""
+    return Place(id=id, created_at="2017-09-28T21:03:54.052298",
+                 updated_at="2017-09-28T21:03:54.052298", city_id=city_id,
+                 max_guest=max_guest, price_by_night=price_by_night)
+
+
+PLACES = {"Place.1": place("1", "a", 2, 50),
+          "Place.2": place("2", "a", 4, 80),
+          "Place.3": place("3", "b", 6, 150),
+          "Place.4": place("4", "b", 4, 90)}
+
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class TestColumnStore_sync(unittest.TestCase):
+    """Unittests for testing how ColumnStore follows its objects."""
+
+    def test_add(self):
+        store = ColumnStore(TYPES)
+        for k, v in PLACES.items():
+            store.add(k, v)
+        self.assertEqual(4, len(store))
+        self.assertEqual([2, 4, 6, 4], store.column("max_guest").tolist())
+        self.assertEqual(["a", "b"], store.values("city_id"))
+
+    def test_load(self):
+        store = ColumnStore(TYPES, PLACES)
+        self.assertEqual(4, len(store))
+        self.assertEqual([50, 80, 150, 90],
+                         store.column("price_by_night").tolist())
+        self.assertEqual([0, 0, 1, 1], store.column("city_id").tolist())
+
+    def test_grow(self):
+        store = ColumnStore(TYPES)
+        for i in range(100):
+            store.add(str(i), place(str(i), "a", i, i))
+        self.assertEqual(list(range(100)),
+                         store.column("max_guest").tolist())
+
+    def test_update(self):
+        store = ColumnStore(TYPES, PLACES)
+        pl = place("2", "b", 4, 10)
+        store.add("Place.2", pl)
+        self.assertEqual(4, len(store))
+        self.assertEqual(10, store.column("price_by_night")[1])
+        self.assertIs(pl, store.select(("price_by_night", "==", 10))[
+            "Place.2"])
+
+    def test_remove(self):
+        store = ColumnStore(TYPES, PLACES)
+        store.remove("Place.1")
+        store.remove("Place.1")
+        self.assertEqual(3, len(store))
+        self.assertEqual({"Place.2", "Place.3", "Place.4"},
+                         set(store.select()))
+        self.assertEqual(4, store.aggregate("max", "max_guest", by=None,
+                                            where=(("city_id", "==", "a"),)))
+
+    def test_not_a_number(self):
+        store = ColumnStore(TYPES)
+        store.add("Place.1", place("1", None, "many", 50))
+        self.assertTrue(numpy.isnan(store.column("max_guest")[0]))
+        self.assertEqual(-1, store.column("city_id")[0])
+
+    def test_column_is_read_only(self):
+        store = ColumnStore(TYPES, PLACES)
+        with self.assertRaises(ValueError):
+            store.column("max_guest")[0] = 3
+
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class TestColumnStore_queries(unittest.TestCase):
+    """Unittests for testing the filters and aggregates of ColumnStore."""
+
+    def setUp(self):
+        self.store = ColumnStore(TYPES, PLACES)
+
+    def test_select(self):
+        found = self.store.select(("price_by_night", "<", 100),
+                                  ("max_guest", ">=", 4))
+        self.assertEqual({"Place.2": PLACES["Place.2"],
+                          "Place.4": PLACES["Place.4"]}, found)
+
+    def test_select_string(self):
+        self.assertEqual({"Place.3", "Place.4"},
+                         set(self.store.select(("city_id", "==", "b"))))
+        self.assertEqual({}, self.store.select(("city_id", "==", "c")))
+        self.assertEqual(4, len(self.store.select(("city_id", "!=", "c"))))
+
+    def test_select_string_order(self):
+        with self.assertRaises(ValueError):
+            self.store.select(("city_id", "<", "b"))
+
+    def test_aggregate(self):
+        self.assertEqual(4, self.store.aggregate("count", "max_guest"))
+        self.assertEqual(370, self.store.aggregate("sum", "price_by_night"))
+        self.assertEqual(92.5, self.store.aggregate("mean", "price_by_night"))
+        self.assertEqual(2, self.store.aggregate("min", "max_guest"))
+        self.assertEqual(6, self.store.aggregate("max", "max_guest"))
+
+    def test_aggregate_empty(self):
+        where = (("max_guest", ">", 10),)
+        self.assertEqual(0, self.store.aggregate("count", "max_guest",
+                                                 where=where))
+        self.assertIsNone(self.store.aggregate("mean", "max_guest",
+                                               where=where))
+
+    def test_aggregate_by(self):
+        self.assertEqual({"a": 65.0, "b": 120.0}, self.store.aggregate(
+            "mean", "price_by_night", by="city_id"))
+        self.assertEqual({"a": 2, "b": 2}, self.store.aggregate(
+            "count", "price_by_night", by="city_id"))
+        self.assertEqual({"a": 50.0, "b": 90.0}, self.store.aggregate(
+            "min", "price_by_night", by="city_id"))
+
+    def test_aggregate_by_where(self):
+        self.assertEqual({"b": 150.0}, self.store.aggregate(
+            "max", "price_by_night", by="city_id",
+            where=(("max_guest", ">", 4),)))
+
+    def test_aggregate_unknown(self):
+        with self.assertRaises(ValueError):
+            self.store.aggregate("median", "max_guest")
+
+    def test_same_as_scan(self):
+        for function in ("count", "sum", "mean", "min", "max"):
+            self.assertEqual(
+                aggregate_objects(PLACES.values(), function,
+                                  "price_by_night", by="city_id"),
+                self.store.aggregate(function, "price_by_night",
+                                     by="city_id"))
+
+
+class TestColumns_scan(unittest.TestCase):
+    """Unittests for testing the functions used without a ColumnStore."""
+
+    def test_matches(self):
+        pl = PLACES["Place.2"]
+        self.assertTrue(matches(pl, (("max_guest", ">=", 4),
+                                     ("city_id", "==", "a"))))
+        self.assertFalse(matches(pl, (("max_guest", ">", 4),)))
+
+    def test_matches_missing(self):
+        self.assertFalse(matches(PLACES["Place.2"], (("rating", ">", 4),)))
+
+    def test_matches_not_comparable(self):
+        self.assertFalse(matches(PLACES["Place.2"], (("city_id", "<", 4),)))
+
+    def test_aggregate_objects(self):
+        self.assertEqual(370, aggregate_objects(
+            PLACES.values(), "sum", "price_by_night"))
+        self.assertEqual({"a": 4, "b": 6}, aggregate_objects(
+            PLACES.values(), "max", "max_guest", by="city_id"))
+
+    def test_aggregate_objects_empty(self):
+        self.assertEqual(0, aggregate_objects([], "count", "max_guest"))
+        self.assertIsNone(aggregate_objects([], "mean", "max_guest"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorage_instantiation
+    TestDBStorage_methods
+"""
+import os
+import sqlite3
+import unittest
+from models.base_model import BaseModel, attributes, classes, schemas
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+class TestDBStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def test_DBStorage_instantiation_no_args(self):
+        self.assertEqual(type(DBStorage()), DBStorage)
+
+    def test_DBStorage_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            DBStorage(None)
+
+    def test_DBStorage_db_path_is_private_str(self):
+        self.assertEqual(str, type(DBStorage._DBStorage__db_path))
+
+
+class TestDBStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        self.db_path = DBStorage._DBStorage__db_path
+        DBStorage._DBStorage__db_path = "test_hbnb.db"
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__dirty = {}
+        self.storage = DBStorage()
+
+    def tearDown(self):
+        connection = DBStorage._DBStorage__connections.pop(
+            "test_hbnb.db", None)
+        if connection is not None:
+            connection.close()
+        try:
+            os.remove("test_hbnb.db")
+        except IOError:
+            pass
+        DBStorage._DBStorage__db_path = self.db_path
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_without_database(self):
+        BaseModel()
+        self.storage.reload()
+        self.assertEqual(1, len(self.storage.all()))
+
+    def test_save_reload(self):
+        bm = BaseModel()
+        us = User()
+        us.email = "a@b.c"
+        pl = Place()
+        pl.number_rooms = 3
+        pl.latitude = 1.5
+        pl.amenity_ids = ["x", "y"]
+        pl.my_number = 98
+        self.storage.save()
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual(3, len(objs))
+        self.assertEqual(bm.created_at,
+                         objs["BaseModel." + bm.id].created_at)
+        self.assertEqual("a@b.c", objs["User." + us.id].email)
+        place = objs["Place." + pl.id]
+        self.assertEqual(pl.to_dict(), place.to_dict())
+        self.assertEqual(["x", "y"], place.amenity_ids)
+        self.assertEqual(98, place.my_number)
+        self.assertNotIn("name", place.__dict__)
+
+    def test_typed_columns(self):
+        pl = Place()
+        pl.number_rooms = 3
+        pl.latitude = 1.5
+        self.storage.save()
+        connection = sqlite3.connect("test_hbnb.db")
+        row = connection.execute(
+            "SELECT typeof(number_rooms), typeof(latitude) FROM Place "
+            "WHERE id = ?", (pl.id,)).fetchone()
+        connection.close()
+        self.assertEqual(("integer", "real"), row)
+
+    def test_foreign_key_indexes(self):
+        self.storage.save()
+        connection = sqlite3.connect("test_hbnb.db")
+        indexes = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'Review'")]
+        connection.close()
+        self.assertIn("Review_place_id", indexes)
+        self.assertIn("Review_user_id", indexes)
+
+    def test_save_writes_changes_only(self):
+        us = User()
+        self.storage.save()
+        us.first_name = "Betty"
+        rv = Review()
+        self.assertEqual({"User." + us.id, "Review." + rv.id},
+                         self.storage.dirty())
+        self.storage.save()
+        self.assertEqual(set(), self.storage.dirty())
+        self.storage.reload()
+        self.assertEqual("Betty",
+                         self.storage.all()["User." + us.id].first_name)
+        self.assertIn("Review." + rv.id, self.storage.all())
+
+    def test_delete(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.storage.save()
+        self.storage.reload()
+        self.assertNotIn("User." + us.id, self.storage.all())
+
+    def test_count_and_find(self):
+        pl = Place()
+        rv = Review()
+        rv.place_id = pl.id
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(1, self.storage.count(Review))
+        self.assertEqual(["Review." + rv.id],
+                         list(self.storage.find(Review, place_id=pl.id)))
+
+    def test_class_registered_later(self):
+        self.storage.save()
+
+        class Cabin(Place):
+            stoves = 1
+            rules = {}
+        try:
+            cb = Cabin()
+            cb.stoves = 2
+            cb.rules = {"pets": False}
+            self.storage.save()
+            self.storage.reload()
+            cabin = self.storage.all()["Cabin." + cb.id]
+            self.assertEqual(2, cabin.stoves)
+            self.assertEqual({"pets": False}, cabin.rules)
+        finally:
+            for registry in (classes, attributes, schemas):
+                registry.pop("Cabin", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
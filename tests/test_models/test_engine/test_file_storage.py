@@ -4,14 +4,31 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_dirty
+    TestFileStorage_lazy
+    TestFileStorage_class_index
+    TestFileStorage_find
+    TestFileStorage_iter
+    TestFileStorage_columns
+    TestFileStorage_where
+    TestFileStorage_bulk
+    TestFileStorage_transaction
+    TestFileStorage_flusher
+    TestFileStorage_shards
 """
 import os
 import json
+import shutil
+import time
 import models
 import unittest
+import unittest.mock
 from datetime import datetime
 from models.base_model import BaseModel
+from models.engine.columns import numpy
 from models.engine.file_storage import FileStorage
+from models.engine.serializers import write_file
 from models.user import User
 from models.state import State
 from models.place import Place
@@ -65,9 +82,12 @@ class TestFileStorage_methods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
+    def test_all_with_None(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, None)
 
     def test_new(self):
         bm = BaseModel()
@@ -169,5 +189,1081 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        for name in ("file.json", "file.json.journal"):
+            try:
+                os.rename(name, name + ".tmp")
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        for journal in FileStorage._FileStorage__journals.values():
+            journal.wait()
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_limit = 4 * 1024 * 1024
+        for name in ("file.json", "file.json.journal",
+                     "file.json.journal.1"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+            try:
+                os.rename(name + ".tmp", name)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_appends_to_journal(self):
+        bm = BaseModel()
+        models.storage.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        with open("file.json.journal", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(1, len(lines))
+        self.assertIn("BaseModel." + bm.id, lines[0])
+
+    def test_save_appends_only_changes(self):
+        BaseModel()
+        models.storage.save()
+        us = User()
+        us.save()
+        with open("file.json.journal", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertIn("User." + us.id, lines[1])
+
+    def test_reload_replays_journal(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        bm.name = "Holberton"
+        bm.save()
+        models.storage.delete(us)
+        models.storage.save()
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertNotIn("User." + us.id, objs)
+        self.assertEqual("Holberton", objs["BaseModel." + bm.id].name)
+
+    def test_compaction(self):
+        FileStorage._FileStorage__journal_limit = 0
+        bm = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__journals["file.json"].wait()
+        self.assertFalse(os.path.isfile("file.json.journal"))
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+        us = User()
+        us.save()
+        models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertIn("User." + us.id, objs)
+
+    def test_compaction_after_interrupted_one(self):
+        bm = BaseModel()
+        models.storage.save()
+        os.rename("file.json.journal", "file.json.journal.1")
+        FileStorage._FileStorage__journal_limit = 0
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__journals["file.json"].wait()
+        self.assertFalse(os.path.isfile("file.json.journal.1"))
+        self.assertFalse(os.path.isfile("file.json.journal"))
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertIn("BaseModel." + bm.id, saved)
+        self.assertIn("User." + us.id, saved)
+
+    def test_reload_during_compaction(self):
+        FileStorage._FileStorage__journal_limit = 0
+        bm = BaseModel()
+        models.storage.save()
+        journal = FileStorage._FileStorage__journals["file.json"]
+        journal.wait()
+        us = User()
+        write_file = models.engine.journal.write_file
+        load_file = models.engine.file_storage.load_file
+
+        def slow_write_file(*args):
+            time.sleep(0.2)
+            write_file(*args)
+
+        def load_file_then_compact(*args):
+            obj_dict = load_file(*args)
+            journal.wait()
+            return obj_dict
+        with unittest.mock.patch("models.engine.journal.write_file",
+                                 slow_write_file), \
+                unittest.mock.patch("models.engine.file_storage.load_file",
+                                    load_file_then_compact):
+            models.storage.save()
+            self.assertTrue(journal.compacting())
+            models.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertIn("User." + us.id, objs)
+
+    def test_full_save_clears_journal(self):
+        BaseModel().save()
+        FileStorage._FileStorage__journal = False
+        models.storage.save()
+        self.assertTrue(os.path.isfile("file.json"))
+        self.assertFalse(os.path.isfile("file.json.journal"))
+
+
+class TestFileStorage_dirty(unittest.TestCase):
+    """Unittests for testing dirty-tracking of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_new_is_dirty(self):
+        bm = BaseModel()
+        self.assertIn("BaseModel." + bm.id, models.storage.dirty())
+
+    def test_save_clears_dirty(self):
+        BaseModel()
+        models.storage.save()
+        self.assertEqual(set(), models.storage.dirty())
+
+    def test_setattr_is_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.name = "Holberton"
+        self.assertEqual({"BaseModel." + bm.id}, models.storage.dirty())
+
+    def test_delattr_is_dirty(self):
+        bm = BaseModel()
+        bm.name = "Holberton"
+        models.storage.save()
+        del bm.name
+        self.assertEqual({"BaseModel." + bm.id}, models.storage.dirty())
+
+    def test_delete_is_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        self.assertEqual({"BaseModel." + bm.id}, models.storage.dirty())
+
+    def test_unstored_is_not_dirty(self):
+        bm = BaseModel(id="345", created_at=datetime.today().isoformat(),
+                       updated_at=datetime.today().isoformat())
+        bm.name = "Holberton"
+        self.assertNotIn("BaseModel.345", models.storage.dirty())
+
+    def test_changed_id_is_dirty(self):
+        pl = Place()
+        key = "Place." + pl.id
+        models.storage.save()
+        pl.id = "newid"
+        models.storage.save()
+        pl.name = "Loft"
+        self.assertEqual({key}, models.storage.dirty())
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual("Loft", saved[key]["name"])
+        self.assertEqual("newid", saved[key]["id"])
+        models.storage.delete(pl)
+        self.assertNotIn(key, models.storage.all())
+
+    def test_save_serializes_dirty_only(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        calls = []
+        to_dict = User.to_dict
+
+        def counting_to_dict(obj):
+            calls.append(obj)
+            return to_dict(obj)
+        User.to_dict = counting_to_dict
+        try:
+            bm.name = "Holberton"
+            models.storage.save()
+        finally:
+            del User.to_dict
+        self.assertEqual([], calls)
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual("Holberton", saved["BaseModel." + bm.id]["name"])
+        self.assertIn("User." + us.id, saved)
+
+    def test_save_output_matches_json_dump(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        bm.name = "Holberton"
+        models.storage.save()
+        expected = json.dumps({k: v.to_dict() for k, v in
+                               models.storage.all().items()})
+        with open("file.json", "r") as f:
+            self.assertEqual(expected, f.read())
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy reload mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.bm = BaseModel()
+        self.us = User()
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__raw = {}
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_nothing(self):
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertIsNone(FileStorage._FileStorage__raw)
+
+    def test_get_builds_one(self):
+        us = models.storage.get("User", self.us.id)
+        self.assertEqual(User, type(us))
+        self.assertEqual(self.us.id, us.id)
+        self.assertEqual(["User." + self.us.id],
+                         list(FileStorage._FileStorage__objects))
+        self.assertIs(us, models.storage.get(User, self.us.id))
+
+    def test_get_missing(self):
+        self.assertIsNone(models.storage.get("User", "1234"))
+
+    def test_all_builds_everything(self):
+        objs = models.storage.all()
+        self.assertIn("BaseModel." + self.bm.id, objs)
+        self.assertIn("User." + self.us.id, objs)
+        self.assertEqual({}, FileStorage._FileStorage__raw)
+
+    def test_save_keeps_unbuilt_objects(self):
+        st = State()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertIn("BaseModel." + self.bm.id, saved)
+        self.assertIn("User." + self.us.id, saved)
+        self.assertIn("State." + st.id, saved)
+
+    def test_new_wins_over_stored(self):
+        bm = BaseModel(**self.bm.to_dict())
+        bm.name = "Holberton"
+        models.storage.new(bm)
+        self.assertIs(bm, models.storage.get(BaseModel, self.bm.id))
+        self.assertIs(bm, models.storage.all()["BaseModel." + self.bm.id])
+
+
+class TestFileStorage_class_index(unittest.TestCase):
+    """Unittests for testing all(cls) and count(cls) of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__raw = {}
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_all_cls(self):
+        bm = BaseModel()
+        us1 = User()
+        us2 = User()
+        self.assertEqual({"User." + us1.id: us1, "User." + us2.id: us2},
+                         models.storage.all(User))
+        self.assertEqual({"BaseModel." + bm.id: bm},
+                         models.storage.all("BaseModel"))
+        self.assertEqual({}, models.storage.all(Review))
+
+    def test_count(self):
+        BaseModel()
+        User()
+        User()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("BaseModel"))
+        self.assertEqual(0, models.storage.count("MyModel"))
+
+    def test_count_after_delete(self):
+        us = User()
+        User()
+        models.storage.delete(us)
+        self.assertEqual(1, models.storage.count(User))
+        self.assertNotIn("User." + us.id, models.storage.all(User))
+
+    def test_index_follows_replaced_objects(self):
+        User()
+        self.assertEqual(1, models.storage.count(User))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, models.storage.count(User))
+        us = User()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+
+    def test_index_follows_direct_deletion(self):
+        us = User()
+        del models.storage.all()["User." + us.id]
+        self.assertEqual(0, models.storage.count(User))
+
+    def test_reload(self):
+        us = User()
+        Place()
+        models.storage.save()
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count(User))
+        self.assertIn("User." + us.id, models.storage.all(User))
+
+    def test_lazy_count_builds_nothing(self):
+        User()
+        User()
+        Place()
+        models.storage.save()
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual(2, len(models.storage.all(User)))
+        self.assertEqual(2, len(FileStorage._FileStorage__objects))
+        self.assertEqual(1, models.storage.count(Place))
+
+
+class TestFileStorage_find(unittest.TestCase):
+    """Unittests for testing the find method of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.rv1 = Review()
+        self.rv1.place_id = self.pl.id
+        self.rv2 = Review()
+        self.rv2.place_id = self.pl.id
+        self.rv3 = Review()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_find_indexed(self):
+        found = models.storage.find(Review, place_id=self.pl.id)
+        self.assertEqual({"Review." + self.rv1.id: self.rv1,
+                          "Review." + self.rv2.id: self.rv2}, found)
+
+    def test_find_uses_index(self):
+        index = [i for i in FileStorage._FileStorage__secondary["Review"]
+                 if i.attribute == "place_id"][0]
+        self.assertEqual(2, len(index.find(self.pl.id)))
+
+    def test_find_not_indexed(self):
+        self.rv1.text = "Great"
+        found = models.storage.find("Review", text="Great")
+        self.assertEqual({"Review." + self.rv1.id: self.rv1}, found)
+
+    def test_find_several_attributes(self):
+        self.rv2.text = "Great"
+        found = models.storage.find(Review, place_id=self.pl.id,
+                                    text="Great")
+        self.assertEqual({"Review." + self.rv2.id: self.rv2}, found)
+
+    def test_find_follows_setattr(self):
+        self.rv1.place_id = "1234"
+        self.assertEqual({"Review." + self.rv2.id: self.rv2},
+                         models.storage.find(Review, place_id=self.pl.id))
+        self.assertEqual({"Review." + self.rv1.id: self.rv1},
+                         models.storage.find(Review, place_id="1234"))
+
+    def test_find_follows_delete(self):
+        models.storage.delete(self.rv1)
+        self.assertEqual({"Review." + self.rv2.id: self.rv2},
+                         models.storage.find(Review, place_id=self.pl.id))
+
+    def test_find_follows_reload(self):
+        models.storage.save()
+        models.storage.reload()
+        found = models.storage.find(Review, place_id=self.pl.id)
+        self.assertEqual({"Review." + self.rv1.id, "Review." + self.rv2.id},
+                         set(found))
+
+    def test_find_nothing(self):
+        self.assertEqual({}, models.storage.find(Review, place_id="1234"))
+        self.assertEqual({}, models.storage.find(City, state_id="1234"))
+
+
+class TestFileStorage_iter(unittest.TestCase):
+    """Unittests for testing pages of objects of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.keys = sorted("Review." + Review().id for _ in range(10))
+        User()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def keys_of(self, *args, **kwargs):
+        return [k for k, _ in models.storage.iter(*args, **kwargs)]
+
+    def test_iter(self):
+        self.assertEqual(self.keys, self.keys_of(Review))
+        self.assertEqual(self.keys[:3], self.keys_of("Review", limit=3))
+
+    def test_iter_objects(self):
+        for k, v in models.storage.iter(Review):
+            self.assertIs(models.storage.all()[k], v)
+
+    def test_iter_pages(self):
+        pages = []
+        after = None
+        while True:
+            page = self.keys_of(Review, after=after, limit=3)
+            if not page:
+                break
+            pages.append(page)
+            after = page[-1]
+        self.assertEqual([3, 3, 3, 1], [len(page) for page in pages])
+        self.assertEqual(self.keys, sum(pages, []))
+
+    def test_iter_after_missing_key(self):
+        after = self.keys[4][:-1]
+        self.assertEqual(self.keys[4:6],
+                         self.keys_of(Review, after=after, limit=2))
+
+    def test_iter_follows_changes(self):
+        self.keys_of(Review)
+        models.storage.delete(models.storage.all()[self.keys[0]])
+        rv = Review()
+        self.assertEqual(sorted(self.keys[1:] + ["Review." + rv.id]),
+                         self.keys_of(Review))
+
+    def test_iter_empty_class(self):
+        self.assertEqual([], self.keys_of(Place))
+
+
+class TestFileStorage_columns(unittest.TestCase):
+    """Unittests for testing select and aggregate of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl1 = Place()
+        self.pl1.city_id = "a"
+        self.pl1.price_by_night = 50
+        self.pl2 = Place()
+        self.pl2.city_id = "a"
+        self.pl2.price_by_night = 150
+        self.pl2.max_guest = 4
+        self.pl3 = Place()
+        self.pl3.city_id = "b"
+        self.pl3.price_by_night = 90
+        self.pl3.max_guest = 6
+
+    def tearDown(self):
+        FileStorage._FileStorage__undo = None
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_select(self):
+        found = models.storage.select(Place, ("price_by_night", "<", 100),
+                                      ("max_guest", ">=", 4))
+        self.assertEqual({"Place." + self.pl3.id: self.pl3}, found)
+
+    def test_select_no_condition(self):
+        self.assertEqual(models.storage.all(Place),
+                         models.storage.select("Place"))
+
+    def test_select_not_in_columns(self):
+        self.pl1.name = "Loft"
+        found = models.storage.select("Place", ("name", "==", "Loft"),
+                                      ("price_by_night", "<", 100))
+        self.assertEqual({"Place." + self.pl1.id: self.pl1}, found)
+
+    def test_select_other_class(self):
+        us = User()
+        us.first_name = "Betty"
+        self.assertEqual({"User." + us.id: us}, models.storage.select(
+            User, ("first_name", "==", "Betty")))
+
+    def test_select_follows_changes(self):
+        self.pl1.max_guest = 8
+        models.storage.delete(self.pl3)
+        pl4 = Place()
+        pl4.max_guest = 5
+        found = models.storage.select(Place, ("max_guest", ">=", 4))
+        self.assertEqual({"Place." + self.pl1.id, "Place." + self.pl2.id,
+                          "Place." + pl4.id}, set(found))
+
+    def test_select_indexed_then_update(self):
+        found = models.storage.select(Place, ("city_id", "==", "a"))
+        for obj in found.values():
+            obj.city_id = "c"
+        self.assertEqual({"Place." + self.pl1.id, "Place." + self.pl2.id},
+                         set(models.storage.select(Place,
+                                                   ("city_id", "==", "c"))))
+
+    def test_select_after_rollback(self):
+        models.storage.begin()
+        self.pl1.price_by_night = 500
+        models.storage.rollback()
+        found = models.storage.select(Place, ("price_by_night", ">", 100))
+        self.assertEqual({"Place." + self.pl2.id}, set(found))
+
+    def test_aggregate(self):
+        self.assertEqual(290, models.storage.aggregate(
+            Place, "sum", "price_by_night"))
+        self.assertEqual({"a": 100.0, "b": 90.0}, models.storage.aggregate(
+            "Place", "mean", "price_by_night", by="city_id"))
+
+    def test_aggregate_where(self):
+        self.assertEqual({"a": 1, "b": 1}, models.storage.aggregate(
+            "Place", "count", "price_by_night", by="city_id",
+            where=(("max_guest", ">", 0),)))
+
+    def test_aggregate_not_in_columns(self):
+        self.pl1.name = "Loft"
+        self.assertEqual(50, models.storage.aggregate(
+            "Place", "max", "price_by_night",
+            where=(("name", "==", "Loft"),)))
+
+    def test_aggregate_other_class(self):
+        self.assertEqual(0, models.storage.aggregate(
+            Review, "count", "text"))
+
+
+class TestFileStorage_where(unittest.TestCase):
+    """Unittests for testing where and explain of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl1 = Place()
+        self.pl1.city_id = "a"
+        self.pl1.price_by_night = 50
+        self.pl2 = Place()
+        self.pl2.city_id = "a"
+        self.pl2.price_by_night = 150
+        self.pl2.max_guest = 4
+        self.pl3 = Place()
+        self.pl3.city_id = "b"
+        self.pl3.price_by_night = 90
+        self.pl3.max_guest = 6
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_where(self):
+        found = models.storage.where(Place, ("price_by_night", "<", 100),
+                                     ("max_guest", ">=", 4))
+        self.assertEqual({"Place." + self.pl3.id: self.pl3}, found)
+
+    def test_where_order(self):
+        found = models.storage.where(Place, order="price_by_night")
+        self.assertEqual([self.pl1, self.pl3, self.pl2], list(found.values()))
+        found = models.storage.where(Place, order="-price_by_night")
+        self.assertEqual([self.pl2, self.pl3, self.pl1], list(found.values()))
+
+    def test_where_order_limit(self):
+        found = models.storage.where(Place, ("city_id", "==", "a"),
+                                     order="-price_by_night", limit=1)
+        self.assertEqual([self.pl2], list(found.values()))
+        self.assertEqual(2, len(models.storage.where(Place, limit=2)))
+
+    def test_where_order_missing_last(self):
+        self.pl2.rating = 3
+        self.pl3.rating = 5
+        found = models.storage.where(Place, order="-rating")
+        self.assertEqual([self.pl3, self.pl2, self.pl1], list(found.values()))
+
+    def test_where_order_not_comparable(self):
+        self.pl2.rating = "good"
+        self.pl3.rating = 5
+        with self.assertRaises(ValueError):
+            models.storage.where(Place, order="rating")
+
+    def test_where_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            models.storage.where(Place, ("max_guest", "~", 4))
+
+    def test_where_same_as_scan(self):
+        conditions = (("city_id", "==", "a"), ("price_by_night", ">", 60),
+                      ("max_guest", "!=", 0), ("name", "==", ""))
+        for i in range(1, len(conditions) + 1):
+            self.assertEqual(
+                {k for k, v in models.storage.all(Place).items()
+                 if all(getattr(v, a) == x if op == "==" else
+                        getattr(v, a) > x if op == ">" else
+                        getattr(v, a) != x for a, op, x in conditions[:i])},
+                set(models.storage.where(Place, *conditions[:i])))
+
+    def test_explain_hash_index(self):
+        self.assertEqual(
+            "hash index on Place.city_id: 2 of 3 objects\n"
+            "filter (price_by_night < 100): 1 of 2 objects",
+            models.storage.explain(Place, ("price_by_night", "<", 100),
+                                   ("city_id", "==", "a")))
+
+    def test_explain_smallest_hash_index(self):
+        self.pl1.user_id = "u"
+        self.assertEqual(
+            "hash index on Place.user_id: 1 of 3 objects\n"
+            "filter (city_id == 'a'): 1 of 1 objects",
+            models.storage.explain(Place, ("city_id", "==", "a"),
+                                   ("user_id", "==", "u")))
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_explain_column_store(self):
+        self.assertEqual(
+            "column store of Place (max_guest >= 4): 2 of 3 objects\n"
+            "filter (name == ''): 2 of 2 objects\n"
+            "top 1 by -price_by_night\n"
+            "limit 1: 1 objects",
+            models.storage.explain(Place, ("max_guest", ">=", 4),
+                                   ("name", "==", ""),
+                                   order="-price_by_night", limit=1))
+
+    def test_explain_scan(self):
+        self.assertEqual(
+            "scan of User: 0 objects\n"
+            "sort by email",
+            models.storage.explain(User, order="email"))
+
+
+class TestFileStorage_bulk(unittest.TestCase):
+    """Unittests for testing import_records and export of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.us = User()
+        self.us.email = "a@b.c"
+        self.pl = Place()
+        self.pl.name = 'Loft, "big"\nand bright'
+        self.pl.max_guest = 4
+        self.pl.amenity_ids = ["x", "y"]
+        self.pl.rating = 4.5
+        models.storage.save()
+        self.saved = {k: v.to_dict() for k, v in models.storage.all().items()}
+
+    def tearDown(self):
+        FileStorage._FileStorage__undo = None
+        for path in ("file.json", "test_bulk.jsonl", "test_bulk.csv"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def round_trip(self, path, **kwargs):
+        self.assertEqual(2, models.storage.export(path))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(2, models.storage.import_records(path, **kwargs))
+        self.assertEqual(self.saved, {k: v.to_dict() for k, v in
+                                      models.storage.all().items()})
+
+    def test_jsonl(self):
+        self.round_trip("test_bulk.jsonl")
+
+    def test_csv(self):
+        self.round_trip("test_bulk.csv")
+
+    def test_parallel(self):
+        self.round_trip("test_bulk.csv", workers=2)
+
+    def test_saved_once(self):
+        models.storage.export("test_bulk.jsonl")
+        FileStorage._FileStorage__objects = {}
+        os.remove("file.json")
+        with unittest.mock.patch("models.engine.file_storage.write_file",
+                                 wraps=write_file) as writes:
+            models.storage.import_records("test_bulk.jsonl")
+        self.assertEqual(1, writes.call_count)
+        with open("file.json", "r") as f:
+            self.assertEqual(self.saved, json.load(f))
+
+    def test_export_class(self):
+        self.assertEqual(1, models.storage.export("test_bulk.csv", Place))
+        with open("test_bulk.csv", "r") as f:
+            self.assertEqual("__class__,id,created_at,updated_at,name,"
+                             "max_guest,amenity_ids,rating", f.readline()
+                             .strip())
+
+    def test_import_class(self):
+        with open("test_bulk.csv", "w") as f:
+            f.write("name,price_by_night\nLoft,90\nFlat,\n")
+        self.assertEqual(2, models.storage.import_records(
+            "test_bulk.csv", cls=Place))
+        places = models.storage.find(Place, name="Loft")
+        self.assertEqual(90, list(places.values())[0].price_by_night)
+        self.assertEqual(1, len(models.storage.find(Place, name="Flat")))
+        self.assertEqual(3, models.storage.count(Place))
+
+    def test_import_invalid_record(self):
+        with open("test_bulk.jsonl", "w") as f:
+            f.write('{"__class__": "User", "email": "b@c.d"}\n'
+                    '{"__class__": "Place", "max_guest": "many"}\n')
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            models.storage.import_records("test_bulk.jsonl")
+        self.assertEqual(self.saved, {k: v.to_dict() for k, v in
+                                      models.storage.all().items()})
+        self.assertFalse(models.storage.in_transaction())
+
+    def test_import_unknown_class(self):
+        with self.assertRaises(ValueError):
+            models.storage.import_records("test_bulk.csv", cls="Castle")
+
+
+class TestFileStorage_transaction(unittest.TestCase):
+    """Unittests for testing transactions of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.pl = Place()
+        models.storage.save()
+
+    def tearDown(self):
+        FileStorage._FileStorage__undo = None
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def saved(self):
+        with open("file.json", "r") as f:
+            return json.load(f)
+
+    def test_save_is_deferred(self):
+        with models.storage.transaction():
+            st = State()
+            st.save()
+            self.assertNotIn("State." + st.id, self.saved())
+        self.assertIn("State." + st.id, self.saved())
+        self.assertFalse(models.storage.in_transaction())
+
+    def test_commit_saves_once(self):
+        saves = []
+        save = FileStorage.save
+
+        def counting_save(storage):
+            saves.append(storage.in_transaction())
+            save(storage)
+        FileStorage.save = counting_save
+        try:
+            models.storage.begin()
+            for i in range(10):
+                State().save()
+            models.storage.commit()
+        finally:
+            FileStorage.save = save
+        self.assertEqual([True] * 10 + [False], saves)
+        self.assertEqual(10, models.storage.count(State))
+
+    def test_rollback_created(self):
+        models.storage.begin()
+        st = State()
+        st.save()
+        models.storage.rollback()
+        self.assertNotIn("State." + st.id, models.storage.all())
+        self.assertEqual(0, models.storage.count(State))
+        self.assertNotIn("State." + st.id, self.saved())
+
+    def test_rollback_updated(self):
+        models.storage.begin()
+        self.us.first_name = "Holberton"
+        self.us.last_name = "School"
+        self.pl.city_id = "1234"
+        self.us.save()
+        models.storage.rollback()
+        self.assertEqual("Betty", self.us.first_name)
+        self.assertNotIn("last_name", self.us.__dict__)
+        self.assertEqual({}, models.storage.find(Place, city_id="1234"))
+        self.assertEqual(set(), models.storage.dirty())
+
+    def test_rollback_deleted(self):
+        models.storage.begin()
+        models.storage.delete(self.us)
+        models.storage.save()
+        models.storage.rollback()
+        self.assertIs(self.us, models.storage.all()["User." + self.us.id])
+        self.assertEqual(1, models.storage.count(User))
+
+    def test_rollback_keeps_earlier_changes_dirty(self):
+        self.us.first_name = "Holberton"
+        models.storage.begin()
+        self.pl.name = "Home"
+        models.storage.rollback()
+        self.assertEqual({"User." + self.us.id}, models.storage.dirty())
+        self.assertEqual("Holberton", self.us.first_name)
+
+    def test_exception_rolls_back(self):
+        with self.assertRaises(ValueError):
+            with models.storage.transaction():
+                self.us.first_name = "Holberton"
+                raise ValueError
+        self.assertEqual("Betty", self.us.first_name)
+        self.assertFalse(models.storage.in_transaction())
+
+    def test_nested_transaction_joins(self):
+        with models.storage.transaction():
+            with models.storage.transaction():
+                st = State()
+                st.save()
+            self.assertTrue(models.storage.in_transaction())
+            self.assertNotIn("State." + st.id, self.saved())
+        self.assertIn("State." + st.id, self.saved())
+
+    def test_begin_twice(self):
+        models.storage.begin()
+        with self.assertRaises(RuntimeError):
+            models.storage.begin()
+
+    def test_commit_without_begin(self):
+        with self.assertRaises(RuntimeError):
+            models.storage.commit()
+        with self.assertRaises(RuntimeError):
+            models.storage.rollback()
+
+
+class TestFileStorage_flusher(unittest.TestCase):
+    """Unittests for testing background saves of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__flush_window = 0.05
+
+    def tearDown(self):
+        models.storage.flush()
+        FileStorage._FileStorage__flush_window = 0
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_returns_before_writing(self):
+        bm = BaseModel()
+        bm.save()
+        self.assertFalse(os.path.isfile("file.json"))
+        models.storage.flush()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+
+    def test_last_save_wins(self):
+        bm = BaseModel()
+        for i in range(5):
+            bm.number = i
+            bm.save()
+        models.storage.flush()
+        with open("file.json", "r") as f:
+            self.assertEqual(4, json.load(f)["BaseModel." + bm.id]["number"])
+
+    def test_reload_flushes(self):
+        bm = BaseModel()
+        bm.save()
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+
+
+class TestFileStorage_shards(unittest.TestCase):
+    """Unittests for testing the sharded layout of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__shard_dir = "test_shards"
+        self.us = User()
+        self.st = State()
+        self.st.name = "Texas"
+        models.storage.save()
+
+    def tearDown(self):
+        FileStorage._FileStorage__shard_dir = None
+        FileStorage._FileStorage__pending = set()
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__raw = {}
+        shutil.rmtree("test_shards", ignore_errors=True)
+        FileStorage._FileStorage__objects = {}
+
+    def shard(self, name):
+        with open(os.path.join("test_shards", name + ".json"), "r") as f:
+            return json.load(f)
+
+    def test_one_file_per_class(self):
+        self.assertEqual(["State.json", "User.json"],
+                         sorted(os.listdir("test_shards")))
+        self.assertEqual(["User." + self.us.id], list(self.shard("User")))
+        self.assertEqual("Texas",
+                         self.shard("State")["State." + self.st.id]["name"])
+
+    def test_no_shard_without_objects(self):
+        self.assertFalse(os.path.isfile(
+            os.path.join("test_shards", "Place.json")))
+
+    def test_only_dirty_shards_written(self):
+        mtime = os.stat(os.path.join("test_shards", "User.json")).st_mtime_ns
+        self.st.name = "Ohio"
+        models.storage.save()
+        self.assertEqual(mtime, os.stat(
+            os.path.join("test_shards", "User.json")).st_mtime_ns)
+        self.assertEqual("Ohio",
+                         self.shard("State")["State." + self.st.id]["name"])
+
+    def test_reload_reads_nothing(self):
+        models.storage.reload()
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual({"User", "State"},
+                         FileStorage._FileStorage__pending)
+
+    def test_shard_loaded_on_demand(self):
+        models.storage.reload()
+        self.assertEqual(["State." + self.st.id],
+                         list(models.storage.all(State)))
+        self.assertEqual({"User"}, FileStorage._FileStorage__pending)
+        self.assertIsNotNone(models.storage.get("User", self.us.id))
+        self.assertEqual(set(), FileStorage._FileStorage__pending)
+
+    def test_all_loads_every_shard(self):
+        models.storage.reload()
+        self.assertEqual({"User." + self.us.id, "State." + self.st.id},
+                         set(models.storage.all()))
+
+    def test_count_loads_shard(self):
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count("User"))
+
+    def test_save_unread_shard_keeps_its_objects(self):
+        models.storage.reload()
+        us = User()
+        models.storage.save()
+        self.assertEqual({"User." + self.us.id, "User." + us.id},
+                         set(self.shard("User")))
+
+    def test_delete(self):
+        models.storage.delete(self.us)
+        models.storage.save()
+        self.assertEqual({}, self.shard("User"))
+        models.storage.reload()
+        self.assertEqual(0, models.storage.count(User))
+
+    def test_lazy(self):
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        self.assertEqual(1, models.storage.count(State))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual("Texas", models.storage.get(State, self.st.id).name)
+
+
 if __name__ == "__main__":
     unittest.main()
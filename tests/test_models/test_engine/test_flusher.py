@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/flusher.py.
+
+Unittest classes:
+    TestFlusher
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.engine import flusher
+from models.engine.flusher import Flusher
+from models.engine.serializers import get_serializer
+
+
+class TestFlusher(unittest.TestCase):
+    """Unittests for testing the Flusher class."""
+
+    def tearDown(self):
+        try:
+            os.remove("test_flusher.json")
+        except IOError:
+            pass
+
+    def test_flush_writes(self):
+        f = Flusher(0.01)
+        f.submit("test_flusher.json", get_serializer("json"),
+                 [b'"a": 1'])
+        f.flush()
+        with open("test_flusher.json", "rb") as fp:
+            self.assertEqual(b'{"a": 1}', fp.read())
+
+    def test_submits_are_coalesced(self):
+        f = Flusher(0.2)
+        serializer = get_serializer("json")
+        with patch.object(flusher, "write_file",
+                          wraps=flusher.write_file) as write_file:
+            for i in range(5):
+                f.submit("test_flusher.json", serializer,
+                         ['"a": {}'.format(i).encode()])
+            f.flush()
+        self.assertEqual(1, write_file.call_count)
+        with open("test_flusher.json", "rb") as fp:
+            self.assertEqual(b'{"a": 4}', fp.read())
+
+    def test_flush_raises_write_errors(self):
+        f = Flusher(0.01)
+        f.submit(os.path.join("no", "such", "dir.json"),
+                 get_serializer("json"), [])
+        with self.assertRaises(OSError):
+            f.flush()
+        f.flush()
+
+    def test_flush_without_submit(self):
+        Flusher(0.01).flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/indexes.py.
+
+Unittest classes:
+    TestHashIndex
+    TestGridIndex
+    TestGridIndex_queries
+    TestKeyIndex
+"""
+import math
+import random
+import unittest
+from models.engine.indexes import GridIndex, HashIndex, KeyIndex
+from models.place import Place
+
+
+def place(id, latitude, longitude):
+    """Returns a Place built without being stored"""
+    return Place(id=id, created_at="2017-09-28T21:03:54.052298",
+                 updated_at="2017-09-28T21:03:54.052298",
+                 latitude=latitude, longitude=longitude)
+
+
+class TestHashIndex(unittest.TestCase):
+    """Unittests for testing the HashIndex class."""
+
+    def test_add_find_remove(self):
+        index = HashIndex("city_id")
+        pl = Place(id="1", city_id="a")
+        index.add("Place.1", pl)
+        self.assertEqual({"Place.1": pl}, index.find("a"))
+        pl.__dict__["city_id"] = "b"
+        index.add("Place.1", pl)
+        self.assertEqual({}, index.find("a"))
+        index.remove("Place.1")
+        self.assertEqual({}, index.find("b"))
+
+    def test_unhashable(self):
+        index = HashIndex("amenity_ids")
+        index.add("Place.1", Place(id="1", amenity_ids=["x"]))
+        self.assertEqual({}, index.find(["x"]))
+
+
+class TestGridIndex(unittest.TestCase):
+    """Unittests for testing how GridIndex follows its objects."""
+
+    def test_distance(self):
+        paris_london = GridIndex.distance(48.8566, 2.3522, 51.5072, -0.1276)
+        self.assertAlmostEqual(343.9, paris_london, delta=1)
+        self.assertEqual(0, GridIndex.distance(10, 20, 10, 20))
+
+    def test_add_remove(self):
+        index = GridIndex("latitude", "longitude")
+        index.add("Place.1", place("1", 10, 20))
+        self.assertEqual(1, len(index))
+        index.remove("Place.1")
+        index.remove("Place.1")
+        self.assertEqual(0, len(index))
+        self.assertEqual({}, index.near(10, 20, 1))
+
+    def test_move(self):
+        index = GridIndex("latitude", "longitude")
+        pl = place("1", 10, 20)
+        index.add("Place.1", pl)
+        pl.__dict__["latitude"] = -10
+        index.add("Place.1", pl)
+        self.assertEqual(1, len(index))
+        self.assertEqual({}, index.near(10, 20, 100))
+        self.assertEqual({"Place.1": pl}, index.near(-10, 20, 100))
+
+    def test_invalid_position(self):
+        index = GridIndex("latitude", "longitude")
+        index.add("Place.1", place("1", "north", 20))
+        index.add("Place.2", place("2", 91, 20))
+        index.add("Place.3", place("3", 10, None))
+        self.assertEqual(0, len(index))
+
+    def test_becomes_invalid(self):
+        index = GridIndex("latitude", "longitude")
+        pl = place("1", 10, 20)
+        index.add("Place.1", pl)
+        pl.__dict__["latitude"] = "north"
+        index.add("Place.1", pl)
+        self.assertEqual(0, len(index))
+
+
+class TestGridIndex_queries(unittest.TestCase):
+    """Unittests for testing the queries of GridIndex."""
+
+    def setUp(self):
+        random.seed(98)
+        self.index = GridIndex("latitude", "longitude", cell=1.0)
+        self.places = {}
+        for i in range(2000):
+            pl = place(str(i), random.uniform(-90, 90),
+                       random.uniform(-180, 180))
+            self.places["Place." + pl.id] = pl
+            self.index.add("Place." + pl.id, pl)
+
+    def brute_near(self, lat, lon, radius):
+        return {k for k, v in self.places.items()
+                if GridIndex.distance(lat, lon, v.latitude,
+                                      v.longitude) <= radius}
+
+    def test_near_matches_scan(self):
+        for lat, lon, radius in ((0, 0, 1500), (45, 179.5, 800),
+                                 (89, 10, 500), (-60, -120, 3000),
+                                 (10, 10, 20000)):
+            self.assertEqual(self.brute_near(lat, lon, radius),
+                             set(self.index.near(lat, lon, radius)))
+
+    def test_near_ordered(self):
+        found = self.index.near(0, 0, 3000)
+        distances = [GridIndex.distance(0, 0, v.latitude, v.longitude)
+                     for v in found.values()]
+        self.assertEqual(sorted(distances), distances)
+
+    def test_within_bbox(self):
+        found = self.index.within_bbox(-10, -20, 30, 40)
+        self.assertEqual({k for k, v in self.places.items()
+                          if -10 <= v.latitude <= 30 and
+                          -20 <= v.longitude <= 40}, set(found))
+
+    def test_within_bbox_antimeridian(self):
+        found = self.index.within_bbox(-30, 170, 30, -170)
+        self.assertEqual({k for k, v in self.places.items()
+                          if -30 <= v.latitude <= 30 and
+                          (v.longitude >= 170 or v.longitude <= -170)},
+                         set(found))
+        self.assertTrue(found)
+
+    def test_not_finite(self):
+        with self.assertRaisesRegex(ValueError, "^latitude must be a number$"):
+            self.index.near(math.nan, 0, 5)
+        with self.assertRaisesRegex(ValueError, "^radius must be a number$"):
+            self.index.near(0, 0, math.inf)
+        with self.assertRaisesRegex(ValueError, "^south must be a number$"):
+            self.index.within_bbox(-math.inf, 0, 1, 1)
+
+
+class TestKeyIndex(unittest.TestCase):
+    """Unittests for testing the KeyIndex class."""
+
+    def test_after(self):
+        index = KeyIndex(["b", "d", "a", "c"])
+        self.assertEqual(["a", "b", "c", "d"], index.after())
+        self.assertEqual(["c", "d"], index.after("b"))
+        self.assertEqual(["c"], index.after("bb", 1))
+        self.assertEqual([], index.after("d", 5))
+        self.assertEqual(["a", "b"], index.after(limit=2))
+
+    def test_add_remove(self):
+        index = KeyIndex(["b", "d"])
+        index.add("c", None)
+        index.add("c", None)
+        index.remove("d")
+        index.remove("e")
+        index.add("d", None)
+        index.remove("b")
+        self.assertEqual(2, len(index))
+        self.assertEqual(["c", "d"], index.after())
+
+    def test_many_changes(self):
+        keys = ["{:04}".format(i) for i in range(1000)]
+        index = KeyIndex(keys[::2])
+        for key in keys[1::2]:
+            index.add(key, None)
+        for key in keys[:100]:
+            index.remove(key)
+        self.assertEqual(keys[100:], index.after())
+        index.add("0000", None)
+        index.remove("0999")
+        self.assertEqual(["0000"] + keys[100:999], index.after())
+
+
+if __name__ == "__main__":
+    unittest.main()
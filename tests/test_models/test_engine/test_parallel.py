@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/parallel.py.
+
+Unittest classes:
+    TestParallel_split
+    TestParallel_load
+    TestParallel_storage
+"""
+import json
+import os
+import shutil
+import unittest
+from datetime import datetime
+import models
+from models.engine.file_storage import FileStorage
+from models.engine.parallel import can_fork, load_chunk, load_files_parallel
+from models.engine.parallel import load_parallel, map_chunks, split_json
+from models.engine.serializers import get_serializer, load_file, write_file
+from models.place import Place
+from models.state import State
+from models.user import User
+
+DT = "2017-09-28T21:03:54.052298"
+
+
+def records(number):
+    """Returns number stored dictionaries by key"""
+    return {"Place.{}".format(i): {"id": str(i), "created_at": DT,
+                                   "updated_at": DT, "name": "}, \"x",
+                                   "amenity_ids": [str(i)],
+                                   "__class__": "Place"}
+            for i in range(number)}
+
+
+def write(path, obj_dict, name="json"):
+    """Writes obj_dict to path with the serializer name"""
+    serializer = get_serializer(name)
+    write_file(path, serializer, [serializer.encode_item(k, v)
+                                  for k, v in obj_dict.items()])
+
+
+class TestParallel_split(unittest.TestCase):
+    """Unittests for testing split_json."""
+
+    def test_split(self):
+        data = json.dumps(records(50)).encode()
+        chunks = split_json(data, 4)
+        self.assertEqual(4, len(chunks))
+        merged = {}
+        for chunk in chunks:
+            merged.update(json.loads(b"{" + chunk + b"}"))
+        self.assertEqual(records(50), merged)
+
+    def test_split_compact(self):
+        data = json.dumps(records(10), separators=(",", ":")).encode()
+        merged = {}
+        for chunk in split_json(data, 3):
+            merged.update(json.loads(b"{" + chunk + b"}"))
+        self.assertEqual(records(10), merged)
+
+    def test_more_parts_than_records(self):
+        data = json.dumps(records(2)).encode()
+        self.assertLessEqual(len(split_json(data, 8)), 2)
+
+    def test_not_json_object(self):
+        self.assertIsNone(split_json(b"\x80\x05", 2))
+        self.assertIsNone(split_json(b"[1, 2]", 2))
+
+    def test_load_chunk_converts(self):
+        chunk = split_json(json.dumps(records(1)).encode(), 1)[0]
+        record = load_chunk(chunk)["Place.0"]
+        self.assertEqual(datetime.fromisoformat(DT), record["created_at"])
+        self.assertEqual(["0"], record["amenity_ids"])
+
+    def test_load_chunk_nan_and_big_int(self):
+        chunk = b'"Place.0": {"latitude": NaN, "n": 123456789012345678901}'
+        for name in ("json", "orjson"):
+            record = load_chunk(chunk, name)["Place.0"]
+            self.assertNotEqual(record["latitude"], record["latitude"])
+        self.assertEqual(123456789012345678901,
+                         load_chunk(chunk)["Place.0"]["n"])
+
+
+@unittest.skipUnless(can_fork(), "processes can't be forked here")
+class TestParallel_load(unittest.TestCase):
+    """Unittests for testing load_parallel and load_files_parallel."""
+
+    def tearDown(self):
+        for path in ("test_parallel.json", "test_parallel2.json"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def converted(self, obj_dict):
+        for record in obj_dict.values():
+            record["created_at"] = datetime.fromisoformat(DT)
+            record["updated_at"] = datetime.fromisoformat(DT)
+        return obj_dict
+
+    def test_load_parallel(self):
+        write("test_parallel.json", records(100))
+        for workers in (1, 2, 3):
+            self.assertEqual(self.converted(records(100)),
+                             load_parallel("test_parallel.json", workers))
+
+    def test_load_parallel_keeps_order(self):
+        write("test_parallel.json", records(100))
+        self.assertEqual(list(records(100)),
+                         list(load_parallel("test_parallel.json", 3)))
+
+    def test_load_parallel_fooled_split(self):
+        obj_dict = records(4)
+        obj_dict["Place.2"]["name"] = "x" * 300 + '}, "' + "x" * 300
+        write("test_parallel.json", obj_dict)
+        self.assertEqual(self.converted(obj_dict),
+                         load_parallel("test_parallel.json", 2))
+
+    def test_load_parallel_pickle(self):
+        write("test_parallel.json", records(10), "pickle")
+        self.assertEqual(self.converted(records(10)),
+                         load_parallel("test_parallel.json", 2, "pickle"))
+
+    def test_map_chunks(self):
+        for workers in (1, 3):
+            self.assertEqual([divmod(i, 3) for i in range(20)],
+                             list(map_chunks(divmod, range(20), workers, 3)))
+
+    def test_load_files_parallel(self):
+        write("test_parallel.json", records(3))
+        write("test_parallel2.json", records(5))
+        loaded = load_files_parallel(
+            ["test_parallel.json", "test_parallel2.json"], 2)
+        self.assertEqual([3, 5], [len(obj_dict) for obj_dict in loaded])
+        self.assertIsInstance(loaded[1]["Place.4"]["created_at"], datetime)
+
+
+@unittest.skipUnless(can_fork(), "processes can't be forked here")
+class TestParallel_storage(unittest.TestCase):
+    """Unittests for testing parallel reloads of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__workers = 3
+        self.us = User()
+        self.st = State()
+        self.st.name = "Texas"
+        self.pl = Place()
+        self.pl.amenity_ids = ["a", "b"]
+        models.storage.save()
+
+    def tearDown(self):
+        FileStorage._FileStorage__workers = 1
+        FileStorage._FileStorage__shard_dir = None
+        FileStorage._FileStorage__pending = set()
+        shutil.rmtree("test_shards", ignore_errors=True)
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload(self):
+        saved = {k: v.to_dict() for k, v in models.storage.all().items()}
+        models.storage.reload()
+        self.assertEqual(saved, {k: v.to_dict()
+                                 for k, v in models.storage.all().items()})
+        obj = models.storage.all()["State." + self.st.id]
+        self.assertIsInstance(obj.created_at, datetime)
+        self.assertEqual("Texas", obj.name)
+
+    def test_reload_file_unchanged(self):
+        with open("file.json", "r") as f:
+            before = json.load(f)
+        models.storage.reload()
+        models.storage.save()
+        self.assertEqual(before, load_file("file.json"))
+
+    def test_reload_shards(self):
+        FileStorage._FileStorage__shard_dir = "test_shards"
+        for obj in models.storage.all().values():
+            models.storage.new(obj)
+        models.storage.save()
+        models.storage.reload()
+        self.assertEqual(3, len(models.storage.all()))
+        self.assertEqual(["a", "b"], models.storage.get(
+            Place, self.pl.id).amenity_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
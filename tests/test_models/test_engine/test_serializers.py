@@ -0,0 +1,338 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/serializers.py.
+
+Unittest classes:
+    TestSerializers_round_trip
+    TestSerializers_iterate
+    TestSerializers_detect
+    TestSerializers_storage
+    TestSerializers_write_file
+"""
+import io
+import os
+import json
+import models
+import unittest
+from models.engine import serializers
+from models.engine.file_storage import FileStorage
+from models.engine.serializers import detect_serializer, get_serializer
+from models.engine.serializers import iter_file, load_file, write_file
+from models.place import Place
+from models.user import User
+
+RECORDS = {"User.1": {"id": "1", "email": "a@b.c", "__class__": "User"},
+           "Place.2": {"id": "2", "latitude": 1.5, "number_rooms": 3,
+                       "amenity_ids": ["x", "y"], "__class__": "Place"}}
+
+
+def available(name):
+    """Returns True if the serializer name can be used here"""
+    try:
+        get_serializer(name)
+    except ImportError:
+        return False
+    return True
+
+
+def dump(serializer, records):
+    """Returns the bytes written by serializer for records"""
+    f = io.BytesIO()
+    serializer.write(f, [serializer.encode_item(k, v)
+                         for k, v in records.items()])
+    return f.getvalue()
+
+
+class TestSerializers_round_trip(unittest.TestCase):
+    """Unittests for testing that every serializer reads what it writes."""
+
+    def check(self, name):
+        serializer = get_serializer(name)
+        for records in ({"User.1": {"id": "1"}}, RECORDS,
+                        {"User.{}".format(i): {"id": str(i)}
+                         for i in range(70000)}):
+            f = io.BufferedReader(io.BytesIO(dump(serializer, records)))
+            self.assertEqual(name, detect_serializer(f, name).name)
+            self.assertEqual(records, detect_serializer(f, name).load(f))
+
+    def test_json(self):
+        self.check("json")
+
+    def test_json_matches_json_dump(self):
+        self.assertEqual(json.dumps(RECORDS).encode(),
+                         dump(get_serializer("json"), RECORDS))
+
+    def test_pickle(self):
+        self.check("pickle")
+
+    @unittest.skipUnless(available("orjson"), "orjson is not installed")
+    def test_orjson(self):
+        self.check("orjson")
+
+    @unittest.skipUnless(available("msgpack"), "msgpack is not installed")
+    def test_msgpack(self):
+        self.check("msgpack")
+
+    def test_write_streams_items(self):
+        for name in ("json", "orjson", "msgpack", "pickle"):
+            if not available(name):
+                continue
+            serializer = get_serializer(name)
+            items = [serializer.encode_item(k, v) for k, v in RECORDS.items()]
+            writes = []
+            f = io.BytesIO()
+            f.write = writes.append
+            serializer.write(f, iter(items))
+            self.assertEqual(dump(serializer, RECORDS), b"".join(writes))
+            self.assertLessEqual(max(len(w) for w in writes),
+                                 max(len(item) for item in items))
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_serializer("yaml")
+
+    def test_missing_optional_dependency(self):
+        orjson = serializers.orjson
+        serializers.orjson = None
+        try:
+            with self.assertRaises(ImportError):
+                get_serializer("orjson")
+        finally:
+            serializers.orjson = orjson
+
+
+class TestSerializers_iterate(unittest.TestCase):
+    """Unittests for testing that serializers read one record at a time."""
+
+    def tearDown(self):
+        try:
+            os.remove("test_iterate.json")
+        except IOError:
+            pass
+
+    def check(self, name):
+        serializer = get_serializer(name)
+        records = {"User.{}".format(i): {"id": str(i), "n": i}
+                   for i in range(5000)}
+        records.update(RECORDS)
+        f = io.BufferedReader(io.BytesIO(dump(serializer, records)))
+        pairs = list(detect_serializer(f, name).iterate(f))
+        self.assertEqual(list(records.items()), pairs)
+
+    def test_json(self):
+        self.check("json")
+
+    def test_pickle(self):
+        self.check("pickle")
+
+    @unittest.skipUnless(available("orjson"), "orjson is not installed")
+    def test_orjson(self):
+        self.check("orjson")
+
+    @unittest.skipUnless(available("msgpack"), "msgpack is not installed")
+    def test_msgpack(self):
+        self.check("msgpack")
+
+    def test_json_across_blocks(self):
+        serializer = get_serializer("json")
+        serializer.block_size = 3
+        records = {"Place.1": {"name": 'Caf\u00e9 "}, {"', "n": 123456789,
+                               "x": [1.5, None, True, {"y": -2e-3}]},
+                   "Place.2": {}, "Place.3": {"n": 7}}
+        for separators in ((", ", ": "), (",", ":"), (" , ", " : ")):
+            data = json.dumps(records, separators=separators,
+                              ensure_ascii=False).encode()
+            f = io.BufferedReader(io.BytesIO(data))
+            self.assertEqual(records, dict(serializer.iterate(f)))
+
+    def test_json_empty_object(self):
+        f = io.BufferedReader(io.BytesIO(b" {\n} "))
+        self.assertEqual([], list(get_serializer("json").iterate(f)))
+
+    def test_json_truncated(self):
+        data = json.dumps(RECORDS).encode()[:-5]
+        f = io.BufferedReader(io.BytesIO(data))
+        with self.assertRaises(ValueError):
+            list(get_serializer("json").iterate(f))
+
+    def test_json_not_an_object(self):
+        f = io.BufferedReader(io.BytesIO(b"[1, 2]"))
+        with self.assertRaises(ValueError):
+            list(get_serializer("json").iterate(f))
+
+    def test_iter_file(self):
+        serializer = get_serializer("json")
+        write_file("test_iterate.json", serializer,
+                   [serializer.encode_item(k, v) for k, v in RECORDS.items()])
+        self.assertEqual(RECORDS, dict(iter_file("test_iterate.json")))
+
+    def test_iter_empty_file(self):
+        open("test_iterate.json", "w").close()
+        self.assertEqual([], list(iter_file("test_iterate.json")))
+
+
+class TestSerializers_detect(unittest.TestCase):
+    """Unittests for testing detect_serializer."""
+
+    def test_unknown_format(self):
+        f = io.BufferedReader(io.BytesIO(b"hello"))
+        with self.assertRaises(ValueError):
+            detect_serializer(f)
+
+    def test_pickle_only_if_configured(self):
+        data = get_serializer("pickle").encode_item("User.1", {"id": "1"})
+        for name in ("json", "orjson", "msgpack"):
+            f = io.BufferedReader(io.BytesIO(data))
+            with self.assertRaisesRegex(ValueError,
+                                        "^unknown storage file format$"):
+                detect_serializer(f, name)
+        f = io.BufferedReader(io.BytesIO(data))
+        self.assertEqual("pickle", detect_serializer(f, "pickle").name)
+
+    def test_json_read_by_configured_serializer(self):
+        data = dump(get_serializer("json"), RECORDS)
+        for name in ("json", "msgpack", "pickle"):
+            f = io.BufferedReader(io.BytesIO(data))
+            self.assertEqual("json", detect_serializer(f, name).name)
+
+
+class TestSerializers_storage(unittest.TestCase):
+    """Unittests for testing FileStorage with every serializer."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__serializer = "json"
+        FileStorage._FileStorage__stream = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def check(self, name):
+        FileStorage._FileStorage__serializer = name
+        us = User()
+        us.email = "a@b.c"
+        pl = Place()
+        pl.amenity_ids = ["x", "y"]
+        models.storage.save()
+        models.storage.reload()
+        objs = models.storage.all()
+        self.assertEqual("a@b.c", objs["User." + us.id].email)
+        self.assertEqual(["x", "y"], objs["Place." + pl.id].amenity_ids)
+        self.assertEqual(pl.created_at, objs["Place." + pl.id].created_at)
+
+    def test_storage_json(self):
+        self.check("json")
+
+    def test_storage_pickle(self):
+        self.check("pickle")
+
+    @unittest.skipUnless(available("orjson"), "orjson is not installed")
+    def test_storage_orjson(self):
+        self.check("orjson")
+
+    @unittest.skipUnless(available("msgpack"), "msgpack is not installed")
+    def test_storage_msgpack(self):
+        self.check("msgpack")
+
+    def test_storage_streamed(self):
+        FileStorage._FileStorage__stream = True
+        for name in ("json", "pickle"):
+            self.check(name)
+
+    def test_storage_json_nan_and_big_int(self):
+        big = 123456789012345678901234567890
+        pl = Place()
+        pl.latitude = float("nan")
+        pl.number_rooms = big
+        models.storage.save()
+        models.storage.reload()
+        obj = models.storage.all()["Place." + pl.id]
+        self.assertNotEqual(obj.latitude, obj.latitude)
+        self.assertEqual(big, obj.number_rooms)
+
+    @unittest.skipUnless(available("orjson"), "orjson is not installed")
+    def test_storage_orjson_reads_nan(self):
+        pl = Place()
+        pl.latitude = float("nan")
+        models.storage.save()
+        FileStorage._FileStorage__serializer = "orjson"
+        models.storage.reload()
+        obj = models.storage.all()["Place." + pl.id]
+        self.assertNotEqual(obj.latitude, obj.latitude)
+
+    def test_switch_serializer(self):
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__serializer = "pickle"
+        models.storage.reload()
+        models.storage.save()
+        with open("file.json", "rb") as f:
+            self.assertEqual(b"\x80\x05", f.read(2))
+        models.storage.reload()
+        self.assertIn("User." + us.id, models.storage.all())
+        FileStorage._FileStorage__serializer = "json"
+        with self.assertRaisesRegex(ValueError,
+                                    "^unknown storage file format$"):
+            models.storage.reload()
+
+
+class TestSerializers_write_file(unittest.TestCase):
+    """Unittests for testing the atomic write_file."""
+
+    def tearDown(self):
+        try:
+            os.remove("test_write.json")
+        except IOError:
+            pass
+
+    def test_write_file(self):
+        serializer = get_serializer("json")
+        write_file("test_write.json", serializer,
+                   [serializer.encode_item(k, v) for k, v in RECORDS.items()])
+        self.assertEqual(RECORDS, load_file("test_write.json"))
+        self.assertEqual([], [name for name in os.listdir(".")
+                              if name.endswith(".tmp")])
+
+    def test_write_file_mode(self):
+        serializer = get_serializer("json")
+        items = [serializer.encode_item(k, v) for k, v in RECORDS.items()]
+        write_file("test_write.json", serializer, items)
+        open("test_write_new.json", "w").close()
+        try:
+            expected = os.stat("test_write_new.json").st_mode & 0o777
+        finally:
+            os.remove("test_write_new.json")
+        self.assertEqual(expected,
+                         os.stat("test_write.json").st_mode & 0o777)
+        os.chmod("test_write.json", 0o640)
+        write_file("test_write.json", serializer, items)
+        self.assertEqual(0o640, os.stat("test_write.json").st_mode & 0o777)
+
+    def test_failed_write_keeps_old_file(self):
+        serializer = get_serializer("pickle")
+        write_file("test_write.json", serializer,
+                   [serializer.encode_item(k, v) for k, v in RECORDS.items()])
+
+        def items():
+            yield serializer.encode_item("User.3", {"id": "3"})
+            raise KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            write_file("test_write.json", serializer, items())
+        self.assertEqual(RECORDS, load_file("test_write.json", "pickle"))
+        self.assertEqual([], [name for name in os.listdir(".")
+                              if name.endswith(".tmp")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -143,6 +143,17 @@ class TestPlace_instantiation(unittest.TestCase):
         with self.assertRaises(TypeError):
             Place(id=None, created_at=None, updated_at=None)
 
+    def test_instantiation_coerces_kwargs(self):
+        dt_iso = datetime.today().isoformat()
+        pl = Place(id="345", created_at=dt_iso, updated_at=dt_iso,
+                   max_guest="4", latitude=2, amenity_ids='["a"]',
+                   number_rooms="many")
+        self.assertEqual(4, pl.max_guest)
+        self.assertEqual(2.0, pl.latitude)
+        self.assertEqual(float, type(pl.latitude))
+        self.assertEqual(["a"], pl.amenity_ids)
+        self.assertEqual("many", pl.number_rooms)
+
 
 class TestPlace_save(unittest.TestCase):
     """Unittests for testing save method of the Place class."""
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Defines unittests for models/schema.py.
+
+Unittest classes:
+    TestSchema_casts
+    TestSchema_coerce
+"""
+import unittest
+from datetime import datetime
+from models.base_model import schemas
+from models.place import Place
+from models.schema import casts, coerce_record, coerce_value
+from models.schema import compile_schema
+from models.schema import to_datetime, to_int, to_list
+
+DT = "2017-09-28T21:03:54.052298"
+
+
+class TestSchema_casts(unittest.TestCase):
+    """Unittests for testing the casts of the schemas."""
+
+    def test_to_int(self):
+        self.assertEqual(4, to_int("4"))
+        self.assertEqual(4, to_int("4.0"))
+        self.assertEqual(4, to_int(4.0))
+        self.assertIsNone(to_int(None))
+        for value in ("many", "4.7", 4.7, 9.9, float("inf")):
+            with self.assertRaises(ValueError):
+                to_int(value)
+
+    def test_to_datetime(self):
+        self.assertEqual(datetime.fromisoformat(DT), to_datetime(DT))
+        self.assertEqual(datetime(1970, 1, 1, 0, 0, 1),
+                         to_datetime("1000000"))
+        with self.assertRaises(TypeError):
+            to_datetime(None)
+
+    def test_casts(self):
+        self.assertEqual(4, casts[int]("4.0"))
+        self.assertEqual(datetime(1970, 1, 1, 0, 0, 1),
+                         casts[datetime]("1000000"))
+        self.assertEqual({"a": 1}, casts[dict]('{"a": 1}'))
+
+    def test_to_list(self):
+        self.assertEqual(["a", "b"], to_list('["a", "b"]'))
+        self.assertEqual(["a"], to_list(("a",)))
+        self.assertIsNone(to_list(None))
+        with self.assertRaises(ValueError):
+            to_list('{"a": 1}')
+        with self.assertRaises(ValueError):
+            to_list("a")
+
+
+class TestSchema_coerce(unittest.TestCase):
+    """Unittests for testing how records and values are coerced."""
+
+    def test_compile_schema(self):
+        schema = compile_schema({"max_guest": int})
+        self.assertEqual(int, schema["max_guest"][0])
+        self.assertEqual(4, schema["max_guest"][1]("4"))
+
+    def test_model_schema(self):
+        schema = schemas["Place"]
+        self.assertEqual({"id", "created_at", "updated_at"} |
+                         set(vars(Place)) - {"__module__", "__doc__"},
+                         set(schema))
+        self.assertEqual(list, schema["amenity_ids"][0])
+
+    def test_coerce_record(self):
+        record = {"id": "1", "created_at": DT, "max_guest": "4",
+                  "latitude": 2, "amenity_ids": '["a"]', "rating": "5"}
+        self.assertIs(record, coerce_record(schemas["Place"], record))
+        self.assertEqual({"id": "1",
+                          "created_at": datetime.fromisoformat(DT),
+                          "max_guest": 4, "latitude": 2.0,
+                          "amenity_ids": ["a"], "rating": "5"}, record)
+
+    def test_coerce_record_invalid(self):
+        with self.assertRaises(ValueError):
+            coerce_record(schemas["Place"], {"max_guest": "many"})
+        record = {"max_guest": "many", "latitude": "1.5"}
+        coerce_record(schemas["Place"], record, False)
+        self.assertEqual({"max_guest": "many", "latitude": 1.5}, record)
+        with self.assertRaises(ValueError):
+            coerce_record(schemas["Place"], {"created_at": "today"}, False)
+
+    def test_coerce_value(self):
+        schema = schemas["Place"]
+        self.assertEqual(4, coerce_value(schema, "max_guest", 4.0))
+        with self.assertRaisesRegex(ValueError,
+                                    "^max_guest must be a number$"):
+            coerce_value(schema, "max_guest", 4.7)
+        self.assertEqual("x", coerce_value(schema, "rating", "x"))
+        with self.assertRaisesRegex(ValueError,
+                                    "^max_guest must be a number$"):
+            coerce_value(schema, "max_guest", "many")
+        with self.assertRaisesRegex(ValueError,
+                                    "^amenity_ids must be a list$"):
+            coerce_value(schema, "amenity_ids", "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
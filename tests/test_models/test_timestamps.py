@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Defines unittests for models/timestamps.py.
+
+Unittest classes:
+    TestTimestamps_parse
+    TestTimestamps_format
+"""
+import unittest
+from datetime import datetime
+from models import timestamps
+from models.base_model import BaseModel
+from models.timestamps import format_datetime, parse_datetime
+
+
+class TestTimestamps_parse(unittest.TestCase):
+    """Unittests for testing parse_datetime."""
+
+    def test_parse_iso(self):
+        dt = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        self.assertEqual(dt, parse_datetime("2017-09-28T21:03:54.052298"))
+
+    def test_parse_iso_without_microseconds(self):
+        dt = datetime(2017, 9, 28, 21, 3, 54)
+        self.assertEqual(dt, parse_datetime(dt.isoformat()))
+
+    def test_parse_matches_strptime(self):
+        s = "2017-09-28T21:03:54.052298"
+        self.assertEqual(datetime.strptime(s, "%Y-%m-%dT%H:%M:%S.%f"),
+                         parse_datetime(s))
+
+    def test_parse_epoch_us(self):
+        dt = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        self.assertEqual(dt, parse_datetime(1506632634052298))
+
+    def test_parse_datetime(self):
+        dt = datetime.today()
+        self.assertIs(dt, parse_datetime(dt))
+
+    def test_parse_None(self):
+        with self.assertRaises(TypeError):
+            parse_datetime(None)
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetime("yesterday")
+
+
+class TestTimestamps_format(unittest.TestCase):
+    """Unittests for testing format_datetime."""
+
+    def tearDown(self):
+        timestamps.EPOCH_US = False
+
+    def test_format_iso(self):
+        dt = datetime.today()
+        self.assertEqual(dt.isoformat(), format_datetime(dt))
+
+    def test_format_epoch_us(self):
+        timestamps.EPOCH_US = True
+        dt = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        self.assertEqual(1506632634052298, format_datetime(dt))
+
+    def test_round_trip(self):
+        dt = datetime.today()
+        self.assertEqual(dt, parse_datetime(format_datetime(dt)))
+        timestamps.EPOCH_US = True
+        self.assertEqual(dt, parse_datetime(format_datetime(dt)))
+
+    def test_to_dict_epoch_us(self):
+        timestamps.EPOCH_US = True
+        bm = BaseModel()
+        bm_dict = bm.to_dict()
+        self.assertEqual(int, type(bm_dict["created_at"]))
+        self.assertEqual(bm.created_at, BaseModel(**bm_dict).created_at)
+        self.assertEqual(bm.updated_at, BaseModel(**bm_dict).updated_at)
+
+
+if __name__ == "__main__":
+    unittest.main()